@@ -4,25 +4,172 @@ from datetime import datetime
 # Define the file paths
 FOLDER_PATH = r"C:\Users\Ahmed\Desktop\PythonLap\Gasket"
 MASTER_PATH = os.path.join(FOLDER_PATH, "Master.xlsx")
-RESPONSES_PATH = os.path.join(FOLDER_PATH, "Responses.xlsx")
-OUTPUT_PATH = os.path.join(FOLDER_PATH, f"Gasket_Analysis_{datetime.now().strftime('%Y-%m-%d')}.xlsx")
+RESPONSES_PATH = os.path.join(FOLDER_PATH, "Responses.xlsx")  # Or a directory of per-plant response files
+RUN_DATE = datetime.now().strftime('%Y-%m-%d')
+OUTPUT_PATH = os.path.join(FOLDER_PATH, f"Gasket_Analysis_{RUN_DATE}.xlsx")
+# Run state below (INPUT_CACHE_DIR, SNAPSHOT_DIR, STORE_PATH, HISTORY_DIR, CUBE_DIR) is relative to the
+# data directory (main.py --data-dir, default: the folder of the output workbook); absolute paths are used as is
+INPUT_CACHE_DIR = ".cache"  # Parsed copies of the input workbooks
+
+# Columnar snapshots of each run's comparison results (one directory per run date)
+SNAPSHOT_DIR = "snapshots"
+PREVIOUS_ANALYSIS_PATH = None  # Snapshot directory or analysis workbook; None picks the latest earlier snapshot
 
 # Constants - updated per the latest specification
 CURRENT_DATETIME = "2025-04-22 12:55:05"  # Updated from your input
 CURRENT_USER = "Planner2317"
 
-# Status categories with color coding
+# Deviation thresholds on Net Difference, referenced by name in the rules below
+RULE_THRESHOLDS = {
+    'MODERATE_MIN': 1,   # Smallest net shortfall that needs an increase
+    'HIGH_ABOVE': 3,     # Net shortfalls above this are high deviations
+}
+
+# Status categories with their rule and color coding. Rules are checked top to bottom and
+# the first matching 'when' assigns the status; the status without 'when' is the fallback.
+# Conditions are expressions over difference, net_difference, available_stock, pending_orders,
+# below_reorder_point and the RULE_THRESHOLDS names (comparisons, + - * /, and, or, not),
+# evaluated on whole columns. A status with 'replaces' is an override applied afterwards to
+# items holding one of the listed statuses, and sets its own recommendation.
+# 'summary' labels the status count in the summary statistics (RULE_THRESHOLDS names in braces
+# are filled in) and 'plant_column' its column in the plant summary.
 STATUS = {
-    'ACCEPTABLE': {'color': 'CCFFCC'},      # Green for exact match
-    'MODERATE_DEVIATION': {'color': 'FFFF99'},  # Yellow for difference 1-3
-    'HIGH_DEVIATION': {'color': 'FFCCCC'},   # Red for difference > 3
-    'LOW_REQUEST': {'color': 'CCE5FF'},      # Blue for difference < 0
-    'COVERED_BY_STOCK': {'color': '9999FF'}, # Purple for items covered by existing stock
-    'COVERED_BY_ORDERS': {'color': 'FF99CC'} # Pink for items covered by pending orders
+    'COVERED_BY_STOCK': {  # Purple for items covered by existing stock
+        'color': '9999FF', 'when': 'difference > 0 and difference <= available_stock',
+        'summary': 'Items Covered by Available Stock', 'plant_column': 'Covered by Stock'
+    },
+    'COVERED_BY_ORDERS': {  # Pink for items covered by pending orders
+        'color': 'FF99CC', 'when': 'difference > 0 and difference <= available_stock + pending_orders',
+        'summary': 'Items Covered by Pending Orders', 'plant_column': 'Covered by Orders'
+    },
+    'ACCEPTABLE': {  # Green for exact match
+        'color': 'CCFFCC', 'when': 'net_difference == 0',
+        'summary': 'Items with Acceptable Match (=0)', 'plant_column': 'Acceptable Items'
+    },
+    'MODERATE_DEVIATION': {  # Yellow for difference 1-3
+        'color': 'FFFF99', 'when': 'MODERATE_MIN <= net_difference <= HIGH_ABOVE',
+        'summary': 'Items with Moderate Deviation ({MODERATE_MIN}-{HIGH_ABOVE} after stock & orders)',
+        'plant_column': 'Moderate Deviation Items'
+    },
+    'HIGH_DEVIATION': {  # Red for difference > 3
+        'color': 'FFCCCC', 'when': 'net_difference > HIGH_ABOVE',
+        'summary': 'Items with High Deviation (>{HIGH_ABOVE} after stock & orders)', 'plant_column': 'High Deviation Items'
+    },
+    'LOW_REQUEST': {  # Blue for difference < 0
+        'color': 'CCE5FF', 'summary': 'Items with Low Request (<0)', 'plant_column': 'Low Request Items'
+    },
+    'BELOW_REORDER_POINT': {  # Orange for stock and orders below the reorder point
+        'color': 'FFCC99', 'when': 'below_reorder_point',
+        'replaces': ['ACCEPTABLE', 'LOW_REQUEST', 'COVERED_BY_STOCK', 'COVERED_BY_ORDERS'],
+        'recommendation': "Replenish - stock and pending orders are below the reorder point",
+        'summary': 'Items Moved to Below Reorder Point Status', 'plant_column': 'Below Reorder Point'
+    },
 }
 
+# Recommendation rules, checked top to bottom like the status rules; the last one is the fallback.
+# Each rule is (recommendation, condition, summary statistics label).
+RECOMMENDATION_RULES = [
+    ("Current forecast appears adequate", 'difference == 0', 'Items with Adequate Forecast'),
+    ("Consider reducing forecast", 'difference < 0', 'Items Needing Forecast Reduction'),
+    ("Use available stock to fulfill requests", 'difference <= available_stock', 'Items to Fulfill from Stock'),
+    ("Use stock and pending orders to fulfill requests", 'difference <= available_stock + pending_orders',
+     'Items to Fulfill from Stock & Pending Orders'),
+    ("Moderate increase needed after using stock & orders", 'MODERATE_MIN <= net_difference <= HIGH_ABOVE',
+     'Items Needing Moderate Increase'),
+    ("Significant increase needed after using stock & orders", 'net_difference > HIGH_ABOVE',
+     'Items Needing Significant Increase'),
+    ("Review needs considering stock and pending orders", None, 'Items Needing Review'),
+]
+
+# Display order of the statuses in the summary statistics, plant summary and dashboard, independent
+# of the rule order above; every chain status is listed. Override statuses (BELOW_REORDER_POINT)
+# follow them, and only while their rule applies.
+STATUS_DISPLAY_ORDER = [
+    'HIGH_DEVIATION', 'MODERATE_DEVIATION', 'ACCEPTABLE', 'LOW_REQUEST', 'COVERED_BY_STOCK', 'COVERED_BY_ORDERS'
+]
+# Recommendations counted in the summary statistics, in display order; add a recommendation from
+# RECOMMENDATION_RULES here to give it a row
+SUMMARY_RECOMMENDATIONS = [
+    "Significant increase needed after using stock & orders",
+    "Moderate increase needed after using stock & orders",
+    "Consider reducing forecast",
+    "Current forecast appears adequate",
+]
+
 # Master file columns
 INVENTORY_COLUMNS = [
     'Item Code', 'Description', 'Annual Forecast',
     'Stock Qty', 'Open PRs Total 24 Months', 'Open POs Total 24 Months', 'Pr Not Confirmed 24 Months'
-]
\ No newline at end of file
+]
+# Accumulated consumption windows in the master file (latest window first)
+ACCUMULATED_COLUMNS = ['Accumulated (12m)', 'Accumulated (24m)', 'Accumulated (36m)']
+
+# Forecast recomputation settings
+FORECAST_METHOD = 'weighted_moving_average'  # or 'trend_adjusted', 'min_max_blend'
+FORECAST_WEIGHTS = (3, 2, 1)         # Weights for the last, previous and oldest year
+FORECAST_BLEND_WEIGHT = 0.5          # Share of the max year in the min/max blend
+FORECAST_DIVERGENCE_UNITS = 2        # Absolute gap (units) tolerated before flagging
+FORECAST_DIVERGENCE_RATIO = 0.5      # Relative gap tolerated before flagging
+
+# Safety stock and reorder point. Off by default: when on, BELOW_REORDER_POINT replaces the
+# status and recommendation of the items listed in its 'replaces', which changes the report.
+INVENTORY_POLICY_ENABLED = False
+SERVICE_LEVEL = 0.95                 # Probability of not running out during the lead time
+LEAD_TIME_COLUMN = 'Lead Time (Days)'  # Read from the master or the item values file
+DEFAULT_LEAD_TIME_DAYS = 90          # Used where an item has no lead time
+
+# Monte Carlo shortfall probabilities (--simulate)
+SIMULATION_ENABLED = False
+SIMULATION_DRAWS = 10000             # Scenarios per item
+SIMULATION_MEMORY_MB = 256           # Budget for one chunk of draws
+SIMULATION_DEFAULT_CV = 0.25         # Request spread for items without consumption history
+SIMULATION_SEED = 42
+SIMULATION_ALERT_PROBABILITY = 0.5   # Items at least this likely to be HIGH_DEVIATION are counted in the summary
+
+# Response file ingest settings
+RESPONSE_COLUMNS = ['Plant', 'Item Code', 'Qty Needed']
+RESPONSE_FILE_EXTENSIONS = ('.xlsx', '.xls', '.csv')
+INGEST_MAX_WORKERS = None            # None uses one worker per CPU (capped at 32)
+
+# Reconciliation of response item codes missing from the master
+RECONCILE_AUTO_APPLY = False         # Rewrite high-confidence matches before aggregation
+RECONCILE_MIN_SCORE = 0.9            # Minimum score for a match to be applied
+RECONCILE_CANDIDATES = 3             # Ranked candidates reported per unmatched code
+RECONCILE_NGRAM = 3                  # Character n-gram length for the similarity index
+RECONCILE_MAX_POSTINGS = 2000        # Grams on more master items than this are too common to shortlist by
+
+# Optional unit price / criticality per item (Item Code, Unit Price, Criticality) for value prioritization;
+# Unit Price and Criticality columns on the master are used as well
+ITEM_VALUES_PATH = None
+CRITICALITY_WEIGHTS = {'HIGH': 3, 'MEDIUM': 2, 'LOW': 1}  # Numeric criticality is used as the weight directly
+PARETO_CLASS_LIMITS = {'A': 0.80, 'B': 0.95}  # Cumulative share of shortfall value closing each class; rest is C
+PRIORITY_SORT = 'units'              # Order dashboard top lists and plant sheets by 'units' or 'value'
+
+# Columns identifying a plant's submission, in order of preference (latest submission wins).
+# Values must be numbers ("9", "10") or dates/timestamps; text versions such as "v2" are not ordered.
+SUBMISSION_COLUMNS = ['Submitted At', 'Submission Date', 'Timestamp', 'Version']
+
+# Excel worksheet limits
+EXCEL_MAX_ROWS = 1048576
+EXCEL_MAX_SHEET_NAME = 31
+
+# Local SQLite store keeping masters, responses and results for every cycle
+STORE_ENABLED = True
+STORE_PATH = "gasket_store.sqlite"
+STORE_BATCH_SIZE = 50000             # Rows per executemany batch
+
+# Append-only per-cycle history of item status (one columnar partition per cycle)
+HISTORY_DIR = "history"
+
+# Aggregate cube over these master columns, crossed with Plant and Status (one columnar cube per cycle)
+CUBE_MASTER_DIMENSIONS = ['Classification Calculated', 'Projects']
+CUBE_DIR = "cubes"
+CHRONIC_STATUS = 'HIGH_DEVIATION'
+CHRONIC_MIN_CYCLES = 3               # Consecutive cycles before an item counts as chronic
+
+# Worker processes for item-sharded processing (1 runs everything on one core)
+PROCESSING_WORKERS = 1
+
+# Dataframe engine for request aggregation, join and classification: 'pandas' or 'polars'
+# (optional package; multi-threaded, so PROCESSING_WORKERS only applies to pandas)
+DATAFRAME_ENGINE = 'pandas'
@@ -1,51 +1,257 @@
-import pandas as pd
+import argparse
+import json
 import os
+import sys
 import logging
+import pandas as pd
 from utils.logging_setup import setup_logging
-from config import MASTER_PATH, RESPONSES_PATH, OUTPUT_PATH
-from processing.data_processor import process_data
-from visualization.excel_output import create_output_file
+from config import (
+    MASTER_PATH, RESPONSES_PATH, OUTPUT_PATH, RUN_DATE, INPUT_CACHE_DIR,
+    SNAPSHOT_DIR, PREVIOUS_ANALYSIS_PATH, STORE_ENABLED, STORE_PATH, HISTORY_DIR,
+    PROCESSING_WORKERS, FORECAST_METHOD, RECONCILE_AUTO_APPLY, ITEM_VALUES_PATH, PRIORITY_SORT,
+    SIMULATION_ENABLED, SIMULATION_DRAWS, DATAFRAME_ENGINE, CUBE_DIR
+)
+from processing.data_processor import process_data, check_engines
+from processing.engines import ENGINES
+from processing.ingest import load_responses, read_input_file
+from processing.validation import (
+    check_required_columns, validate_inputs, drop_unusable_responses, save_quality_report
+)
+from processing.reconciliation import reconcile_responses
+from processing.forecast import FORECAST_METHODS
+
+# Workbook output, the store and the delta report are imported inside main()
+# only when used, so the summary-only path never loads openpyxl or the formatters
 
 # Get logger
 logger = setup_logging()
 
-def main():
-    """Main function to run the gasket inventory analysis."""
+def parse_args(argv=None):
+    """Parse command line arguments.
+    
+    Args:
+        argv (list, optional): Arguments, defaults to sys.argv
+    
+    Returns:
+        Namespace: Parsed arguments
+    """
+    parser = argparse.ArgumentParser(
+        description="Compare master gasket forecasts with plant requests, considering stock and pending orders."
+    )
+    parser.add_argument('--master', default=MASTER_PATH, help="Master workbook or CSV")
+    parser.add_argument('--responses', default=RESPONSES_PATH,
+                        help="Responses workbook or CSV, or a directory of per-plant response files")
+    parser.add_argument('--output', default=OUTPUT_PATH, help="Analysis workbook to write")
+    parser.add_argument('--data-dir',
+                        help="Directory for the input cache, snapshots, store, history and cubes "
+                             "(default: the folder of --output)")
+    parser.add_argument('--cycle', default=RUN_DATE, help="Planning cycle identifier (default: today's date)")
+    parser.add_argument('--summary-only', action='store_true',
+                        help="Print summary statistics and plant summary instead of writing the workbook")
+    parser.add_argument('--format', choices=['table', 'json'], default='table',
+                        help="Output format for --summary-only")
+    parser.add_argument('--forecast-method', default=FORECAST_METHOD,
+                        choices=list(FORECAST_METHODS))
+    parser.add_argument('--workers', type=int, default=PROCESSING_WORKERS,
+                        help="Worker processes for item-sharded processing")
+    parser.add_argument('--engine', default=DATAFRAME_ENGINE, choices=list(ENGINES),
+                        help="Dataframe engine for aggregation, join and classification")
+    parser.add_argument('--check-engines', action='store_true',
+                        help="Run every engine on the inputs, report timings and whether results are identical")
+    parser.add_argument('--item-values', default=ITEM_VALUES_PATH,
+                        help="Workbook or CSV with Item Code, Unit Price and/or Criticality for value prioritization")
+    parser.add_argument('--sort-by', choices=['units', 'value'], default=PRIORITY_SORT,
+                        help="Order dashboard top lists and plant sheets by shortfall units or shortfall value")
+    parser.add_argument('--simulate', action='store_true', default=SIMULATION_ENABLED,
+                        help="Add Monte Carlo probabilities of each item exceeding the deviation thresholds")
+    parser.add_argument('--draws', type=int, default=SIMULATION_DRAWS, help="Scenarios per item for --simulate")
+    parser.add_argument('--reconcile', action='store_true', default=RECONCILE_AUTO_APPLY,
+                        help="Map unknown response item codes to high-confidence master matches before aggregating")
+    parser.add_argument('--previous', default=PREVIOUS_ANALYSIS_PATH,
+                        help="Previous snapshot directory or analysis workbook to compare against")
+    parser.add_argument('--no-store', action='store_true', help="Do not load this cycle into the SQLite store")
+    parser.add_argument('--no-history', action='store_true', help="Do not append this cycle to the status history")
+    parser.add_argument('--no-cache', action='store_true', help="Always re-parse the input workbooks")
+    return parser.parse_args(argv)
+
+
+def get_data_paths(data_dir):
+    """Locations of the run state, with the relative config paths placed under data_dir.
+    
+    Args:
+        data_dir (str): Directory holding the run state
+    
+    Returns:
+        dict: Paths keyed 'cache', 'snapshots', 'store', 'history' and 'cubes'
+    """
+    configured = {
+        'cache': INPUT_CACHE_DIR, 'snapshots': SNAPSHOT_DIR, 'store': STORE_PATH,
+        'history': HISTORY_DIR, 'cubes': CUBE_DIR
+    }
+    # os.path.join keeps an absolute configured path as it is
+    return {name: os.path.join(data_dir, path) for name, path in configured.items()}
+
+
+def print_summary(result_data, output_format):
+    """Print the summary statistics and plant summary to stdout.
+    
+    Args:
+        result_data (dict): Output of process_data
+        output_format (str): 'table' or 'json'
+    """
+    summary_stats = result_data['summary_stats']
+    plant_summary = result_data['plant_summary']
+    
+    if output_format == 'json':
+        print(json.dumps({
+            'summary_stats': json.loads(summary_stats.to_json(orient='records')),
+            'plant_summary': json.loads(plant_summary.to_json(orient='records'))
+        }, indent=2))
+    else:
+        print(summary_stats.to_string(index=False))
+        print()
+        print(plant_summary.to_string(index=False))
+
+
+def main(argv=None):
+    """Main function to run the gasket inventory analysis.
+    
+    Args:
+        argv (list, optional): Command line arguments, defaults to sys.argv
+    
+    Returns:
+        int: Process exit code
+    """
+    args = parse_args(argv)
+    if args.summary_only:
+        # Keep the summary output clean for schedulers and scripts
+        logging.getLogger().setLevel(logging.WARNING)
+    
     logger.info("Starting Gasket Inventory Analysis...")
+    # State goes next to the output unless a data directory is given, never to a hard-coded folder
+    data_paths = get_data_paths(args.data_dir or os.path.dirname(os.path.abspath(args.output)))
+    cache_dir = None if args.no_cache else data_paths['cache']
     
+    store = None
     try:
         # Load source data files
         logger.info("\nReading master file...")
-        df_master = pd.read_excel(MASTER_PATH)
+        df_master = read_input_file(args.master, cache_dir)
         logger.info(f"Successfully loaded {len(df_master)} items from Master file")
         
-        logger.info("Reading responses file...")
-        df_responses = pd.read_excel(RESPONSES_PATH)
+        logger.info("Reading responses...")
+        df_responses = load_responses(args.responses, cache_dir=cache_dir)
         logger.info(f"Successfully loaded {len(df_responses)} response records")
         
+        # The Responses sheet shows the lines as submitted, including superseded and dropped ones
+        submitted_responses = df_responses
+        
+        item_values = read_input_file(args.item_values, cache_dir) if args.item_values else None
+        
+        # Missing required columns stop the run here
+        check_required_columns(df_master, df_responses)
+        
+        # Rank master candidates for item codes the merge would drop
+        df_responses, reconciliation = reconcile_responses(df_master, df_responses, auto_apply=args.reconcile)
+        
+        # Validate what will be processed (after reconciliation). A full run writes the report
+        # before anything can fail, then the lines reported as unusable are dropped.
+        data_quality = validate_inputs(df_master, df_responses)
+        if not (args.summary_only or args.check_engines):
+            os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+            save_quality_report(
+                data_quality, f"{os.path.splitext(args.output)[0]}_DataQuality.json", df_master, df_responses
+            )
+        df_responses = drop_unusable_responses(df_responses)
+        
+        # Engine parity check: every engine must reproduce the pandas results
+        if args.check_engines:
+            report = check_engines(df_master, df_responses, forecast_method=args.forecast_method, item_values=item_values)
+            print(report.to_string(index=False))
+            return 1 if report['Result'].str.startswith('different').any() else 0
+        
+        # Quick check: numbers only, nothing is written
+        if args.summary_only:
+            result_data = process_data(
+                df_master, df_responses, forecast_method=args.forecast_method,
+                cycle=args.cycle, workers=args.workers, item_values=item_values,
+                simulation_draws=args.draws if args.simulate else None, engine=args.engine
+            )
+            print_summary(result_data, args.format)
+            return 0
+        
+        from processing.delta import save_snapshot, find_previous_snapshot, load_previous_comparison, build_delta
+        from storage.sqlite_store import open_store, load_cycle, save_results
+        from storage.cube import save_cube
+        from visualization.excel_output import create_output_file
+        
+        # Keep this cycle's inputs in the store and aggregate from there
+        if STORE_ENABLED and not args.no_store:
+            os.makedirs(os.path.dirname(data_paths['store']), exist_ok=True)
+            store = open_store(data_paths['store'])
+            load_cycle(store, args.cycle, df_master, df_responses)
+        
         # Process the data
-        result_data = process_data(df_master, df_responses)
+        result_data = process_data(
+            df_master, df_responses, forecast_method=args.forecast_method, store=store, cycle=args.cycle,
+            history_dir=None if args.no_history else data_paths['history'], workers=args.workers, item_values=item_values,
+            simulation_draws=args.draws if args.simulate else None, engine=args.engine
+        )
+        
+        if store is not None:
+            save_results(store, args.cycle, result_data['comparison'])
+        
+        # Compare with the previous run, then snapshot this one for the next
+        changes = None
+        previous_path = args.previous or find_previous_snapshot(data_paths['snapshots'], args.cycle)
+        if previous_path:
+            logger.info(f"Comparing with previous analysis: {previous_path}")
+            changes = build_delta(load_previous_comparison(previous_path), result_data['comparison'])
+            changes_path = f"{os.path.splitext(args.output)[0]}_Changes.csv"
+            changes.to_csv(changes_path, index=False)
+            logger.info(f"Changes saved to: {changes_path}")
+        save_snapshot(result_data['comparison'], data_paths['snapshots'], args.cycle)
+        save_cube(result_data['cube'], data_paths['cubes'], args.cycle)
+        if not reconciliation.empty:
+            reconciliation_path = f"{os.path.splitext(args.output)[0]}_Reconciliation.csv"
+            reconciliation.to_csv(reconciliation_path, index=False)
+            logger.info(f"Item code match candidates saved to: {reconciliation_path}")
         
         # Generate output file
         create_output_file(
-            result_data['comparison'], 
-            result_data['plant_summary'], 
-            result_data['summary_stats'], 
+            result_data['comparison'],
+            result_data['plant_summary'],
+            result_data['summary_stats'],
             result_data['unique_plants'],
-            df_master, 
-            df_responses
+            df_master,
+            submitted_responses,
+            changes,
+            result_data['chronic_items'],
+            args.output,
+            data_quality,
+            args.sort_by,
+            result_data['cube'],
+            result_data['responses']
         )
         
-        logger.info(f"\nAnalysis complete! Output file saved to: {OUTPUT_PATH}")
-        
+        logger.info(f"\nAnalysis complete! Output file saved to: {args.output}")
+        return 0
+    
     except FileNotFoundError as e:
         logger.error(f"File not found error: {str(e)}")
     except pd.errors.EmptyDataError:
         logger.error("One of the Excel files is empty or has no valid data")
     except pd.errors.ParserError:
         logger.error("Error parsing Excel file - file may be corrupted")
+    except ValueError as e:
+        logger.error(f"Invalid input data: {str(e)}")
     except Exception as e:
         logger.error(f"Unexpected error: {str(e)}")
+    finally:
+        if store is not None:
+            store.close()
+    
+    return 1
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    sys.exit(main())
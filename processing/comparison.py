@@ -0,0 +1,175 @@
+import logging
+import pandas as pd
+from config import INVENTORY_COLUMNS
+from processing.forecast import recompute_forecast
+from processing.inventory_policy import compute_reorder_points
+from processing.status import STATUS_NAMES, RECOMMENDATION_NAMES, classify_codes
+
+logger = logging.getLogger(__name__)
+
+ORDER_COLUMNS = ['Open PRs Total 24 Months', 'Open POs Total 24 Months', 'Pr Not Confirmed 24 Months']
+
+# Comparison columns behind the quantity variables of the status rules
+RULE_COLUMNS = {
+    'difference': 'Difference',
+    'net_difference': 'Net Difference',
+    'available_stock': 'Available Stock',
+    'pending_orders': 'Pending Orders',
+}
+
+INTEGER_COLUMNS = [
+    'Annual Forecast', 'Adjusted Annual Forecast', 'Total Plant Requests', 
+    'Difference', 'Net Difference', 'Available Stock', 'Pending Orders'
+]
+
+
+def prepare_master(df_master, forecast_method=None, item_values=None):
+    """Build the request-independent part of the comparison from the master.
+    
+    Args:
+        df_master (DataFrame): Master data with forecast information
+        forecast_method (str, optional): Forecast recomputation method
+        item_values (DataFrame, optional): Per-item data carrying lead times
+        
+    Returns:
+        DataFrame: One row per master item with inventory columns, the
+            recomputed forecast, Adjusted Annual Forecast, Available Stock,
+            Pending Orders and the reorder point columns
+    """
+    # Ensure all required columns exist in df_master
+    available_columns = [col for col in INVENTORY_COLUMNS if col in df_master.columns]
+    comparison = df_master[available_columns].reset_index(drop=True)
+    
+    # Ensure numeric columns are properly formatted - replace NaN with 0
+    for col in ['Stock Qty'] + ORDER_COLUMNS:
+        if col in comparison.columns:
+            comparison[col] = comparison[col].fillna(0)
+    
+    # Recompute the forecast from accumulated consumption
+    recomputed = recompute_forecast(df_master, forecast_method)
+    if recomputed is not None:
+        for col in recomputed.columns:
+            comparison[col] = recomputed[col].to_numpy()
+    
+    # Convert Annual Forecast values less than 1 to 0
+    comparison['Adjusted Annual Forecast'] = comparison['Annual Forecast'].copy()
+    comparison.loc[comparison['Annual Forecast'] < 1, 'Adjusted Annual Forecast'] = 0
+    
+    # Available stock and total pending orders
+    comparison['Available Stock'] = comparison['Stock Qty'] if 'Stock Qty' in comparison.columns else 0
+    comparison['Pending Orders'] = sum(
+        comparison[col] if col in comparison.columns else 0 for col in ORDER_COLUMNS
+    )
+    
+    # Safety stock and reorder point from consumption variability and lead time
+    reorder_points = compute_reorder_points(
+        df_master, comparison['Available Stock'].to_numpy(dtype=float),
+        comparison['Pending Orders'].to_numpy(dtype=float), item_values
+    )
+    if reorder_points is not None:
+        for col in reorder_points.columns:
+            comparison[col] = reorder_points[col].to_numpy()
+    
+    return comparison
+
+
+def add_request_columns(comparison, request_lines, unique_plants):
+    """Merge total and per-plant requested quantities onto the comparison.
+    
+    Args:
+        comparison (DataFrame): Output of prepare_master
+        request_lines (DataFrame): Lines with Plant, Item Code and Qty Needed
+        unique_plants (list): List of unique plant names
+        
+    Returns:
+        DataFrame: Comparison with Total Plant Requests and '<plant> Requests' columns
+    """
+    # Calculate total requests by item
+    logger.info("Calculating total plant requests...")
+    total_requests = request_lines.groupby('Item Code')['Qty Needed'].sum().reset_index()
+    total_requests.rename(columns={'Qty Needed': 'Total Plant Requests'}, inplace=True)
+    
+    comparison = pd.merge(comparison, total_requests, on='Item Code', how='left')
+    
+    # Fill NaN values for items with no requests
+    comparison['Total Plant Requests'] = comparison['Total Plant Requests'].fillna(0)
+    
+    # Add plant-specific request columns
+    for plant in unique_plants:
+        plant_data = request_lines[request_lines['Plant'] == plant].groupby('Item Code')['Qty Needed'].sum().reset_index()
+        plant_data.rename(columns={'Qty Needed': f'{plant} Requests'}, inplace=True)
+        comparison = pd.merge(comparison, plant_data, on='Item Code', how='left')
+        comparison[f'{plant} Requests'] = comparison[f'{plant} Requests'].fillna(0)
+    
+    return comparison
+
+
+def compute_differences(total_requests, adjusted_forecast, available_stock, pending_orders):
+    """Difference against the adjusted forecast, and what remains after stock and pending orders.
+    
+    Returns:
+        tuple: (difference, net_difference), same type as the inputs
+    """
+    difference = total_requests - adjusted_forecast
+    net_difference = difference - available_stock - pending_orders
+    return difference, net_difference
+
+
+def classify_comparison(comparison):
+    """Add Difference, Net Difference, Status and Recommendation columns.
+    
+    Status and recommendation follow the rules in config STATUS and
+    RECOMMENDATION_RULES; items flagged Below Reorder Point by prepare_master
+    can move into BELOW_REORDER_POINT.
+    
+    Args:
+        comparison (DataFrame): Comparison with requests, forecast and inventory columns
+        
+    Returns:
+        DataFrame: The same frame with the classification columns added
+    """
+    # Calculate difference using Adjusted Annual Forecast, and net of stock and pending orders
+    comparison['Difference'], comparison['Net Difference'] = compute_differences(
+        comparison['Total Plant Requests'], comparison['Adjusted Annual Forecast'],
+        comparison['Available Stock'], comparison['Pending Orders']
+    )
+    
+    # Apply enhanced status classification and recommendation based on difference and inventory
+    columns = {
+        name: comparison[col].to_numpy(dtype=float) for name, col in RULE_COLUMNS.items() if col in comparison.columns
+    }
+    if 'Below Reorder Point' in comparison.columns:
+        columns['below_reorder_point'] = comparison['Below Reorder Point'].to_numpy(dtype=bool)
+    status, recommendation = classify_codes(columns)
+    comparison['Status'] = STATUS_NAMES[status]
+    comparison['Recommendation'] = RECOMMENDATION_NAMES[recommendation]
+    
+    return comparison
+
+
+def finalize_comparison(comparison, unique_plants):
+    """Convert quantities to integers and put the columns in report order.
+    
+    Args:
+        comparison (DataFrame): Classified comparison data
+        unique_plants (list): List of unique plant names
+        
+    Returns:
+        DataFrame: Comparison ready for reporting
+    """
+    plant_columns = [f'{plant} Requests' for plant in unique_plants]
+    
+    # Convert numeric columns to integers
+    for col in INTEGER_COLUMNS + plant_columns:
+        if col in comparison.columns:
+            comparison[col] = comparison[col].astype(int)
+    
+    # Master columns, requests, then the derived analysis columns
+    leading = [col for col in INVENTORY_COLUMNS if col in comparison.columns] + ['Total Plant Requests'] + plant_columns
+    trailing = [
+        'Adjusted Annual Forecast', 'Difference', 'Available Stock', 'Pending Orders',
+        'Net Difference', 'Status', 'Recommendation'
+    ]
+    middle = [col for col in comparison.columns if col not in leading and col not in trailing]
+    
+    return comparison[leading + middle + trailing]
@@ -0,0 +1,88 @@
+import logging
+import pandas as pd
+from config import SUBMISSION_COLUMNS
+
+logger = logging.getLogger(__name__)
+
+
+def get_submission_column(df_responses):
+    """Return the first configured submission column present in the responses, or None."""
+    for col in SUBMISSION_COLUMNS:
+        if col in df_responses.columns:
+            return col
+    return None
+
+
+def submission_key(df_responses, key_col):
+    """Normalize a submission column into a sortable key.
+    
+    Supported formats are numbers (including numeric text such as "9" or
+    "10") and dates/timestamps; a column is read as numbers when at least as
+    many values parse that way, otherwise as timestamps. Values in neither
+    format (e.g. "v1"/"v2") become NaN/NaT and are reported in a warning.
+    
+    Args:
+        df_responses (DataFrame): Plant response data
+        key_col (str): Submission column name
+        
+    Returns:
+        Series: Numeric or datetime key, aligned with df_responses
+    """
+    raw = df_responses[key_col]
+    if pd.api.types.is_numeric_dtype(raw) or pd.api.types.is_datetime64_any_dtype(raw):
+        return raw
+    
+    # Prefer numeric versions, fall back to parsing timestamps
+    numeric = pd.to_numeric(raw, errors='coerce')
+    key = numeric if numeric.notna().sum() >= raw.notna().sum() else pd.to_datetime(raw, errors='coerce', format='mixed')
+    
+    unparsed = int((raw.notna() & key.isna()).sum())
+    if unparsed == int(raw.notna().sum()) and unparsed:
+        logger.warning(
+            f"Submission column '{key_col}' could not be read as numbers or dates - "
+            f"keeping every response line, superseded submissions are NOT removed"
+        )
+    elif unparsed:
+        logger.warning(f"{unparsed} values in submission column '{key_col}' could not be read as numbers or dates")
+    return key
+
+
+def keep_latest_submissions(df_responses):
+    """Keep only each plant's latest submission per item.
+    
+    A grouped max over (Plant, Item Code) marks the latest submission key and
+    every line carrying it is kept, so a submission with several lines for the
+    same item still sums correctly. Lines without a submission key lose to any
+    keyed line; groups with no key at all are left untouched. See
+    submission_key for the supported key formats.
+    
+    Args:
+        df_responses (DataFrame): Plant response data
+        
+    Returns:
+        tuple: (DataFrame of consolidated responses, DataFrame with superseded
+            line counts per plant)
+    """
+    plants = sorted(df_responses['Plant'].dropna().unique())
+    key_col = get_submission_column(df_responses)
+    
+    if key_col is None:
+        logger.info("No submission timestamp/version column found - keeping all response lines")
+        return df_responses, pd.DataFrame({'Plant': plants, 'Superseded Lines': 0})
+    
+    logger.info(f"Keeping latest submission per plant and item (by '{key_col}')...")
+    key = submission_key(df_responses, key_col)
+    
+    latest = key.groupby([df_responses['Plant'], df_responses['Item Code']]).transform('max')
+    keep = (key == latest) | latest.isna()
+    
+    superseded = (~keep).groupby(df_responses['Plant']).sum()
+    report = pd.DataFrame({'Plant': plants})
+    report['Superseded Lines'] = report['Plant'].map(superseded).fillna(0).astype(int)
+    
+    total = int(report['Superseded Lines'].sum())
+    if total:
+        details = ', '.join(f"{row['Plant']}: {row['Superseded Lines']}" for _, row in report.iterrows() if row['Superseded Lines'])
+        logger.info(f"Dropped {total} superseded response lines ({details})")
+    
+    return df_responses[keep], report
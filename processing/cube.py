@@ -0,0 +1,135 @@
+import logging
+import numpy as np
+import pandas as pd
+from config import STATUS, CUBE_MASTER_DIMENSIONS
+
+logger = logging.getLogger(__name__)
+
+ALL_PLANTS = '(All Plants)'
+BLANK_LABEL = '(blank)'
+MEASURES = ['Items', 'Requested Qty', 'Net Shortfall']
+
+
+def get_dimensions():
+    """Cube dimensions: the master dimensions, then Plant and Status."""
+    return list(CUBE_MASTER_DIMENSIONS) + ['Plant', 'Status']
+
+
+def build_cube(comparison, df_master, unique_plants):
+    """Aggregate the comparison over the master dimensions, plant and status in one pass.
+    
+    Each item contributes one row under the '(All Plants)' plant with its
+    total request and full net shortfall, plus one row per plant that
+    requested it with that plant's quantity and its share of the shortfall
+    (split by the plants' positive requested quantities). All rows are encoded into a single integer
+    cell key and summed with bincount. Queries that keep Plant read the plant
+    rows; all other queries read '(All Plants)', so item counts never repeat
+    an item requested by several plants.
+    
+    Args:
+        comparison (DataFrame): Processed comparison, rows aligned with df_master
+        df_master (DataFrame): Master data with the CUBE_MASTER_DIMENSIONS columns
+        unique_plants (list): List of unique plant names
+    
+    Returns:
+        DataFrame: One row per non-empty cell with categorical dimension columns
+            and the Items, Requested Qty and Net Shortfall measures
+    """
+    if len(comparison) != len(df_master):
+        raise ValueError("Comparison rows must align with the master to build the cube")
+    
+    logger.info("Building aggregate cube...")
+    n_items = len(comparison)
+    
+    # Integer codes per item for every item-level dimension
+    codes = {}
+    categories = {}
+    for dimension in CUBE_MASTER_DIMENSIONS:
+        if dimension in df_master.columns:
+            labels = df_master[dimension].astype(str).str.strip().where(df_master[dimension].notna(), BLANK_LABEL)
+            labels = labels.replace('', BLANK_LABEL).to_numpy(dtype=object)
+        else:
+            labels = np.full(n_items, BLANK_LABEL, dtype=object)
+        codes[dimension], categories[dimension] = pd.factorize(labels, sort=True)
+    
+    categories['Status'] = pd.Index(list(STATUS))
+    codes['Status'] = categories['Status'].get_indexer(comparison['Status'])
+    categories['Plant'] = pd.Index(list(unique_plants) + [ALL_PLANTS])
+    
+    # Long layout: every item under '(All Plants)', then each (item, requesting plant)
+    plant_columns = [f'{plant} Requests' for plant in unique_plants]
+    plant_qty = comparison[plant_columns].to_numpy(dtype=float) if plant_columns else np.zeros((n_items, 0))
+    item_rows, plant_codes = np.nonzero(plant_qty > 0)
+    
+    rows = np.concatenate([np.arange(n_items), item_rows])
+    plants = np.concatenate([np.full(n_items, len(unique_plants)), plant_codes])
+    total = comparison['Total Plant Requests'].to_numpy(dtype=float)
+    qty = np.concatenate([total, plant_qty[item_rows, plant_codes]])
+    
+    # Shares come from the positive plant quantities only, so negative requests
+    # (or a total of 0 or less) never give infinite, undefined or negative shares
+    shortfall = comparison['Net Difference'].clip(lower=0).to_numpy(dtype=float)
+    positive_total = plant_qty.clip(min=0).sum(axis=1)
+    share = np.ones(len(rows))
+    share[n_items:] = np.divide(
+        qty[n_items:], positive_total[item_rows], out=np.zeros(len(item_rows)), where=positive_total[item_rows] > 0
+    )
+    allocated = shortfall[rows] * share
+    
+    # One mixed-radix key per cell, then a single grouped sum
+    dimensions = get_dimensions()
+    sizes = [len(categories[dimension]) for dimension in dimensions]
+    key = np.zeros(len(rows), dtype=np.int64)
+    for dimension, size in zip(dimensions, sizes):
+        values = plants if dimension == 'Plant' else codes[dimension][rows]
+        key = key * size + values
+    
+    cells, inverse = np.unique(key, return_inverse=True)
+    cube = {}
+    remainder = cells
+    for dimension, size in reversed(list(zip(dimensions, sizes))):
+        remainder, position = np.divmod(remainder, size)
+        cube[dimension] = pd.Categorical.from_codes(position, categories=categories[dimension])
+    
+    cube = pd.DataFrame({dimension: cube[dimension] for dimension in dimensions})
+    cube['Items'] = np.bincount(inverse, minlength=len(cells))
+    cube['Requested Qty'] = np.bincount(inverse, weights=qty, minlength=len(cells))
+    cube['Net Shortfall'] = np.round(np.bincount(inverse, weights=allocated, minlength=len(cells)), 2)
+    
+    logger.info(f"Cube holds {len(cube)} cells over {', '.join(dimensions)}")
+    return cube
+
+
+def query_cube(cube, by=None, filters=None):
+    """Slice and roll up the cube.
+    
+    Args:
+        cube (DataFrame): Output of build_cube or load_cube
+        by (list, optional): Dimensions to keep, e.g. ['Projects', 'Status']; none gives the grand total
+        filters (dict, optional): Dimension -> value or list of values to keep,
+            e.g. {'Classification Calculated': 'A'}
+    
+    Returns:
+        DataFrame: The kept dimensions and the summed measures, one row per
+            combination present in the cube
+    """
+    by = list(by or [])
+    filters = filters or {}
+    unknown = [dimension for dimension in by + list(filters) if dimension not in cube.columns]
+    if unknown:
+        raise ValueError(f"Unknown cube dimension(s): {', '.join(unknown)}")
+    
+    # Plant rows are only summed when the query is about plants
+    by_plant = 'Plant' in by or 'Plant' in filters
+    mask = (cube['Plant'] != ALL_PLANTS) if by_plant else (cube['Plant'] == ALL_PLANTS)
+    for dimension, values in filters.items():
+        values = values if isinstance(values, (list, tuple, set)) else [values]
+        mask &= cube[dimension].isin(values)
+    
+    selected = cube[mask]
+    if not by:
+        result = pd.DataFrame([selected[MEASURES].sum()]).astype({'Items': int})
+    else:
+        result = selected.groupby(by, observed=True, as_index=False)[MEASURES].sum()
+    result['Net Shortfall'] = result['Net Shortfall'].round(2)
+    return result
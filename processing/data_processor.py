@@ -1,196 +1,163 @@
+import time
 import pandas as pd
 import logging
-from config import INVENTORY_COLUMNS
-from processing.status import get_enhanced_status, get_enhanced_recommendation
+from config import RUN_DATE, CHRONIC_STATUS, CHRONIC_MIN_CYCLES, DATAFRAME_ENGINE
+from processing.consolidation import keep_latest_submissions
+from processing.comparison import prepare_master
+from processing.engines import ENGINES, build_comparison
+from processing.summary import (
+    calculate_summary_statistics, calculate_plant_summary, calculate_value_summary, calculate_simulation_summary
+)
+from processing.valuation import add_shortfall_value
+from processing.simulation import simulate_shortfall_probabilities
+from processing.cube import build_cube
+from storage.history import append_history, find_status_streaks
+
+# The sharded path (multiprocessing) and the store (sqlite3) are imported
+# where they are used, so quick single-core runs do not pay for loading them
 
 logger = logging.getLogger(__name__)
 
-def process_data(df_master, df_responses):
+def process_data(df_master, df_responses, forecast_method=None, store=None, cycle=None, history_dir=None,
+                 workers=None, item_values=None, simulation_draws=None, engine=None):
     """Process the input data and generate analysis results.
     
     Args:
         df_master (DataFrame): Master data with forecast information
         df_responses (DataFrame): Plant response data with requested quantities
+        forecast_method (str, optional): Forecast recomputation method, defaults to config FORECAST_METHOD
+        store (sqlite3.Connection, optional): Store holding this cycle's responses; when given,
+            requests are aggregated in SQL instead of from df_responses
+        cycle (str, optional): Cycle identifier for the store and history, defaults to config RUN_DATE
+        history_dir (str, optional): Status history directory; when given, this run is appended
+            and items chronically in CHRONIC_STATUS are returned
+        workers (int, optional): Worker processes for item-sharded execution with the pandas engine;
+            1 or None runs on one core
+        item_values (DataFrame, optional): Unit Price, Criticality and/or lead time per Item Code
+        simulation_draws (int, optional): When given, simulate this many request scenarios per item
+            and add the probabilities of exceeding the moderate and high thresholds
+        engine (str, optional): Dataframe engine for aggregation, join and classification,
+            defaults to config DATAFRAME_ENGINE
         
     Returns:
-        dict: Dictionary containing processed data frames
+        dict: Dictionary containing processed data frames, including the
+            consolidated responses the analysis was based on and the aggregate cube
     """
     logger.info("\nProcessing data...")
+    cycle = cycle or RUN_DATE
+    engine = engine or DATAFRAME_ENGINE
+    
+    # Drop lines superseded by a later submission from the same plant before aggregating
+    df_responses, superseded = keep_latest_submissions(df_responses)
     
     # Get unique plants from responses
     unique_plants = sorted(df_responses['Plant'].unique())
     logger.info(f"Found {len(unique_plants)} unique plants in responses: {', '.join(unique_plants)}")
     
-    # Calculate total requests by item
-    logger.info("Calculating total plant requests...")
-    total_requests = df_responses.groupby('Item Code')['Qty Needed'].sum().reset_index()
-    total_requests.rename(columns={'Qty Needed': 'Total Plant Requests'}, inplace=True)
-    
-    # Calculate requests by plant
-    plant_requests = {}
-    for plant in unique_plants:
-        plant_data = df_responses[df_responses['Plant'] == plant].groupby('Item Code')['Qty Needed'].sum().reset_index()
-        plant_data.rename(columns={'Qty Needed': f'{plant} Requests'}, inplace=True)
-        plant_requests[plant] = plant_data
-    
-    # Ensure all required columns exist in df_master
-    available_columns = [col for col in INVENTORY_COLUMNS if col in df_master.columns]
+    # Aggregate in SQL when a store is given - the store returns one pre-summed line per item and plant
+    if store is not None:
+        from storage.sqlite_store import aggregate_requests_from_store
+        logger.info(f"Aggregating requests for cycle {cycle} from store...")
+        request_lines = aggregate_requests_from_store(store, cycle)
+    else:
+        request_lines = df_responses
     
     # Create comparison dataframe
     logger.info("Creating comparison analysis...")
-    comparison = pd.merge(df_master[available_columns], total_requests, on='Item Code', how='left')
-    
-    # Fill NaN values for items with no requests
-    comparison['Total Plant Requests'] = comparison['Total Plant Requests'].fillna(0)
-    
-    # Add plant-specific request columns
-    for plant, plant_df in plant_requests.items():
-        comparison = pd.merge(comparison, plant_df, on='Item Code', how='left')
-        comparison[f'{plant} Requests'] = comparison[f'{plant} Requests'].fillna(0)
-    
-    # Ensure numeric columns are properly formatted - replace NaN with 0
-    numeric_cols = ['Stock Qty', 'Open PRs Total 24 Months', 'Open POs Total 24 Months', 'Pr Not Confirmed 24 Months']
-    for col in numeric_cols:
-        if col in comparison.columns:
-            comparison[col] = comparison[col].fillna(0)
-    
-    # NEW: Convert Annual Forecast values less than 1 to 0
-    comparison['Adjusted Annual Forecast'] = comparison['Annual Forecast'].copy()
-    comparison.loc[comparison['Annual Forecast'] < 1, 'Adjusted Annual Forecast'] = 0
-    
-    # Calculate difference using Adjusted Annual Forecast
-    comparison['Difference'] = comparison['Total Plant Requests'] - comparison['Adjusted Annual Forecast']
-    
-    # NEW: Calculate total available inventory (stock + open orders)
-    comparison['Available Stock'] = comparison['Stock Qty'] if 'Stock Qty' in comparison.columns else 0
-    
-    # NEW: Calculate total pending orders
-    comparison['Pending Orders'] = (
-        (comparison['Open PRs Total 24 Months'] if 'Open PRs Total 24 Months' in comparison.columns else 0) +
-        (comparison['Open POs Total 24 Months'] if 'Open POs Total 24 Months' in comparison.columns else 0) +
-        (comparison['Pr Not Confirmed 24 Months'] if 'Pr Not Confirmed 24 Months' in comparison.columns else 0)
-    )
-    
-    # NEW: Calculate net difference after considering stock and pending orders
-    comparison['Net Difference'] = comparison['Difference'] - comparison['Available Stock'] - comparison['Pending Orders']
-    
-    # Apply enhanced status classification based on difference and inventory
-    comparison['Status'] = comparison.apply(get_enhanced_status, axis=1)
-    
-    # Add enhanced recommendation
-    comparison['Recommendation'] = comparison.apply(get_enhanced_recommendation, axis=1)
+    comparison = prepare_master(df_master, forecast_method, item_values)
+    
+    if workers and workers > 1 and engine == 'pandas':
+        # Aggregation, classification and summaries run per item shard
+        from processing.parallel import process_sharded
+        comparison, summary_stats, plant_summary = process_sharded(comparison, request_lines, unique_plants, workers)
+    else:
+        # Other engines parallelise internally, so they always see the whole item space
+        comparison = build_comparison(comparison, request_lines, unique_plants, engine)
+        
+        # Generate summary statistics
+        logger.info("Generating summary statistics...")
+        summary_stats = calculate_summary_statistics(comparison)
+        
+        # Generate plant summary
+        plant_summary = calculate_plant_summary(comparison, unique_plants)
     
-    # Convert numeric columns to integers
-    numeric_cols = [
-        'Annual Forecast', 'Adjusted Annual Forecast', 'Total Plant Requests', 
-        'Difference', 'Net Difference', 'Available Stock', 'Pending Orders'
-    ]
+    # Value-weighted Pareto ranking (only when prices or criticality are available)
+    comparison = add_shortfall_value(comparison, df_master, item_values)
+    if 'Shortfall Value' in comparison.columns:
+        summary_stats = pd.concat([summary_stats, calculate_value_summary(comparison)], ignore_index=True)
     
-    for col in numeric_cols:
-        if col in comparison.columns:
-            comparison[col] = comparison[col].astype(int)
+    # Probabilistic view of the shortfall next to the deterministic Status
+    if simulation_draws:
+        comparison = simulate_shortfall_probabilities(comparison, df_master, simulation_draws)
+        summary_stats = pd.concat([summary_stats, calculate_simulation_summary(comparison)], ignore_index=True)
     
-    # Convert plant request columns to integers
-    for plant in unique_plants:
-        comparison[f'{plant} Requests'] = comparison[f'{plant} Requests'].astype(int)
+    plant_summary = pd.merge(plant_summary, superseded, on='Plant', how='left')
     
-    # Generate summary statistics
-    logger.info("Generating summary statistics...")
-    summary_stats = calculate_summary_statistics(comparison)
+    # Roll-ups over classification, project, plant and status come from this cube
+    cube = build_cube(comparison, df_master, unique_plants)
     
-    # Generate plant summary
-    plant_summary = calculate_plant_summary(comparison, unique_plants)
+    # Record this run in the status history and pick out chronic deviations
+    chronic_items = None
+    if history_dir:
+        append_history(comparison, history_dir, cycle)
+        chronic_items = find_status_streaks(history_dir, CHRONIC_STATUS, CHRONIC_MIN_CYCLES)
+        logger.info(f"{len(chronic_items)} items {CHRONIC_STATUS} for {CHRONIC_MIN_CYCLES}+ cycles in a row")
     
     return {
         'comparison': comparison,
         'summary_stats': summary_stats,
         'plant_summary': plant_summary,
-        'unique_plants': unique_plants
+        'unique_plants': unique_plants,
+        'responses': df_responses,
+        'chronic_items': chronic_items,
+        'cube': cube
     }
 
 
-def calculate_summary_statistics(comparison):
-    """Generate enhanced summary statistics from comparison data.
-    
-    Args:
-        comparison (DataFrame): Processed comparison data
-        
-    Returns:
-        DataFrame: Summary statistics
-    """
-    
-    summary_stats = pd.DataFrame({
-        'Metric': [
-            'Total Items Analyzed',
-            'Items with High Deviation (>3 after stock & orders)',
-            'Items with Moderate Deviation (1-3 after stock & orders)',
-            'Items with Acceptable Match (=0)',
-            'Items with Low Request (<0)',
-            'Items Covered by Available Stock',
-            'Items Covered by Pending Orders',
-            'Items Needing Significant Increase',
-            'Items Needing Moderate Increase',
-            'Items Needing Forecast Reduction',
-            'Items with Adequate Forecast',
-            'Items with Forecast < 1 (Adjusted to 0)',
-            'Items with Stock Available',
-            'Items with Pending Orders'
-        ],
-        'Count': [
-            len(comparison),
-            len(comparison[comparison['Status'] == 'HIGH_DEVIATION']),
-            len(comparison[comparison['Status'] == 'MODERATE_DEVIATION']),
-            len(comparison[comparison['Status'] == 'ACCEPTABLE']),
-            len(comparison[comparison['Status'] == 'LOW_REQUEST']),
-            len(comparison[comparison['Status'] == 'COVERED_BY_STOCK']),
-            len(comparison[comparison['Status'] == 'COVERED_BY_ORDERS']),
-            len(comparison[comparison['Recommendation'] == 'Significant increase needed after using stock & orders']),
-            len(comparison[comparison['Recommendation'] == 'Moderate increase needed after using stock & orders']),
-            len(comparison[comparison['Recommendation'] == 'Consider reducing forecast']),
-            len(comparison[comparison['Recommendation'] == 'Current forecast appears adequate']),
-            len(comparison[comparison['Annual Forecast'] < 1]),
-            len(comparison[comparison['Available Stock'] > 0]),
-            len(comparison[comparison['Pending Orders'] > 0])
-        ]
-    })
+def check_engines(df_master, df_responses, engines=None, forecast_method=None, item_values=None):
+    """Run the analysis on each dataframe engine and compare the results.
     
-    return summary_stats
-
-
-def calculate_plant_summary(comparison, unique_plants):
-    """Generate plant summary statistics.
+    The first engine is the reference; comparison, summary statistics and
+    plant summary of every other engine must be identical to it. Store and
+    history are not touched.
     
     Args:
-        comparison (DataFrame): Processed comparison data
-        unique_plants (list): List of unique plant names
+        df_master (DataFrame): Master data with forecast information
+        df_responses (DataFrame): Plant response data with requested quantities
+        engines (list, optional): Engine names, defaults to all ENGINES with pandas first
+        forecast_method (str, optional): Forecast recomputation method
+        item_values (DataFrame, optional): Unit Price, Criticality and/or lead time per Item Code
         
     Returns:
-        DataFrame: Plant summary statistics
+        DataFrame: Engine, Seconds and Result ('reference', 'identical',
+            'different: ...' or 'unavailable: ...') per engine
     """
-    
-    plant_data = []
-    
-    for plant in unique_plants:
-        # Get items requested by this plant (where requests > 0)
-        plant_items = comparison[comparison[f'{plant} Requests'] > 0]
+    engines = engines or list(ENGINES)
+    rows = []
+    reference = None
+    for engine in engines:
+        start = time.perf_counter()
+        try:
+            result = process_data(
+                df_master, df_responses, forecast_method=forecast_method, item_values=item_values, engine=engine
+            )
+        except ImportError as e:
+            rows.append([engine, None, f"unavailable: {e}"])
+            continue
+        seconds = round(time.perf_counter() - start, 3)
         
-        # Count by status
-        high_dev = len(plant_items[plant_items['Status'] == 'HIGH_DEVIATION'])
-        moderate = len(plant_items[plant_items['Status'] == 'MODERATE_DEVIATION'])
-        acceptable = len(plant_items[plant_items['Status'] == 'ACCEPTABLE'])
-        low_req = len(plant_items[plant_items['Status'] == 'LOW_REQUEST'])
-        covered_by_stock = len(plant_items[plant_items['Status'] == 'COVERED_BY_STOCK'])
-        covered_by_orders = len(plant_items[plant_items['Status'] == 'COVERED_BY_ORDERS'])
+        if reference is None:
+            reference = result
+            rows.append([engine, seconds, 'reference'])
+            continue
         
-        plant_data.append({
-            'Plant': plant,
-            'Items Requested': len(plant_items),
-            'High Deviation Items': high_dev,
-            'Moderate Deviation Items': moderate,
-            'Acceptable Items': acceptable,
-            'Low Request Items': low_req,
-            'Covered by Stock': covered_by_stock,
-            'Covered by Orders': covered_by_orders
-        })
-    
-    return pd.DataFrame(plant_data)
\ No newline at end of file
+        outcome = 'identical'
+        for key in ('comparison', 'summary_stats', 'plant_summary'):
+            try:
+                pd.testing.assert_frame_equal(result[key], reference[key])
+            except AssertionError as e:
+                outcome = f"different: {key}: {' '.join(str(e).split())}"
+                break
+        rows.append([engine, seconds, outcome])
+    
+    return pd.DataFrame(rows, columns=['Engine', 'Seconds', 'Result'])
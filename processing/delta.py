@@ -0,0 +1,141 @@
+import logging
+import os
+import numpy as np
+import pandas as pd
+from storage.columnar import write_columns, read_columns, read_schema
+
+logger = logging.getLogger(__name__)
+
+# Comparison columns kept in snapshots and compared between runs
+SNAPSHOT_COLUMNS = [
+    'Item Code', 'Status', 'Recommendation',
+    'Total Plant Requests', 'Net Difference'
+]
+
+# Text columns stored as int8 codes, with their labels in the snapshot metadata
+CODED_COLUMNS = ['Status', 'Recommendation']
+
+
+def save_snapshot(comparison, snapshot_dir, run_date):
+    """Save this run's comparison results as a columnar snapshot.
+    
+    Args:
+        comparison (DataFrame): Processed comparison data
+        snapshot_dir (str): Directory holding one snapshot per run date
+        run_date (str): Run date used as the snapshot name
+        
+    Returns:
+        str: Path of the snapshot directory
+    """
+    os.makedirs(snapshot_dir, exist_ok=True)
+    path = os.path.join(snapshot_dir, run_date)
+    columns = [col for col in SNAPSHOT_COLUMNS if col in comparison.columns]
+    snapshot = comparison[columns].copy()
+    
+    categories = {}
+    for col in CODED_COLUMNS:
+        if col in snapshot.columns:
+            labels, codes = np.unique(snapshot[col].astype(str).to_numpy(), return_inverse=True)
+            categories[col] = labels.tolist()
+            snapshot[col] = codes.astype(np.int8)
+    
+    write_columns(snapshot, path, metadata={'run_date': run_date, 'categories': categories})
+    logger.info(f"Saved comparison snapshot to {path}")
+    
+    return path
+
+
+def find_previous_snapshot(snapshot_dir, run_date):
+    """Return the latest snapshot taken before run_date, or None."""
+    if not os.path.isdir(snapshot_dir):
+        return None
+    
+    earlier = sorted(
+        name for name in os.listdir(snapshot_dir)
+        if name < run_date and os.path.isdir(os.path.join(snapshot_dir, name)) and not name.endswith('.tmp')
+    )
+    return os.path.join(snapshot_dir, earlier[-1]) if earlier else None
+
+
+def load_previous_comparison(path):
+    """Load a previous run's comparison results.
+    
+    Args:
+        path (str): Snapshot directory, or a previous Gasket_Analysis workbook
+        
+    Returns:
+        DataFrame: Previous comparison results
+    """
+    if os.path.isdir(path):
+        previous = read_columns(path, SNAPSHOT_COLUMNS)
+        
+        # Earlier snapshots stored these columns as text and have no categories
+        categories = read_schema(path)['metadata'].get('categories', {})
+        for col, labels in categories.items():
+            previous[col] = np.asarray(labels, dtype=object)[previous[col].to_numpy()]
+        return previous
+    
+    # Fall back to the workbook: skip the 2 title rows and join any continuation sheets
+    logger.info("No snapshot available - reading previous comparison from workbook (slow)...")
+    sheets = pd.read_excel(path, sheet_name=None, header=2)
+    parts = [df for name, df in sheets.items() if name.startswith('Comparison Analysis')]
+    previous = pd.concat(parts, ignore_index=True)
+    
+    return previous[[col for col in SNAPSHOT_COLUMNS if col in previous.columns]]
+
+
+def build_delta(previous, current):
+    """Compare two runs' comparison results item by item.
+    
+    Args:
+        previous (DataFrame): Previous run's comparison results
+        current (DataFrame): This run's comparison results
+        
+    Returns:
+        DataFrame: One row per new, removed or changed item with the status
+            transition and quantity deltas
+    """
+    columns = ['Item Code', 'Status', 'Recommendation', 'Total Plant Requests', 'Net Difference']
+    previous = previous[columns].copy()
+    current = current[columns].copy()
+    
+    # Snapshots store item codes as text, so join on text on both sides
+    previous['Item Code'] = previous['Item Code'].astype(str)
+    current['Item Code'] = current['Item Code'].astype(str)
+    
+    merged = pd.merge(
+        previous, current, on='Item Code', how='outer',
+        suffixes=(' (Previous)', ' (Current)'), indicator=True
+    )
+    
+    requests_delta = merged['Total Plant Requests (Current)'].fillna(0) - merged['Total Plant Requests (Previous)'].fillna(0)
+    net_delta = merged['Net Difference (Current)'].fillna(0) - merged['Net Difference (Previous)'].fillna(0)
+    
+    change_type = np.select(
+        [
+            merged['_merge'] == 'right_only',
+            merged['_merge'] == 'left_only',
+            merged['Status (Previous)'] != merged['Status (Current)'],
+            merged['Recommendation (Previous)'] != merged['Recommendation (Current)'],
+            (requests_delta != 0) | (net_delta != 0),
+        ],
+        ['NEW', 'REMOVED', 'STATUS_CHANGED', 'RECOMMENDATION_CHANGED', 'QUANTITY_CHANGED'],
+        default=''
+    )
+    
+    merged['Change Type'] = change_type
+    merged['Requests Delta'] = requests_delta.astype(int)
+    merged['Net Difference Delta'] = net_delta.astype(int)
+    
+    changes = merged[change_type != ''].drop(columns='_merge')
+    changes = changes[[
+        'Item Code', 'Change Type', 'Status (Previous)', 'Status (Current)',
+        'Recommendation (Previous)', 'Recommendation (Current)',
+        'Total Plant Requests (Previous)', 'Total Plant Requests (Current)', 'Requests Delta',
+        'Net Difference (Previous)', 'Net Difference (Current)', 'Net Difference Delta'
+    ]].reset_index(drop=True)
+    
+    counts = changes['Change Type'].value_counts()
+    logger.info("Changes since previous run: " + (', '.join(f"{k}: {v}" for k, v in counts.items()) or 'none'))
+    
+    return changes
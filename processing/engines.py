@@ -0,0 +1,102 @@
+import logging
+import numpy as np
+import pandas as pd
+from config import DATAFRAME_ENGINE
+from processing.comparison import add_request_columns, classify_comparison, finalize_comparison
+
+logger = logging.getLogger(__name__)
+
+
+def build_comparison_pandas(comparison, request_lines, unique_plants):
+    """Aggregate, join and classify with pandas merges (the reference engine).
+    
+    Args:
+        comparison (DataFrame): Output of prepare_master
+        request_lines (DataFrame): Lines with Plant, Item Code and Qty Needed
+        unique_plants (list): List of unique plant names
+    
+    Returns:
+        DataFrame: Classified comparison in report order
+    """
+    comparison = add_request_columns(comparison, request_lines, unique_plants)
+    return finalize_comparison(classify_comparison(comparison), unique_plants)
+
+
+def build_comparison_polars(comparison, request_lines, unique_plants):
+    """Aggregate and join the requests as one lazy Polars plan, then classify.
+    
+    Item codes are factorized against the master first so the plan groups and
+    joins on integer keys; mixed-type code columns never reach Polars. The
+    plan sums every plant's requests in a single grouped pass and left-joins
+    the totals onto the master rows in their original order. Classification
+    runs on the collected columns with the same code as the pandas engine.
+    
+    Args:
+        comparison (DataFrame): Output of prepare_master
+        request_lines (DataFrame): Lines with Plant, Item Code and Qty Needed
+        unique_plants (list): List of unique plant names
+    
+    Returns:
+        DataFrame: Classified comparison in report order
+    """
+    try:
+        import polars as pl
+    except ImportError as e:
+        raise ImportError("The 'polars' engine needs the polars package (pip install polars)") from e
+    
+    n_items = len(comparison)
+    keys, _ = pd.factorize(pd.concat([comparison['Item Code'], request_lines['Item Code']], ignore_index=True))
+    
+    lines = pl.LazyFrame({
+        'key': keys[n_items:].astype(np.int64),
+        'plant': pd.Categorical(request_lines['Plant'], categories=unique_plants).codes.astype(np.int32),
+        'qty': np.nan_to_num(request_lines['Qty Needed'].to_numpy(dtype=float)),
+    }).filter(pl.col('key') >= 0)
+    
+    request_columns = ['Total Plant Requests'] + [f'{plant} Requests' for plant in unique_plants]
+    requests = lines.group_by('key').agg(
+        pl.col('qty').sum().alias('Total Plant Requests'),
+        *[
+            pl.col('qty').filter(pl.col('plant') == position).sum().alias(f'{plant} Requests')
+            for position, plant in enumerate(unique_plants)
+        ]
+    )
+    
+    items = pl.LazyFrame({'key': keys[:n_items].astype(np.int64)}).with_row_index('row')
+    joined = (
+        items.join(requests, on='key', how='left')
+        .sort('row')
+        .select([pl.col(col).fill_null(0.0) for col in request_columns])
+        .collect()
+    )
+    
+    for col in request_columns:
+        comparison[col] = joined[col].to_numpy()
+    
+    return finalize_comparison(classify_comparison(comparison), unique_plants)
+
+
+ENGINES = {
+    'pandas': build_comparison_pandas,
+    'polars': build_comparison_polars,
+}
+
+
+def build_comparison(comparison, request_lines, unique_plants, engine=None):
+    """Run the request aggregation, join and classification on the chosen engine.
+    
+    Args:
+        comparison (DataFrame): Output of prepare_master
+        request_lines (DataFrame): Lines with Plant, Item Code and Qty Needed
+        unique_plants (list): List of unique plant names
+        engine (str, optional): Key of ENGINES, defaults to config DATAFRAME_ENGINE
+    
+    Returns:
+        DataFrame: Classified comparison in report order
+    """
+    engine = engine or DATAFRAME_ENGINE
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown dataframe engine '{engine}'. Choose from: {', '.join(ENGINES)}")
+    
+    logger.info(f"Building comparison with the {engine} engine...")
+    return ENGINES[engine](comparison, request_lines, unique_plants)
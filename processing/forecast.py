@@ -0,0 +1,101 @@
+import logging
+import numpy as np
+import pandas as pd
+from config import (
+    ACCUMULATED_COLUMNS, FORECAST_METHOD, FORECAST_WEIGHTS, FORECAST_BLEND_WEIGHT,
+    FORECAST_DIVERGENCE_UNITS, FORECAST_DIVERGENCE_RATIO
+)
+
+logger = logging.getLogger(__name__)
+
+
+def get_annual_consumption(df_master):
+    """Split the accumulated consumption windows into yearly buckets.
+    
+    Args:
+        df_master (DataFrame): Master data with Accumulated (12m/24m/36m) columns
+        
+    Returns:
+        ndarray: Array of shape (items, 3) holding the last, previous and oldest
+            year's consumption. Missing windows count as 0 and negative buckets
+            (inconsistent windows) are clipped to 0.
+    """
+    windows = []
+    for col in ACCUMULATED_COLUMNS:
+        if col in df_master.columns:
+            windows.append(pd.to_numeric(df_master[col], errors='coerce').fillna(0).to_numpy(dtype=float))
+        else:
+            windows.append(np.zeros(len(df_master)))
+    
+    accumulated = np.column_stack(windows)
+    
+    # 24m - 12m is the previous year, 36m - 24m the year before that
+    yearly = np.diff(accumulated, axis=1, prepend=0)
+    return np.clip(yearly, 0, None)
+
+
+def weighted_moving_average(yearly):
+    """Weighted average of the yearly buckets, favouring the latest year."""
+    weights = np.asarray(FORECAST_WEIGHTS, dtype=float)
+    return yearly @ (weights / weights.sum())
+
+
+def trend_adjusted(yearly):
+    """Least-squares trend over the three years projected one year ahead."""
+    # Years are centred at x = 1 (last), 0 (previous), -1 (oldest), so the
+    # next year sits at x = 2
+    mean = yearly.mean(axis=1)
+    slope = (yearly[:, 0] - yearly[:, 2]) / 2
+    return np.clip(mean + 2 * slope, 0, None)
+
+
+def min_max_blend(yearly):
+    """Blend of the busiest and quietest year."""
+    return FORECAST_BLEND_WEIGHT * yearly.max(axis=1) + (1 - FORECAST_BLEND_WEIGHT) * yearly.min(axis=1)
+
+
+FORECAST_METHODS = {
+    'weighted_moving_average': weighted_moving_average,
+    'trend_adjusted': trend_adjusted,
+    'min_max_blend': min_max_blend,
+}
+
+
+def recompute_forecast(df_master, method=None):
+    """Recompute the annual forecast for every master item in one pass.
+    
+    Args:
+        df_master (DataFrame): Master data with forecast and accumulated consumption
+        method (str, optional): Key of FORECAST_METHODS, defaults to config FORECAST_METHOD
+        
+    Returns:
+        DataFrame: Recomputed Forecast, Forecast Divergence and Forecast Diverges
+            columns aligned with df_master, or None when the master carries no
+            accumulated consumption columns
+    """
+    method = method or FORECAST_METHOD
+    if method not in FORECAST_METHODS:
+        raise ValueError(f"Unknown forecast method '{method}'. Choose from: {', '.join(FORECAST_METHODS)}")
+    
+    if not any(col in df_master.columns for col in ACCUMULATED_COLUMNS):
+        logger.warning("No accumulated consumption columns in Master - skipping forecast recomputation")
+        return None
+    
+    logger.info(f"Recomputing annual forecast ({method})...")
+    yearly = get_annual_consumption(df_master)
+    recomputed = np.rint(FORECAST_METHODS[method](yearly))
+    
+    master_forecast = pd.to_numeric(df_master['Annual Forecast'], errors='coerce').fillna(0).to_numpy(dtype=float)
+    divergence = master_forecast - recomputed
+    
+    # Flag only gaps that are large in both absolute and relative terms
+    tolerance = np.maximum(FORECAST_DIVERGENCE_UNITS, FORECAST_DIVERGENCE_RATIO * recomputed)
+    diverges = np.abs(divergence) > tolerance
+    
+    logger.info(f"{int(diverges.sum())} items have a master forecast diverging from the recomputed forecast")
+    
+    return pd.DataFrame({
+        'Recomputed Forecast': recomputed.astype(int),
+        'Forecast Divergence': np.rint(divergence).astype(int),
+        'Forecast Diverges': diverges
+    }, index=df_master.index)
@@ -0,0 +1,148 @@
+import logging
+import hashlib
+import os
+import shutil
+import pandas as pd
+from storage.columnar import write_columns, read_columns
+from config import RESPONSE_COLUMNS, RESPONSE_FILE_EXTENSIONS, INGEST_MAX_WORKERS
+
+logger = logging.getLogger(__name__)
+
+
+def read_input_file(path, cache_dir=None):
+    """Read a workbook or CSV input file.
+    
+    Parsing a workbook dominates a quick run, so when cache_dir is given the
+    parsed frame is written there in columnar form and reused for as long as
+    the workbook's size and modification time are unchanged. Caches are keyed
+    on the absolute path, so same-named workbooks in different folders do not
+    evict each other. The cache holds plain arrays and JSON only, so nothing
+    in it is executed when it is read back.
+    
+    Args:
+        path (str): Workbook or CSV path
+        cache_dir (str, optional): Directory for parsed-workbook caches
+        
+    Returns:
+        DataFrame: File contents
+    """
+    if path.lower().endswith('.csv'):
+        return pd.read_csv(path)
+    
+    if not cache_dir:
+        return pd.read_excel(path)
+    
+    stat = os.stat(path)
+    path_key = hashlib.sha1(os.path.abspath(path).encode('utf-8')).hexdigest()[:12]
+    cache_prefix = f"{os.path.basename(path)}.{path_key}."
+    cache_name = f"{cache_prefix}{stat.st_size}.{stat.st_mtime_ns}"
+    cache_path = os.path.join(cache_dir, cache_name)
+    if os.path.isdir(cache_path):
+        logger.info(f"Using cached copy of {os.path.basename(path)}")
+        return read_columns(cache_path)
+    
+    df = pd.read_excel(path)
+    
+    # Replace any cache of an older version of the same workbook
+    os.makedirs(cache_dir, exist_ok=True)
+    for name in os.listdir(cache_dir):
+        if name.startswith(cache_prefix):
+            shutil.rmtree(os.path.join(cache_dir, name), ignore_errors=True)
+    write_columns(df, cache_path, exact=True)
+    
+    return df
+
+
+def load_responses(path, max_workers=None, cache_dir=None):
+    """Load plant responses from a single workbook or a directory of per-plant files.
+    
+    Args:
+        path (str): Responses workbook, or directory of per-plant workbooks/CSVs
+        max_workers (int, optional): Pool size for directory ingest
+        cache_dir (str, optional): Directory for parsed-workbook caches (single files only)
+        
+    Returns:
+        DataFrame: Response data in the shape process_data expects
+    """
+    if os.path.isdir(path):
+        return load_response_directory(path, max_workers)
+    
+    return read_input_file(path, cache_dir)
+
+
+def load_response_directory(directory, max_workers=None):
+    """Load every per-plant response file in a directory concurrently.
+    
+    Excel files are parsed in a process pool because openpyxl holds the GIL;
+    CSV-only directories use a thread pool since pandas' C parser releases it.
+    Either way the total load time is bounded by the slowest file.
+    
+    Args:
+        directory (str): Directory containing per-plant response files
+        max_workers (int, optional): Pool size, defaults to config INGEST_MAX_WORKERS
+        
+    Returns:
+        DataFrame: Concatenated responses with a Source File column
+    """
+    files = sorted(
+        os.path.join(directory, name) for name in os.listdir(directory)
+        if name.lower().endswith(RESPONSE_FILE_EXTENSIONS) and not name.startswith('~$')
+    )
+    if not files:
+        raise FileNotFoundError(f"No response files found in {directory}")
+    
+    from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+    
+    max_workers = max_workers or INGEST_MAX_WORKERS or min(32, os.cpu_count() or 1)
+    max_workers = min(max_workers, len(files))
+    csv_only = all(path.lower().endswith('.csv') for path in files)
+    executor_class = ThreadPoolExecutor if csv_only else ProcessPoolExecutor
+    
+    logger.info(f"Loading {len(files)} response files with {max_workers} workers...")
+    with executor_class(max_workers=max_workers) as executor:
+        frames = list(executor.map(_read_response_file, files))
+    
+    # Validate every file before failing so all problems are reported at once
+    errors = []
+    for path, frame in zip(files, frames):
+        error = validate_response_frame(frame)
+        if error:
+            errors.append(f"{os.path.basename(path)}: {error}")
+    if errors:
+        raise ValueError("Invalid response files:\n" + "\n".join(errors))
+    
+    df_responses = pd.concat(frames, ignore_index=True)
+    logger.info(f"Loaded {len(df_responses)} response records from {len(files)} files")
+    
+    return df_responses
+
+
+def validate_response_frame(frame):
+    """Check that a response frame carries usable Plant, Item Code and Qty Needed columns.
+    
+    Args:
+        frame (DataFrame): Response data loaded from one file
+        
+    Returns:
+        str: Description of the problem, or None if the frame is valid
+    """
+    missing = [col for col in RESPONSE_COLUMNS if col not in frame.columns]
+    if missing:
+        return f"missing columns {', '.join(missing)}"
+    if frame.empty:
+        return "no response rows"
+    
+    qty = pd.to_numeric(frame['Qty Needed'], errors='coerce')
+    if qty.isna().all():
+        return "Qty Needed has no numeric values"
+    if frame['Plant'].isna().all():
+        return "Plant is empty"
+    
+    return None
+
+
+def _read_response_file(path):
+    """Read one response file (runs inside a pool worker)."""
+    frame = read_input_file(path)
+    frame['Source File'] = os.path.basename(path)
+    return frame
@@ -0,0 +1,97 @@
+import logging
+from statistics import NormalDist
+import numpy as np
+import pandas as pd
+from config import (
+    ACCUMULATED_COLUMNS, INVENTORY_POLICY_ENABLED, SERVICE_LEVEL, LEAD_TIME_COLUMN, DEFAULT_LEAD_TIME_DAYS
+)
+from processing.forecast import get_annual_consumption
+
+logger = logging.getLogger(__name__)
+
+DAYS_PER_YEAR = 365
+
+
+def get_lead_times(df_master, item_values=None):
+    """Lead time in days for every master row.
+    
+    The master's lead time column is used where present; an item values file
+    with the same column overrides it per Item Code. Missing or invalid lead
+    times fall back to DEFAULT_LEAD_TIME_DAYS.
+    
+    Args:
+        df_master (DataFrame): Master data
+        item_values (DataFrame, optional): Per-item data with Item Code and a lead time column
+    
+    Returns:
+        ndarray: Lead times aligned with df_master
+    """
+    lead_time = np.full(len(df_master), np.nan)
+    if LEAD_TIME_COLUMN in df_master.columns:
+        lead_time = pd.to_numeric(df_master[LEAD_TIME_COLUMN], errors='coerce').to_numpy(dtype=float, copy=True)
+    
+    if item_values is not None and LEAD_TIME_COLUMN in item_values.columns:
+        overrides = item_values.drop_duplicates('Item Code', keep='last')
+        positions = pd.Index(overrides['Item Code']).get_indexer(df_master['Item Code'])
+        override = pd.to_numeric(overrides[LEAD_TIME_COLUMN], errors='coerce').to_numpy(dtype=float)
+        found = positions >= 0
+        found[found] = ~np.isnan(override[positions[found]])
+        lead_time[found] = override[positions[found]]
+    
+    invalid = np.isnan(lead_time) | (lead_time < 0)
+    lead_time[invalid] = DEFAULT_LEAD_TIME_DAYS
+    return lead_time
+
+
+def compute_reorder_points(df_master, available_stock, pending_orders, item_values=None):
+    """Safety stock and reorder point for every master item at once.
+    
+    Annual demand and its variability come from the yearly consumption buckets
+    of the accumulated columns. Over a lead time of L days:
+        
+        safety stock  = z * std(annual demand) * sqrt(L / 365)
+        reorder point = mean(annual demand) * L / 365 + safety stock
+    
+    with z the normal quantile of SERVICE_LEVEL. An item is below its reorder
+    point when available stock plus pending orders is under it.
+    
+    Args:
+        df_master (DataFrame): Master data with accumulated consumption
+        available_stock (ndarray): Available stock aligned with df_master
+        pending_orders (ndarray): Pending orders aligned with df_master
+        item_values (DataFrame, optional): Per-item lead times
+    
+    Returns:
+        DataFrame: Demand Std Dev, Lead Time (Days), Safety Stock, Reorder Point
+            and Below Reorder Point aligned with df_master, or None when the
+            policy is disabled or the master has no accumulated columns
+    """
+    if not INVENTORY_POLICY_ENABLED:
+        return None
+    if not any(col in df_master.columns for col in ACCUMULATED_COLUMNS):
+        logger.warning("No accumulated consumption columns in Master - skipping reorder points")
+        return None
+    
+    logger.info(f"Calculating safety stock and reorder points ({SERVICE_LEVEL:.0%} service level)...")
+    yearly = get_annual_consumption(df_master)
+    mean_demand = yearly.mean(axis=1)
+    demand_std = yearly.std(axis=1, ddof=1)
+    
+    lead_time = get_lead_times(df_master, item_values)
+    lead_time_years = lead_time / DAYS_PER_YEAR
+    z = NormalDist().inv_cdf(SERVICE_LEVEL)
+    
+    safety_stock = np.ceil(z * demand_std * np.sqrt(lead_time_years))
+    reorder_point = np.ceil(mean_demand * lead_time_years + safety_stock)
+    position = np.asarray(available_stock, dtype=float) + np.asarray(pending_orders, dtype=float)
+    below = position < reorder_point
+    
+    logger.info(f"{int(below.sum())} items have stock and pending orders below their reorder point")
+    
+    return pd.DataFrame({
+        'Demand Std Dev': np.round(demand_std, 1),
+        'Lead Time (Days)': lead_time.astype(int),
+        'Safety Stock': safety_stock.astype(int),
+        'Reorder Point': reorder_point.astype(int),
+        'Below Reorder Point': below
+    }, index=df_master.index)
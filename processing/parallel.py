@@ -0,0 +1,228 @@
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+import numpy as np
+import pandas as pd
+from processing.comparison import compute_differences, finalize_comparison
+from processing.status import STATUS_NAMES, RECOMMENDATION_NAMES, classify_codes
+from processing.summary import calculate_summary_statistics, calculate_plant_summary
+
+logger = logging.getLogger(__name__)
+
+# Shared arrays and run settings, attached once per worker process by _init_worker
+_worker_state = {}
+
+
+def process_sharded(comparison, request_lines, unique_plants, workers):
+    """Aggregate, classify and summarise the comparison across worker processes.
+    
+    The item space is hash-partitioned into one shard per worker. Master and
+    response columns are placed in shared memory once; each worker reads its
+    shard from there, writes its rows of the results back into shared output
+    arrays and returns only its partial summaries, which are merged here.
+    
+    Args:
+        comparison (DataFrame): Output of prepare_master
+        request_lines (DataFrame): Lines with Plant, Item Code and Qty Needed
+        unique_plants (list): List of unique plant names
+        workers (int): Number of worker processes (and shards)
+        
+    Returns:
+        tuple: (comparison, summary_stats, plant_summary) matching the single-core path
+    """
+    logger.info(f"Processing {len(comparison)} items in {workers} shards...")
+    n_items = len(comparison)
+    
+    # Join keys shared by master and response lines (-1 for missing item codes)
+    keys, uniques = pd.factorize(pd.concat([comparison['Item Code'], request_lines['Item Code']], ignore_index=True))
+    item_keys = keys[:n_items]
+    line_keys = keys[n_items:]
+    
+    # Hash-partition the item space and group rows and lines by shard
+    key_shard = (pd.util.hash_pandas_object(pd.Series(uniques), index=False).to_numpy() % workers).astype(np.int32)
+    item_shard = key_shard[item_keys]
+    line_shard = np.where(line_keys >= 0, key_shard[line_keys], -1)
+    item_order = np.argsort(item_shard, kind='stable')
+    line_order = np.argsort(line_shard, kind='stable')
+    item_bounds = np.searchsorted(item_shard[item_order], np.arange(workers + 1))
+    line_bounds = np.searchsorted(line_shard[line_order], np.arange(workers + 1))
+    
+    inputs = {
+        'item_keys': item_keys.astype(np.int64),
+        'item_order': item_order,
+        'line_keys': line_keys.astype(np.int64),
+        'line_order': line_order,
+        'line_plant': pd.Categorical(request_lines['Plant'], categories=unique_plants).codes.astype(np.int32),
+        'line_qty': np.nan_to_num(request_lines['Qty Needed'].to_numpy(dtype=float)),
+        'annual_forecast': comparison['Annual Forecast'].to_numpy(dtype=float),
+        'adjusted_forecast': comparison['Adjusted Annual Forecast'].to_numpy(dtype=float),
+        'available_stock': comparison['Available Stock'].to_numpy(dtype=float),
+        'pending_orders': comparison['Pending Orders'].to_numpy(dtype=float),
+    }
+    if 'Forecast Diverges' in comparison.columns:
+        inputs['forecast_diverges'] = comparison['Forecast Diverges'].to_numpy(dtype=bool)
+    if 'Below Reorder Point' in comparison.columns:
+        inputs['below_reorder_point'] = comparison['Below Reorder Point'].to_numpy(dtype=bool)
+    
+    outputs = {
+        'total_requests': np.zeros(n_items),
+        'plant_requests': np.zeros((n_items, len(unique_plants))),
+        'difference': np.zeros(n_items),
+        'net_difference': np.zeros(n_items),
+        'status': np.zeros(n_items, dtype=np.int8),
+        'recommendation': np.zeros(n_items, dtype=np.int8),
+    }
+    
+    segments = []
+    views = {}
+    descriptors = {}
+    try:
+        for name, array in {**inputs, **outputs}.items():
+            segment, views[name], descriptors[name] = _share_array(array)
+            segments.append(segment)
+        
+        shards = [
+            (item_bounds[s], item_bounds[s + 1], line_bounds[s], line_bounds[s + 1])
+            for s in range(workers)
+        ]
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_worker, initargs=(descriptors, unique_plants)
+        ) as executor:
+            partials = list(executor.map(_process_shard, shards))
+        
+        results = {name: views[name].copy() for name in outputs}
+    finally:
+        # Views must go before their segments can be closed
+        views.clear()
+        for segment in segments:
+            segment.close()
+            segment.unlink()
+    
+    # Assemble the comparison from the shared outputs
+    comparison['Total Plant Requests'] = results['total_requests']
+    for position, plant in enumerate(unique_plants):
+        comparison[f'{plant} Requests'] = results['plant_requests'][:, position]
+    comparison['Difference'] = results['difference']
+    comparison['Net Difference'] = results['net_difference']
+    comparison['Status'] = STATUS_NAMES[results['status']]
+    comparison['Recommendation'] = RECOMMENDATION_NAMES[results['recommendation']]
+    comparison = finalize_comparison(comparison, unique_plants)
+    
+    # Reduce the partial summaries
+    summary_stats = pd.concat([summary for summary, _ in partials]) \
+        .groupby('Metric', sort=False, as_index=False)['Count'].sum()
+    plant_summary = pd.concat([plants for _, plants in partials]) \
+        .groupby('Plant', sort=False, as_index=False).sum()
+    
+    return comparison, summary_stats, plant_summary
+
+
+def _share_array(array):
+    """Copy an array into a new shared memory segment.
+    
+    Returns:
+        tuple: (SharedMemory, array view on the segment, descriptor for _attach_array).
+            The view must be released before the segment is closed.
+    """
+    array = np.ascontiguousarray(array)
+    segment = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+    view = np.ndarray(array.shape, dtype=array.dtype, buffer=segment.buf)
+    view[...] = array
+    return segment, view, (segment.name, array.shape, array.dtype.str)
+
+
+def _attach_array(descriptor):
+    """Attach to a shared segment and view it as an array."""
+    name, shape, dtype = descriptor
+    segment = shared_memory.SharedMemory(name=name)
+    return segment, np.ndarray(shape, dtype=np.dtype(dtype), buffer=segment.buf)
+
+
+def _init_worker(descriptors, unique_plants):
+    """Attach the shared arrays in a worker process."""
+    _worker_state['segments'] = []
+    _worker_state['arrays'] = {}
+    for name, descriptor in descriptors.items():
+        segment, array = _attach_array(descriptor)
+        _worker_state['segments'].append(segment)
+        _worker_state['arrays'][name] = array
+    _worker_state['unique_plants'] = unique_plants
+
+
+def _process_shard(bounds):
+    """Aggregate, classify and summarise one shard (runs inside a worker).
+    
+    Args:
+        bounds (tuple): Start/end offsets of the shard in item_order and line_order
+        
+    Returns:
+        tuple: Partial summary statistics and plant summary for the shard
+    """
+    item_start, item_end, line_start, line_end = bounds
+    arrays = _worker_state['arrays']
+    unique_plants = _worker_state['unique_plants']
+    n_plants = len(unique_plants)
+    
+    rows = arrays['item_order'][item_start:item_end]
+    lines = arrays['line_order'][line_start:line_end]
+    
+    # Sum requests per item key, overall and per plant. One extra all-zero
+    # slot at the end stands in for master rows nobody requested.
+    shard_keys, local_keys = np.unique(arrays['line_keys'][lines], return_inverse=True)
+    qty = arrays['line_qty'][lines]
+    plant = arrays['line_plant'][lines]
+    n_keys = len(shard_keys)
+    key_totals = np.bincount(local_keys, weights=qty, minlength=n_keys + 1)
+    
+    known_plant = plant >= 0
+    key_plant_totals = np.bincount(
+        local_keys[known_plant] * n_plants + plant[known_plant],
+        weights=qty[known_plant], minlength=(n_keys + 1) * n_plants
+    ).reshape(n_keys + 1, n_plants)
+    
+    # Look each master row up among the shard's requested keys
+    row_keys = arrays['item_keys'][rows]
+    positions = np.searchsorted(shard_keys, row_keys)
+    requested = positions < n_keys
+    requested[requested] = shard_keys[positions[requested]] == row_keys[requested]
+    positions = np.where(requested, positions, n_keys)
+    
+    total_requests = key_totals[positions]
+    plant_requests = key_plant_totals[positions]
+    
+    # Classify the shard's rows
+    adjusted = arrays['adjusted_forecast'][rows]
+    available = arrays['available_stock'][rows]
+    pending = arrays['pending_orders'][rows]
+    difference, net_difference = compute_differences(total_requests, adjusted, available, pending)
+    columns = {
+        'difference': difference, 'net_difference': net_difference,
+        'available_stock': available, 'pending_orders': pending
+    }
+    if 'below_reorder_point' in arrays:
+        columns['below_reorder_point'] = arrays['below_reorder_point'][rows]
+    status, recommendation = classify_codes(columns)
+    
+    arrays['total_requests'][rows] = total_requests
+    arrays['plant_requests'][rows] = plant_requests
+    arrays['difference'][rows] = difference
+    arrays['net_difference'][rows] = net_difference
+    arrays['status'][rows] = status
+    arrays['recommendation'][rows] = recommendation
+    
+    # Partial summaries over the shard, computed on integer values as in the single-core path
+    shard = pd.DataFrame({
+        'Annual Forecast': arrays['annual_forecast'][rows].astype(int),
+        'Available Stock': available.astype(int),
+        'Pending Orders': pending.astype(int),
+        'Status': STATUS_NAMES[status],
+        'Recommendation': RECOMMENDATION_NAMES[recommendation],
+    })
+    if 'forecast_diverges' in arrays:
+        shard['Forecast Diverges'] = arrays['forecast_diverges'][rows]
+    if 'below_reorder_point' in arrays:
+        shard['Below Reorder Point'] = arrays['below_reorder_point'][rows]
+    for position, plant_name in enumerate(unique_plants):
+        shard[f'{plant_name} Requests'] = plant_requests[:, position].astype(int)
+    
+    return calculate_summary_statistics(shard), calculate_plant_summary(shard, unique_plants)
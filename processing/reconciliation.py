@@ -0,0 +1,288 @@
+import logging
+import re
+import numpy as np
+import pandas as pd
+from config import RECONCILE_NGRAM, RECONCILE_CANDIDATES, RECONCILE_MIN_SCORE, RECONCILE_MAX_POSTINGS
+
+logger = logging.getLogger(__name__)
+
+# Scores for matches found through the exact key lookups; n-gram matches score their Dice coefficient
+NORMALIZED_SCORE = 1.0
+TRANSPOSITION_SCORE = 0.95
+RESCORE_CANDIDATES = 20
+
+NON_KEY_CHARACTERS = re.compile(r'[^0-9A-Z]')
+
+MATCH_COLUMNS = [
+    'Response Item Code', 'Lines', 'Rank', 'Master Item Code', 'Description', 'Score', 'Match', 'Applied'
+]
+
+
+def normalize_codes(values):
+    """Upper-case item codes with spaces, dashes and other punctuation removed.
+    
+    Whole-number floats (codes read from a numeric column, e.g. 1001.0) are
+    written as integers first, so they get the same key as the text "1001".
+    Each distinct value is normalized once and mapped back to the rows.
+    
+    Args:
+        values (Series): Item codes or descriptions
+    
+    Returns:
+        Series: Normalized keys ('' for missing values)
+    """
+    codes, uniques = pd.factorize(values)
+    text = pd.Series([_code_text(value) for value in uniques], dtype=object)
+    keys = text.str.upper().str.replace(NON_KEY_CHARACTERS, '', regex=True).to_numpy(dtype=object)
+    return pd.Series(np.append(keys, '')[codes], index=values.index, dtype=object)
+
+
+def _code_text(value):
+    """Text of an item code, with whole-number floats written as integers."""
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def build_match_index(df_master):
+    """Build the lookup structures for reconciling item codes against the master.
+    
+    Holds a dict of normalized item code keys and two character n-gram indexes
+    (item codes and descriptions) stored as CSR posting lists: the master rows
+    containing gram g are rows[offsets[g]:offsets[g + 1]].
+    
+    Args:
+        df_master (DataFrame): Master data with Item Code and optional Description
+    
+    Returns:
+        dict: Match index used by find_candidates
+    """
+    codes = df_master['Item Code'].reset_index(drop=True)
+    keys = normalize_codes(codes)
+    
+    # Normalized key -> master rows; a key shared by several master codes is ambiguous
+    key_rows = pd.Series(np.arange(len(keys)), index=keys.to_numpy())
+    key_rows = key_rows[keys.to_numpy() != '']
+    key_groups = key_rows.groupby(level=0, sort=False)
+    key_lookup = dict(zip(key_groups.first().index, key_groups.first().to_numpy()))
+    ambiguous_keys = set(key_groups.size().index[key_groups.size().to_numpy() > 1])
+    
+    if 'Description' in df_master.columns:
+        descriptions = df_master['Description'].reset_index(drop=True)
+    else:
+        descriptions = pd.Series('', index=codes.index)
+    description_keys = normalize_codes(descriptions)
+    
+    index = {
+        'codes': codes,
+        'descriptions': descriptions,
+        'keys': keys.to_numpy(dtype=object),
+        'key_lookup': key_lookup,
+        'ambiguous_keys': ambiguous_keys,
+        'description_keys': description_keys.to_numpy(dtype=object),
+        'code_grams': _build_ngram_index(keys),
+        'description_grams': _build_ngram_index(description_keys),
+    }
+    logger.info(f"Built match index over {len(codes)} master items")
+    return index
+
+
+def find_candidates(index, code, limit=None):
+    """Rank master items that a response item code most likely refers to.
+    
+    An exact normalized key (stray spaces, dashes, case) wins outright, then a
+    single swap of adjacent characters, then the Dice similarity of character
+    n-grams against master item codes and descriptions.
+    
+    Args:
+        index (dict): Output of build_match_index
+        code: Response item code
+        limit (int, optional): Candidates to return, defaults to config RECONCILE_CANDIDATES
+    
+    Returns:
+        list: (master row, score, match type) tuples, best first
+    """
+    limit = limit or RECONCILE_CANDIDATES
+    key = NON_KEY_CHARACTERS.sub('', _code_text(code).upper()) if pd.notna(code) else ''
+    if not key:
+        return []
+    
+    scores = {}
+    
+    def offer(row, score, match):
+        if score > scores.get(row, (0, None))[0]:
+            scores[row] = (score, match)
+    
+    key_lookup = index['key_lookup']
+    if key in key_lookup:
+        offer(key_lookup[key], NORMALIZED_SCORE, 'normalized')
+    
+    for i in range(len(key) - 1):
+        if key[i] != key[i + 1]:
+            swapped = key[:i] + key[i + 1] + key[i] + key[i + 2:]
+            if swapped in key_lookup:
+                offer(key_lookup[swapped], TRANSPOSITION_SCORE, 'transposition')
+    
+    query_grams = _grams(key)
+    for grams_index, texts, match in (
+        (index['code_grams'], index['keys'], 'code n-gram'),
+        (index['description_grams'], index['description_keys'], 'description n-gram'),
+    ):
+        for row, score in _ngram_matches(grams_index, query_grams, texts):
+            offer(row, score, match)
+    
+    ranked = sorted(scores.items(), key=lambda item: (-item[1][0], item[0]))[:limit]
+    return [(row, score, match) for row, (score, match) in ranked]
+
+
+def reconcile_responses(df_master, df_responses, auto_apply=False, index=None):
+    """Find master candidates for response item codes that are not in the master.
+    
+    Each distinct orphan code is looked up once. With auto_apply, a top
+    candidate scoring at least RECONCILE_MIN_SCORE and clearly ahead of the
+    runner-up replaces the orphan code before aggregation; the code the plant
+    typed is kept in a 'Reconciled From' column.
+    
+    Args:
+        df_master (DataFrame): Master data
+        df_responses (DataFrame): Plant response data
+        auto_apply (bool): Rewrite high-confidence matches in the responses
+        index (dict, optional): Prebuilt output of build_match_index
+    
+    Returns:
+        tuple: (DataFrame of responses, DataFrame of ranked candidates per orphan code)
+    """
+    codes = df_responses['Item Code']
+    orphan_mask = ~codes.isin(df_master['Item Code']) & (normalize_codes(codes) != '')
+    if not orphan_mask.any():
+        logger.info("All response item codes found in master - nothing to reconcile")
+        return df_responses, pd.DataFrame(columns=MATCH_COLUMNS)
+    
+    orphan_lines = codes[orphan_mask].value_counts(sort=False)
+    logger.info(f"Reconciling {len(orphan_lines)} response item codes not found in master...")
+    if index is None:
+        index = build_match_index(df_master)
+    
+    rows = []
+    mapping = {}
+    for orphan, lines in orphan_lines.items():
+        candidates = find_candidates(index, orphan)
+        if not candidates:
+            rows.append([orphan, lines, None, None, None, 0.0, None, False])
+            continue
+        
+        top_row, top_score, top_match = candidates[0]
+        runner_up = candidates[1][1] if len(candidates) > 1 else 0.0
+        confident = (
+            top_score >= RECONCILE_MIN_SCORE and top_score > runner_up
+            and not (top_match == 'normalized' and index['keys'][top_row] in index['ambiguous_keys'])
+        )
+        applied = auto_apply and confident
+        if applied:
+            mapping[orphan] = index['codes'].iloc[top_row]
+        
+        for rank, (row, score, match) in enumerate(candidates, start=1):
+            rows.append([
+                orphan, lines, rank, index['codes'].iloc[row], index['descriptions'].iloc[row],
+                round(score, 3), match, applied and rank == 1
+            ])
+    
+    matches = pd.DataFrame(rows, columns=MATCH_COLUMNS)
+    
+    if mapping:
+        for orphan, master_code in mapping.items():
+            logger.info(f"Reconciled item code '{orphan}' -> '{master_code}' ({orphan_lines[orphan]} lines)")
+        df_responses = df_responses.copy()
+        remapped = codes.isin(list(mapping))
+        df_responses['Reconciled From'] = codes.where(remapped)
+        # Master codes may be numbers while the typed codes are text
+        df_responses['Item Code'] = codes.astype(object).mask(remapped, codes.map(mapping))
+    
+    logger.info(f"Reconciliation: {len(orphan_lines)} orphan codes, {len(mapping)} mapped to master items")
+    return df_responses, matches
+
+
+def _grams(text):
+    """Character n-grams of a normalized key as integers (bytes read big-endian).
+    
+    Keys are padded with '^' and '$' so short keys still produce grams and
+    leading/trailing characters weigh in.
+    """
+    padded = f"^{text}$".encode('ascii')
+    n = RECONCILE_NGRAM
+    return {int.from_bytes(padded[i:i + n], 'big') for i in range(len(padded) - n + 1)}
+
+
+def _build_ngram_index(keys):
+    """Build a CSR n-gram posting index over normalized keys.
+    
+    Normalized keys are plain ASCII, so they are laid out as a byte matrix and
+    every gram is computed as an integer one column position at a time; grams
+    are then grouped with a single sort.
+    """
+    n = RECONCILE_NGRAM
+    padded = np.array(('^' + keys + '$').tolist(), dtype='S')
+    lengths = np.char.str_len(padded)
+    width = padded.dtype.itemsize
+    matrix = padded.view(np.uint8).reshape(len(padded), width) if len(padded) else np.empty((0, width), np.uint8)
+    
+    gram_parts = []
+    row_parts = []
+    for start in range(width - n + 1):
+        has_gram = lengths >= start + n
+        window = matrix[has_gram, start:start + n].astype(np.int64)
+        gram_parts.append((window << (8 * np.arange(n - 1, -1, -1))).sum(axis=1))
+        row_parts.append(np.flatnonzero(has_gram))
+    
+    grams = np.concatenate(gram_parts) if gram_parts else np.empty(0, dtype=np.int64)
+    rows = np.concatenate(row_parts) if row_parts else np.empty(0, dtype=np.int64)
+    
+    # Repeated grams within one key count once, matching the set semantics of _grams
+    order = np.lexsort((rows, grams))
+    grams, rows = grams[order], rows[order]
+    first = np.ones(len(grams), dtype=bool)
+    first[1:] = (grams[1:] != grams[:-1]) | (rows[1:] != rows[:-1])
+    grams, rows = grams[first], rows[first]
+    
+    unique_grams, starts = np.unique(grams, return_index=True)
+    
+    return {
+        'lookup': dict(zip(unique_grams.tolist(), range(len(unique_grams)))),
+        'offsets': np.append(starts, len(grams)),
+        'rows': rows,
+        'sizes': np.bincount(rows, minlength=len(keys)),
+        'max_postings': max(RECONCILE_MAX_POSTINGS, 1),
+    }
+
+
+def _ngram_matches(grams_index, query_grams, texts):
+    """Dice similarity between the query grams and the best-overlapping indexed keys.
+    
+    Grams posted on more than max_postings rows (the shared 'GK-0' style prefixes)
+    are skipped when gathering candidates, so a lookup touches a few short posting
+    lists instead of the whole master. The shortlisted keys are then scored on
+    their full gram sets.
+    """
+    lookup = grams_index['lookup']
+    offsets = grams_index['offsets']
+    
+    postings = []
+    for gram in query_grams:
+        gram_id = lookup.get(gram)
+        if gram_id is None:
+            continue
+        start, end = offsets[gram_id], offsets[gram_id + 1]
+        if end - start <= grams_index['max_postings']:
+            postings.append(grams_index['rows'][start:end])
+    if not postings:
+        return []
+    
+    rows, shared = np.unique(np.concatenate(postings), return_counts=True)
+    if len(rows) > RESCORE_CANDIDATES:
+        keep = np.argpartition(-shared, RESCORE_CANDIDATES - 1)[:RESCORE_CANDIDATES]
+        rows, shared = rows[keep], shared[keep]
+    
+    sizes = grams_index['sizes'][rows]
+    shared = np.array([len(query_grams & _grams(texts[row])) for row in rows.tolist()])
+    scores = 2.0 * shared / (len(query_grams) + sizes)
+    return list(zip(rows.tolist(), scores.tolist()))
@@ -0,0 +1,99 @@
+import logging
+import numpy as np
+from config import SIMULATION_DRAWS, SIMULATION_MEMORY_MB, SIMULATION_DEFAULT_CV, SIMULATION_SEED, RULE_THRESHOLDS
+from processing.forecast import get_annual_consumption
+
+logger = logging.getLogger(__name__)
+
+# Net Difference thresholds of the deterministic status rules
+MODERATE_MIN = RULE_THRESHOLDS['MODERATE_MIN']
+HIGH_ABOVE = RULE_THRESHOLDS['HIGH_ABOVE']
+
+PROBABILITY_COLUMNS = [f'P(Net Difference >= {MODERATE_MIN})', f'P(Net Difference > {HIGH_ABOVE})']
+
+
+def get_request_spread(df_master):
+    """Coefficient of variation of each item's yearly consumption.
+    
+    Items without consumption history get SIMULATION_DEFAULT_CV.
+    
+    Args:
+        df_master (DataFrame): Master data with accumulated consumption
+    
+    Returns:
+        ndarray: Coefficient of variation aligned with df_master
+    """
+    yearly = get_annual_consumption(df_master)
+    mean = yearly.mean(axis=1)
+    std = yearly.std(axis=1, ddof=1)
+    cv = np.full(len(df_master), float(SIMULATION_DEFAULT_CV))
+    has_history = mean > 0
+    cv[has_history] = std[has_history] / mean[has_history]
+    return cv
+
+
+def simulate_shortfall_probabilities(comparison, df_master, draws=None, memory_mb=None, seed=None):
+    """Probability of each item's Net Difference reaching the moderate and high thresholds.
+    
+    Each item's total plant request is drawn from a gamma distribution with
+    the requested quantity as mean and the item's historical coefficient of
+    variation as spread. Net Difference is the rounded draw less the adjusted
+    forecast, stock and pending orders, so the thresholds become bounds on the
+    draw itself and no per-draw net array is built.
+    
+    Items are simulated in chunks sized so one chunk of float32 draws stays
+    within memory_mb. Items without requests or without spread have a
+    certain outcome and are not drawn at all.
+    
+    Args:
+        comparison (DataFrame): Classified comparison, rows aligned with df_master
+        df_master (DataFrame): Master data with accumulated consumption
+        draws (int, optional): Scenarios per item, defaults to config SIMULATION_DRAWS
+        memory_mb (int, optional): Memory budget for one chunk, defaults to config SIMULATION_MEMORY_MB
+        seed (int, optional): Random seed, defaults to config SIMULATION_SEED
+    
+    Returns:
+        DataFrame: Comparison with the PROBABILITY_COLUMNS added
+    """
+    draws = draws or SIMULATION_DRAWS
+    memory_mb = memory_mb or SIMULATION_MEMORY_MB
+    seed = SIMULATION_SEED if seed is None else seed
+    if len(comparison) != len(df_master):
+        raise ValueError("Comparison rows must align with the master for simulation")
+    
+    mean = comparison['Total Plant Requests'].to_numpy(dtype=float)
+    spread = mean * get_request_spread(df_master)
+    covered = (
+        comparison['Adjusted Annual Forecast'].to_numpy(dtype=float)
+        + comparison['Available Stock'].to_numpy(dtype=float)
+        + comparison['Pending Orders'].to_numpy(dtype=float)
+    )
+    
+    # rint(draw) - covered >= k  <=>  draw >= covered + k - 0.5
+    bounds = np.column_stack([covered + MODERATE_MIN - 0.5, covered + HIGH_ABOVE + 0.5])
+    
+    # Certain outcomes: the request itself decides
+    probabilities = (mean[:, None] >= bounds).astype(float)
+    
+    uncertain = np.flatnonzero((mean > 0) & (spread > 0))
+    chunk_size = max(int(memory_mb * 1024 ** 2 // (draws * 4 * 2)), 1)  # Draws plus one comparison mask
+    logger.info(f"Simulating {len(uncertain)} items x {draws} draws in chunks of {chunk_size} items...")
+    
+    rng = np.random.default_rng(seed)
+    for start in range(0, len(uncertain), chunk_size):
+        rows = uncertain[start:start + chunk_size]
+        
+        # Gamma with mean m and standard deviation s: shape (m/s)^2, scale s^2/m
+        shape = (mean[rows] / spread[rows]) ** 2
+        scale = spread[rows] ** 2 / mean[rows]
+        samples = rng.standard_gamma(shape[:, None].astype(np.float32), size=(len(rows), draws), dtype=np.float32)
+        samples *= scale[:, None].astype(np.float32)
+        
+        for position in range(bounds.shape[1]):
+            hits = np.count_nonzero(samples >= bounds[rows, position][:, None], axis=1)
+            probabilities[rows, position] = hits / draws
+    
+    for position, col in enumerate(PROBABILITY_COLUMNS):
+        comparison[col] = np.round(probabilities[:, position], 4)
+    
+    return comparison
@@ -1,164 +1,229 @@
-def get_enhanced_status(row):
-    """Determine enhanced status based on difference, stock, and pending orders.
+import ast
+from functools import lru_cache
+import numpy as np
+from config import STATUS, RECOMMENDATION_RULES, RULE_THRESHOLDS, STATUS_DISPLAY_ORDER, SUMMARY_RECOMMENDATIONS
+
+# Columns a status or recommendation rule can refer to
+RULE_VARIABLES = ('difference', 'net_difference', 'available_stock', 'pending_orders', 'below_reorder_point')
+
+# Syntax allowed in rule conditions: comparisons, arithmetic and boolean logic over names and numbers
+ALLOWED_NODES = (
+    ast.Expression, ast.BoolOp, ast.And, ast.Or, ast.UnaryOp, ast.Not, ast.USub, ast.UAdd,
+    ast.Compare, ast.Eq, ast.NotEq, ast.Lt, ast.LtE, ast.Gt, ast.GtE,
+    ast.BinOp, ast.Add, ast.Sub, ast.Mult, ast.Div, ast.Name, ast.Load, ast.Constant
+)
+
+# Chain rules are checked in order; override rules ('replaces') run afterwards
+STATUS_CHAIN = tuple((name, rule.get('when')) for name, rule in STATUS.items() if 'replaces' not in rule)
+STATUS_OVERRIDES = tuple((name, rule) for name, rule in STATUS.items() if 'replaces' in rule)
+RECOMMENDATION_CHAIN = tuple((text, when) for text, when, _ in RECOMMENDATION_RULES)
+THRESHOLDS = tuple(sorted(RULE_THRESHOLDS.items()))
+
+# Classification returns int8 codes into these arrays so results can live in
+# shared memory: the chain rules in config order, then the overrides.
+STATUS_NAMES = np.array([name for name, _ in STATUS_CHAIN] + [name for name, _ in STATUS_OVERRIDES])
+
+RECOMMENDATION_NAMES = np.array(
+    [text for text, _ in RECOMMENDATION_CHAIN] + [rule['recommendation'] for _, rule in STATUS_OVERRIDES]
+)
+
+# Display order for the summary sheets and dashboard, independent of the evaluation order above
+if sorted(STATUS_DISPLAY_ORDER) != sorted(name for name, _ in STATUS_CHAIN):
+    raise ValueError("STATUS_DISPLAY_ORDER must list every status without 'replaces' exactly once")
+OVERRIDE_STATUS_NAMES = [name for name, _ in STATUS_OVERRIDES]
+RECOMMENDATION_SUMMARY_LABELS = {text: label for text, _, label in RECOMMENDATION_RULES}
+if set(SUMMARY_RECOMMENDATIONS) - set(RECOMMENDATION_SUMMARY_LABELS):
+    raise ValueError("SUMMARY_RECOMMENDATIONS must only list recommendations from RECOMMENDATION_RULES")
+
+
+def display_statuses(reorder_policy=False):
+    """Statuses in display order, with the override statuses only while the reorder policy applies."""
+    return list(STATUS_DISPLAY_ORDER) + (OVERRIDE_STATUS_NAMES if reorder_policy else [])
+
+
+def status_summary_label(name):
+    """Summary statistics label of a status, with RULE_THRESHOLDS filled in."""
+    return STATUS[name].get('summary', f'Items with Status {name}').format(**RULE_THRESHOLDS)
+
+
+def plant_status_column(name):
+    """Plant summary column counting a status."""
+    return STATUS[name].get('plant_column', f'{name} Items')
+
+
+class _Vectorize(ast.NodeTransformer):
+    """Rewrite a rule condition into elementwise NumPy operations.
     
-    Args:
-        row: DataFrame row with difference, stock, and order information
-        
-    Returns:
-        str: Status category
+    and/or/not become &, | and ~, chained comparisons (1 <= x <= 3) become a
+    conjunction of single comparisons and threshold names become constants.
     """
-    difference = row['Difference']
-    available_stock = row['Available Stock']
-    pending_orders = row['Pending Orders']
-    net_difference = row['Net Difference']
-    
-    # Check if deviation is covered by available stock
-    if difference > 0 and difference <= available_stock:
-        return "COVERED_BY_STOCK"
     
-    # Check if deviation is covered by pending orders
-    elif difference > 0 and difference <= (available_stock + pending_orders):
-        return "COVERED_BY_ORDERS"
-    
-    # Otherwise use the standard classification
-    elif net_difference == 0:
-        return "ACCEPTABLE"
-    elif 1 <= net_difference <= 3:
-        return "MODERATE_DEVIATION"
-    elif net_difference > 3:
-        return "HIGH_DEVIATION"
-    else:  # net_difference < 0
-        return "LOW_REQUEST"
+    def __init__(self, thresholds):
+        self.thresholds = thresholds
+    
+    def visit_BoolOp(self, node):
+        self.generic_visit(node)
+        op = ast.BitAnd() if isinstance(node.op, ast.And) else ast.BitOr()
+        result = node.values[0]
+        for value in node.values[1:]:
+            result = ast.BinOp(left=result, op=op, right=value)
+        return result
+    
+    def visit_UnaryOp(self, node):
+        self.generic_visit(node)
+        if isinstance(node.op, ast.Not):
+            return ast.UnaryOp(op=ast.Invert(), operand=node.operand)
+        return node
+    
+    def visit_Compare(self, node):
+        self.generic_visit(node)
+        operands = [node.left] + node.comparators
+        result = None
+        for left, op, right in zip(operands, node.ops, operands[1:]):
+            comparison = ast.Compare(left=left, ops=[op], comparators=[right])
+            result = comparison if result is None else ast.BinOp(left=result, op=ast.BitAnd(), right=comparison)
+        return result
+    
+    def visit_Name(self, node):
+        if node.id in self.thresholds:
+            return ast.Constant(self.thresholds[node.id])
+        return node
 
 
-def get_enhanced_recommendation(row):
-    """Generate enhanced recommendation based on difference, stock, and pending orders.
+@lru_cache(maxsize=None)
+def compile_condition(expression, thresholds=THRESHOLDS):
+    """Compile a rule condition into a code object evaluated on whole columns.
     
     Args:
-        row: DataFrame row with difference, stock, and order information
-        
+        expression (str): Condition such as 'MODERATE_MIN <= net_difference <= HIGH_ABOVE'
+        thresholds (tuple): (name, value) pairs substituted into the condition
+    
     Returns:
-        str: Recommendation text
+        tuple: (code object, frozenset of RULE_VARIABLES the condition uses)
     """
-    difference = row['Difference']
-    net_difference = row['Net_Difference'] if 'Net_Difference' in row else row['Net Difference']
-    available_stock = row['Available Stock']
-    pending_orders = row['Pending Orders']
-    
-    # If requests match forecast exactly
-    if difference == 0:
-        return "Current forecast appears adequate"
-    
-    # If requests are lower than forecast
-    elif difference < 0:
-        return "Consider reducing forecast"
-    
-    # If deviation is covered by stock
-    elif difference <= available_stock:
-        return "Use available stock to fulfill requests"
-    
-    # If deviation is covered by pending orders
-    elif difference <= (available_stock + pending_orders):
-        return "Use stock and pending orders to fulfill requests"
-    
-    # If net difference after stock and orders is moderate
-    elif 1 <= net_difference <= 3:
-        return "Moderate increase needed after using stock & orders"
-    
-    # If net difference after stock and orders is high
-    elif net_difference > 3:
-        return "Significant increase needed after using stock & orders"
-    
-    # Fallback (shouldn't reach here)
-    else:
-        return "Review needs considering stock and pending orders"
+    named_thresholds = dict(thresholds)
+    try:
+        tree = ast.parse(expression, mode='eval')
+    except SyntaxError as e:
+        raise ValueError(f"Invalid status rule '{expression}': {e.msg}") from e
+    
+    variables = set()
+    for node in ast.walk(tree):
+        if not isinstance(node, ALLOWED_NODES):
+            raise ValueError(f"Unsupported syntax in status rule '{expression}': {type(node).__name__}")
+        if isinstance(node, ast.Constant) and not isinstance(node.value, (int, float)):
+            raise ValueError(f"Only numbers are allowed as constants in status rule '{expression}'")
+        if isinstance(node, ast.Name):
+            if node.id in RULE_VARIABLES:
+                variables.add(node.id)
+            elif node.id not in named_thresholds:
+                raise ValueError(
+                    f"Unknown name '{node.id}' in status rule '{expression}'. "
+                    f"Use {', '.join(RULE_VARIABLES)} or a RULE_THRESHOLDS name"
+                )
+    
+    tree = ast.fix_missing_locations(_Vectorize(named_thresholds).visit(tree))
+    return compile(tree, f"<rule: {expression}>", 'eval'), frozenset(variables)
 
 
-def get_enhanced_status_for_plant(row, plant):
-    """Get status for a specific plant's request.
+def evaluate_condition(expression, columns, thresholds=THRESHOLDS):
+    """Evaluate a rule condition on whole columns.
     
     Args:
-        row: DataFrame row
-        plant (str): Plant name
-        
+        expression (str): Rule condition
+        columns (dict): Arrays keyed by RULE_VARIABLES names
+        thresholds (tuple): (name, value) pairs substituted into the condition
+    
     Returns:
-        str: Status string
+        ndarray: Boolean mask
     """
-    plant_requests = row[f'{plant} Requests']
-    adjusted_forecast = row['Adjusted Annual Forecast']
-    available_stock = row['Available Stock']
-    pending_orders = row['Pending Orders']
-    
-    # Calculate plant-specific difference
-    difference = plant_requests - adjusted_forecast
-    
-    # Calculate plant-specific net difference
-    net_difference = difference - available_stock - pending_orders
-    
-    # Check if deviation is covered by available stock
-    if difference > 0 and difference <= available_stock:
-        return "COVERED_BY_STOCK"
-    
-    # Check if deviation is covered by pending orders
-    elif difference > 0 and difference <= (available_stock + pending_orders):
-        return "COVERED_BY_ORDERS"
-    
-    # Otherwise use the standard classification
-    elif net_difference == 0:
-        return "ACCEPTABLE"
-    elif 1 <= net_difference <= 3:
-        return "MODERATE_DEVIATION"
-    elif net_difference > 3:
-        return "HIGH_DEVIATION"
-    else:  # net_difference < 0
-        return "LOW_REQUEST"
+    code, variables = compile_condition(expression, thresholds)
+    missing = variables - set(columns)
+    if missing:
+        raise ValueError(f"Status rule '{expression}' needs {', '.join(sorted(missing))}")
+    
+    size = len(next(iter(columns.values())))
+    result = eval(code, {'__builtins__': {}}, {name: columns[name] for name in variables})
+    return np.broadcast_to(np.asarray(result, dtype=bool), (size,))
 
 
-def get_enhanced_recommendation_for_plant(row, plant):
-    """Generate enhanced recommendation for a specific plant.
+@lru_cache(maxsize=None)
+def compile_rules(rules, thresholds=THRESHOLDS):
+    """Compile an ordered rule chain into a vectorized evaluator.
+    
+    The first rule whose condition holds assigns its code (its position in
+    the chain); the last rule has no condition and catches everything else.
+    Conditions are compiled once and the evaluator is cached per chain.
     
     Args:
-        row: DataFrame row
-        plant (str): Plant name
-        
+        rules (tuple): (label, condition) pairs, the final condition None
+        thresholds (tuple): (name, value) pairs substituted into the conditions
+    
     Returns:
-        str: Recommendation string
+        function: Evaluator taking a dict of columns and returning int8 codes
     """
-    plant_requests = row[f'{plant} Requests']
-    adjusted_forecast = row['Adjusted Annual Forecast']
-    available_stock = row['Available Stock']
-    pending_orders = row['Pending Orders']
+    conditions = [when for _, when in rules]
+    if not conditions or conditions[-1] is not None or None in conditions[:-1]:
+        raise ValueError("A rule chain needs exactly one fallback rule without a condition, placed last")
     
-    # Calculate plant-specific difference
-    difference = plant_requests - adjusted_forecast
+    for when in conditions[:-1]:
+        compile_condition(when, thresholds)
+    fallback = len(conditions) - 1
     
-    # Calculate plant-specific net difference
-    net_difference = difference - available_stock - pending_orders
+    def evaluate(columns):
+        if not fallback:
+            return np.full(len(next(iter(columns.values()))), fallback, dtype=np.int8)
+        masks = [evaluate_condition(when, columns, thresholds) for when in conditions[:-1]]
+        return np.select(masks, list(range(fallback)), default=fallback).astype(np.int8)
     
-    # If requests match forecast exactly
-    if difference == 0:
-        return "Current forecast appears adequate"
+    return evaluate
+
+
+def classify_codes(columns):
+    """Classify whole columns at once with the configured status and recommendation rules.
     
-    # If requests are lower than forecast
-    elif difference < 0:
-        return "Consider reducing forecast"
+    Override rules (BELOW_REORDER_POINT) are applied when the columns carry
+    every variable they use; they move items whose status is listed in their
+    'replaces' and set their own recommendation.
     
-    # If deviation is covered by stock
-    elif difference <= available_stock:
-        return "Use available stock to fulfill requests"
+    Args:
+        columns (dict): Arrays keyed by RULE_VARIABLES names - difference, net_difference,
+            available_stock, pending_orders and optionally below_reorder_point
     
-    # If deviation is covered by pending orders
-    elif difference <= (available_stock + pending_orders):
-        return "Use stock and pending orders to fulfill requests"
+    Returns:
+        tuple: (status, recommendation) int8 codes into STATUS_NAMES and RECOMMENDATION_NAMES
+    """
+    status = compile_rules(STATUS_CHAIN)(columns)
+    recommendation = compile_rules(RECOMMENDATION_CHAIN)(columns)
+    
+    for offset, (name, rule) in enumerate(STATUS_OVERRIDES):
+        _, variables = compile_condition(rule['when'])
+        if not variables <= set(columns):
+            continue
+        replaceable = np.flatnonzero(np.isin(STATUS_NAMES, rule['replaces']))
+        moved = evaluate_condition(rule['when'], columns) & np.isin(status, replaceable)
+        status = np.where(moved, len(STATUS_CHAIN) + offset, status).astype(np.int8)
+        recommendation = np.where(moved, len(RECOMMENDATION_CHAIN) + offset, recommendation).astype(np.int8)
+    
+    return status, recommendation
+
+
+def classify_deviation(values):
+    """Status names for bare deviation values, used to colour difference cells.
     
-    # If net difference after stock and orders is moderate
-    elif 1 <= net_difference <= 3:
-        return "Moderate increase needed after using stock & orders"
+    Only the chain rules that depend on net_difference alone apply (plus the
+    fallback), so a cell is coloured the way an item with that Net Difference
+    and no stock or orders to consider would be.
     
-    # If net difference after stock and orders is high
-    elif net_difference > 3:
-        return "Significant increase needed after using stock & orders"
+    Args:
+        values (ndarray): Difference or Net Difference values
     
-    # Fallback
-    else:
-        return "Review needs considering stock and pending orders"
\ No newline at end of file
+    Returns:
+        ndarray: Status names
+    """
+    rules = tuple(
+        (name, when) for name, when in STATUS_CHAIN
+        if when is None or compile_condition(when)[1] <= {'net_difference'}
+    )
+    codes = compile_rules(rules)({'net_difference': np.asarray(values, dtype=float)})
+    return np.array([name for name, _ in rules])[codes]
@@ -0,0 +1,147 @@
+import pandas as pd
+from config import SIMULATION_ALERT_PROBABILITY, SUMMARY_RECOMMENDATIONS
+from processing.simulation import PROBABILITY_COLUMNS
+from processing.status import (
+    OVERRIDE_STATUS_NAMES, RECOMMENDATION_SUMMARY_LABELS,
+    display_statuses, status_summary_label, plant_status_column
+)
+
+
+def calculate_summary_statistics(comparison):
+    """Generate enhanced summary statistics from comparison data.
+    
+    Status rows follow config STATUS_DISPLAY_ORDER and recommendation rows
+    SUMMARY_RECOMMENDATIONS, with labels from the rules in config. The
+    reorder point rows are added only when the inventory policy flagged items.
+    
+    Args:
+        comparison (DataFrame): Processed comparison data
+        
+    Returns:
+        DataFrame: Summary statistics
+    """
+    status_counts = comparison['Status'].value_counts()
+    recommendation_counts = comparison['Recommendation'].value_counts()
+    
+    statuses = display_statuses()
+    metrics = ['Total Items Analyzed'] + [status_summary_label(name) for name in statuses] + [
+        RECOMMENDATION_SUMMARY_LABELS[text] for text in SUMMARY_RECOMMENDATIONS
+    ] + [
+        'Items with Forecast < 1 (Adjusted to 0)',
+        'Items with Stock Available',
+        'Items with Pending Orders'
+    ]
+    counts = [len(comparison)] + [
+        int(status_counts.get(name, 0)) for name in statuses
+    ] + [
+        int(recommendation_counts.get(text, 0)) for text in SUMMARY_RECOMMENDATIONS
+    ] + [
+        len(comparison[comparison['Annual Forecast'] < 1]),
+        len(comparison[comparison['Available Stock'] > 0]),
+        len(comparison[comparison['Pending Orders'] > 0])
+    ]
+    summary_stats = pd.DataFrame({'Metric': metrics, 'Count': counts})
+    
+    if 'Forecast Diverges' in comparison.columns:
+        summary_stats.loc[len(summary_stats)] = [
+            'Items with Master Forecast Diverging from Recomputed',
+            int(comparison['Forecast Diverges'].sum())
+        ]
+    
+    if 'Below Reorder Point' in comparison.columns:
+        summary_stats.loc[len(summary_stats)] = [
+            'Items with Stock & Orders Below Reorder Point',
+            int(comparison['Below Reorder Point'].sum())
+        ]
+        for name in OVERRIDE_STATUS_NAMES:
+            summary_stats.loc[len(summary_stats)] = [status_summary_label(name), int(status_counts.get(name, 0))]
+    
+    return summary_stats
+
+
+def calculate_value_summary(comparison):
+    """Summary rows for shortfall value, when the comparison carries value columns.
+    
+    Args:
+        comparison (DataFrame): Comparison with Shortfall Value, Value Class and Classification Check
+    
+    Returns:
+        DataFrame: Metric/Count rows (empty without value columns)
+    """
+    if 'Shortfall Value' not in comparison.columns:
+        return pd.DataFrame(columns=['Metric', 'Count'])
+    
+    return pd.DataFrame({
+        'Metric': [
+            'Total Shortfall Value',
+            'Items in Value Class A',
+            'Items in Value Class B',
+            'Items in Value Class C',
+            'Shortfall Items More Urgent by Value than Classification Calculated',
+            'Shortfall Items Less Urgent by Value than Classification Calculated'
+        ],
+        'Count': pd.Series([
+            round(float(comparison['Shortfall Value'].sum()), 2),
+            int((comparison['Value Class'] == 'A').sum()),
+            int((comparison['Value Class'] == 'B').sum()),
+            int((comparison['Value Class'] == 'C').sum()),
+            int((comparison['Classification Check'] == 'HIGHER').sum()),
+            int((comparison['Classification Check'] == 'LOWER').sum())
+        ], dtype=object)  # Keeps the item counts integers next to the value total
+    })
+
+
+def calculate_simulation_summary(comparison):
+    """Summary rows comparing simulated shortfall risk with the deterministic status.
+    
+    Args:
+        comparison (DataFrame): Comparison with the simulated probability columns
+        
+    Returns:
+        DataFrame: Metric/Count rows to append to the summary statistics
+    """
+    likely_high = comparison[PROBABILITY_COLUMNS[1]] >= SIMULATION_ALERT_PROBABILITY
+    high = comparison['Status'] == 'HIGH_DEVIATION'
+    
+    return pd.DataFrame({
+        'Metric': [
+            f'Items at least {SIMULATION_ALERT_PROBABILITY:.0%} Likely to Exceed High Deviation (simulated)',
+            'Likely High Deviation Items Not Flagged HIGH_DEVIATION',
+            'HIGH_DEVIATION Items Less Likely than Not to Exceed the Threshold'
+        ],
+        'Count': [
+            int(likely_high.sum()),
+            int((likely_high & ~high).sum()),
+            int((~likely_high & high).sum())
+        ]
+    })
+
+
+def calculate_plant_summary(comparison, unique_plants):
+    """Generate plant summary statistics.
+    
+    Args:
+        comparison (DataFrame): Processed comparison data
+        unique_plants (list): List of unique plant names
+        
+    Returns:
+        DataFrame: Items requested per plant and one count column per displayed status
+    """
+    
+    statuses = display_statuses('Below Reorder Point' in comparison.columns)
+    status_columns = [plant_status_column(name) for name in statuses]
+    plant_data = []
+    
+    for plant in unique_plants:
+        # Get items requested by this plant (where requests > 0)
+        plant_items = comparison[comparison[f'{plant} Requests'] > 0]
+        
+        # Count by status
+        status_counts = plant_items['Status'].value_counts()
+        row = {'Plant': plant, 'Items Requested': len(plant_items)}
+        for name, column in zip(statuses, status_columns):
+            row[column] = int(status_counts.get(name, 0))
+        
+        plant_data.append(row)
+    
+    return pd.DataFrame(plant_data, columns=['Plant', 'Items Requested'] + status_columns)
@@ -0,0 +1,202 @@
+import json
+import logging
+import numpy as np
+import pandas as pd
+from config import RESPONSE_COLUMNS, CURRENT_DATETIME
+from processing.consolidation import get_submission_column
+
+logger = logging.getLogger(__name__)
+
+MASTER_REQUIRED_COLUMNS = ['Item Code', 'Annual Forecast']
+MASTER_NUMERIC_COLUMNS = [
+    'Annual Forecast', 'Stock Qty', 'Open PRs Total 24 Months',
+    'Open POs Total 24 Months', 'Pr Not Confirmed 24 Months'
+]
+MAX_EXAMPLES = 5
+
+
+def check_required_columns(df_master, df_responses):
+    """Stop the run when the master or responses lack the columns the analysis needs.
+    
+    Args:
+        df_master (DataFrame): Master data
+        df_responses (DataFrame): Plant response data
+        
+    Raises:
+        ValueError: If required columns are missing and the analysis cannot run
+    """
+    missing_master = [col for col in MASTER_REQUIRED_COLUMNS if col not in df_master.columns]
+    missing_responses = [col for col in RESPONSE_COLUMNS if col not in df_responses.columns]
+    if missing_master or missing_responses:
+        problems = []
+        if missing_master:
+            problems.append(f"Master is missing columns: {', '.join(missing_master)}")
+        if missing_responses:
+            problems.append(f"Responses are missing columns: {', '.join(missing_responses)}")
+        raise ValueError('; '.join(problems))
+
+
+def validate_inputs(df_master, df_responses):
+    """Check the master and responses for problems that would distort or drop data.
+    
+    Every check is a whole-column operation, so the cost stays a small
+    fraction of processing even on millions of response lines. Run it after
+    reconciliation so remapped item codes are not reported as dropped.
+    
+    Args:
+        df_master (DataFrame): Master data
+        df_responses (DataFrame): Plant response data
+        
+    Returns:
+        DataFrame: One row per check with Scope, Check, Severity, Count and Examples
+        
+    Raises:
+        ValueError: If required columns are missing and the analysis cannot run
+    """
+    logger.info("Validating input data...")
+    check_required_columns(df_master, df_responses)
+    
+    checks = []
+    
+    def add_check(scope, check, severity, mask, values=None):
+        """Record a check from a boolean mask over the rows it applies to."""
+        count = int(mask.sum())
+        examples = ''
+        if count:
+            offending = (values if values is not None else mask.index.to_series())[mask]
+            examples = ', '.join(str(value) for value in pd.unique(offending.to_numpy())[:MAX_EXAMPLES])
+        checks.append({'Scope': scope, 'Check': check, 'Severity': severity, 'Count': count, 'Examples': examples})
+    
+    # ----- MASTER -----
+    master_codes = df_master['Item Code']
+    add_check('Master', 'Blank item codes', 'ERROR', _is_blank(master_codes))
+    add_check('Master', 'Duplicate item codes', 'WARNING',
+              master_codes.duplicated(keep=False) & master_codes.notna(), master_codes)
+    
+    for col in MASTER_NUMERIC_COLUMNS:
+        if col not in df_master.columns:
+            continue
+        values = pd.to_numeric(df_master[col], errors='coerce')
+        add_check('Master', f'Non-numeric {col}', 'ERROR', values.isna() & df_master[col].notna(), master_codes)
+        add_check('Master', f'Negative {col}', 'WARNING', values < 0, master_codes)
+    
+    # ----- RESPONSES -----
+    response_codes = df_responses['Item Code']
+    plants = df_responses['Plant']
+    qty = pd.to_numeric(df_responses['Qty Needed'], errors='coerce')
+    
+    add_check('Responses', 'Blank item codes', 'ERROR', _is_blank(response_codes))
+    add_check('Responses', 'Blank plant names (dropped from analysis)', 'ERROR', _is_blank(plants), response_codes)
+    add_check('Responses', 'Non-numeric Qty Needed (dropped from analysis)', 'ERROR',
+              _is_non_numeric(df_responses['Qty Needed']), df_responses['Qty Needed'])
+    add_check('Responses', 'Missing Qty Needed', 'WARNING', df_responses['Qty Needed'].isna(), response_codes)
+    add_check('Responses', 'Negative Qty Needed', 'ERROR', qty < 0, response_codes)
+    add_check('Responses', 'Zero Qty Needed', 'INFO', qty == 0, response_codes)
+    
+    # Item codes that the left merge onto the master would silently drop
+    add_check('Responses', 'Item codes not in Master (dropped from analysis)', 'ERROR',
+              ~response_codes.isin(master_codes) & ~_is_blank(response_codes), response_codes)
+    if pd.api.types.is_numeric_dtype(master_codes) != pd.api.types.is_numeric_dtype(response_codes):
+        checks.append({
+            'Scope': 'Responses', 'Check': 'Item Code stored as numbers in one file and text in the other',
+            'Severity': 'ERROR', 'Count': len(df_responses),
+            'Examples': f"Master: {master_codes.dtype}, Responses: {response_codes.dtype}"
+        })
+    
+    # Plant spellings that only differ by case or spacing are counted as separate plants.
+    # String work is done once per distinct plant name and mapped back through the codes.
+    plant_codes, plant_names = pd.factorize(plants)
+    plant_names = pd.Series(plant_names, dtype=str)
+    normalized = plant_names.str.strip().str.replace(r'\s+', ' ', regex=True).str.casefold()
+    ambiguous = (normalized.map(normalized.value_counts()) > 1).to_numpy()
+    padded = ((plant_names != plant_names.str.strip()) & (plant_names.str.strip() != '')).to_numpy()
+    plant_text = plants.astype(str)
+    add_check('Responses', 'Plant names differing only by case or spacing', 'WARNING',
+              pd.Series(_lookup(ambiguous, plant_codes, False), index=plants.index), plant_text)
+    add_check('Responses', 'Plant names with leading/trailing spaces', 'WARNING',
+              pd.Series(_lookup(padded, plant_codes, False), index=plants.index), plant_text)
+    
+    duplicate_keys = ['Plant', 'Item Code', 'Qty Needed']
+    submission_col = get_submission_column(df_responses)
+    if submission_col:
+        duplicate_keys.append(submission_col)
+    add_check('Responses', 'Duplicate response lines', 'WARNING',
+              df_responses.duplicated(subset=duplicate_keys, keep='first'), response_codes)
+    
+    report = pd.DataFrame(checks, columns=['Scope', 'Check', 'Severity', 'Count', 'Examples'])
+    
+    failed = report[report['Count'] > 0]
+    for _, row in failed.iterrows():
+        log = logger.warning if row['Severity'] != 'INFO' else logger.info
+        log(f"Data quality - {row['Scope']}: {row['Check']}: {row['Count']} (e.g. {row['Examples']})")
+    if failed.empty:
+        logger.info("Data quality - all checks passed")
+    
+    return report
+
+
+def drop_unusable_responses(df_responses):
+    """Drop response lines the analysis cannot use and make Qty Needed numeric.
+    
+    Lines with a blank plant or a non-numeric Qty Needed are reported as
+    ERROR by validate_inputs; they are removed here so processing runs on
+    the remaining lines instead of failing.
+    
+    Args:
+        df_responses (DataFrame): Plant response data
+        
+    Returns:
+        DataFrame: Usable response lines with a numeric Qty Needed
+        
+    Raises:
+        ValueError: If no usable response line is left
+    """
+    unusable = _is_blank(df_responses['Plant']) | _is_non_numeric(df_responses['Qty Needed'])
+    if unusable.any() and unusable.all():
+        raise ValueError("No usable response lines - every line has a blank plant or a non-numeric Qty Needed")
+    if unusable.any():
+        logger.warning(f"Dropping {int(unusable.sum())} response lines with a blank plant or non-numeric Qty Needed")
+    
+    df_responses = df_responses[~unusable.to_numpy()].copy()
+    df_responses['Qty Needed'] = pd.to_numeric(df_responses['Qty Needed'], errors='coerce')
+    return df_responses
+
+
+def save_quality_report(report, path, df_master, df_responses):
+    """Write the data quality report as JSON.
+    
+    Args:
+        report (DataFrame): Output of validate_inputs
+        path (str): JSON file path
+        df_master (DataFrame): Master data the report describes
+        df_responses (DataFrame): Response data the report describes
+    """
+    with open(path, 'w') as f:
+        json.dump({
+            'generated': CURRENT_DATETIME,
+            'master_rows': len(df_master),
+            'response_rows': len(df_responses),
+            'checks': json.loads(report.to_json(orient='records'))
+        }, f, indent=2)
+    
+    logger.info(f"Data quality report saved to: {path}")
+
+
+def _is_blank(values):
+    """Missing or whitespace-only values, stripped once per distinct value."""
+    codes, uniques = pd.factorize(values)
+    blank = (pd.Series(uniques, dtype=str).str.strip() == '').to_numpy(dtype=bool)
+    return pd.Series(_lookup(blank, codes, True), index=values.index)
+
+
+def _is_non_numeric(values):
+    """Present values that do not parse as numbers."""
+    return pd.to_numeric(values, errors='coerce').isna() & values.notna()
+
+
+def _lookup(per_value, codes, missing):
+    """Map a per-distinct-value flag back onto rows; missing rows (code -1) get the missing flag.
+    
+    Safe for all-missing and empty columns, where factorize returns no distinct values.
+    """
+    return np.append(np.asarray(per_value, dtype=bool), missing)[codes]
@@ -0,0 +1,160 @@
+import logging
+import numpy as np
+import pandas as pd
+from config import CRITICALITY_WEIGHTS, PARETO_CLASS_LIMITS
+
+logger = logging.getLogger(__name__)
+
+VALUE_SOURCE_COLUMNS = ['Unit Price', 'Criticality']
+
+
+def get_item_values(df_master, item_values=None):
+    """Collect unit price and criticality per item code.
+    
+    Unit Price and Criticality columns on the master are used when present;
+    a separate item values file (Item Code, Unit Price, Criticality) takes
+    precedence where it has a value.
+    
+    Args:
+        df_master (DataFrame): Master data
+        item_values (DataFrame, optional): Item values with Item Code and Unit Price and/or Criticality
+    
+    Returns:
+        DataFrame: Item Code indexed frame with Unit Price and Criticality, or
+            None when no source has either column
+    """
+    sources = []
+    for source in (df_master, item_values):
+        if source is None or 'Item Code' not in source.columns:
+            continue
+        columns = [col for col in VALUE_SOURCE_COLUMNS if col in source.columns]
+        if columns:
+            sources.append(source.drop_duplicates('Item Code', keep='last').set_index('Item Code')[columns])
+    
+    if not sources:
+        return None
+    
+    values = sources[0].reindex(columns=VALUE_SOURCE_COLUMNS)
+    for override in sources[1:]:
+        override = override.reindex(columns=VALUE_SOURCE_COLUMNS)
+        values = override.combine_first(values)
+    return values
+
+
+def get_criticality_weights(criticality):
+    """Turn criticality labels or numbers into weights (missing or unknown counts as 1).
+    
+    Args:
+        criticality (Series): Criticality labels (e.g. 'High') or numeric weights
+    
+    Returns:
+        ndarray: Weights as floats
+    """
+    numeric = pd.to_numeric(criticality, errors='coerce')
+    labels = pd.Series(_normalize_labels(criticality), index=criticality.index).map(CRITICALITY_WEIGHTS)
+    return numeric.fillna(labels).fillna(1).to_numpy(dtype=float)
+
+
+def add_shortfall_value(comparison, df_master, item_values=None):
+    """Add shortfall value, Pareto rank and ABC class to the comparison.
+    
+    Shortfall Value is the positive Net Difference times unit price times
+    criticality weight. Items with a shortfall are ranked by value; their
+    cumulative share of the total value gives the value class (A up to the
+    first PARETO_CLASS_LIMITS bound, then B, the rest C), which is checked
+    against the master's Classification Calculated.
+    
+    Args:
+        comparison (DataFrame): Classified comparison data
+        df_master (DataFrame): Master data
+        item_values (DataFrame, optional): Item values with Unit Price and/or Criticality
+    
+    Returns:
+        DataFrame: Comparison with the value columns added, unchanged when no
+            price or criticality data is available
+    """
+    values = get_item_values(df_master, item_values)
+    if values is None:
+        return comparison
+    
+    logger.info("Calculating shortfall value and Pareto classes...")
+    codes = pd.Index(values.index)
+    positions = codes.get_indexer(comparison['Item Code'])
+    found = positions >= 0
+    
+    unit_price = np.full(len(comparison), np.nan)
+    unit_price[found] = pd.to_numeric(values['Unit Price'], errors='coerce').to_numpy(dtype=float)[positions[found]]
+    criticality = np.full(len(comparison), None, dtype=object)
+    criticality[found] = values['Criticality'].to_numpy(dtype=object)[positions[found]]
+    weight = get_criticality_weights(pd.Series(criticality))
+    
+    # Without any prices the value is weighted units, so criticality alone still ranks
+    price = np.nan_to_num(unit_price, nan=0.0) if values['Unit Price'].notna().any() else np.ones(len(comparison))
+    shortfall = comparison['Net Difference'].clip(lower=0).to_numpy(dtype=float)
+    value = shortfall * price * weight
+    
+    # Only items with a positive value are ranked, so the sort is over the shortfall subset
+    ranked = np.flatnonzero(value > 0)
+    order = ranked[np.argsort(-value[ranked], kind='stable')]
+    total = value.sum()
+    cumulative = np.cumsum(value[order]) / total if total > 0 else np.zeros(len(order))
+    before = cumulative - (value[order] / total if total > 0 else 0)
+    
+    rank = np.zeros(len(comparison), dtype=np.int64)
+    rank[order] = np.arange(1, len(order) + 1)
+    cumulative_share = np.full(len(comparison), np.nan)
+    cumulative_share[order] = np.round(cumulative * 100, 2)
+    value_class = np.full(len(comparison), '', dtype=object)
+    value_class[order] = np.select(
+        [before < limit for limit in PARETO_CLASS_LIMITS.values()], list(PARETO_CLASS_LIMITS), default='C'
+    )
+    
+    comparison['Unit Price'] = unit_price
+    comparison['Criticality Weight'] = weight
+    comparison['Shortfall Value'] = np.round(value, 2)
+    comparison['Value Rank'] = rank
+    comparison['Cumulative Value %'] = cumulative_share
+    comparison['Value Class'] = value_class
+    comparison['Classification Check'] = check_classification(comparison, df_master)
+    
+    logger.info(f"{len(order)} items with a shortfall, total shortfall value {total:,.2f}")
+    return comparison
+
+
+def check_classification(comparison, df_master):
+    """Compare each shortfall item's value class with the master's Classification Calculated.
+    
+    Args:
+        comparison (DataFrame): Comparison with a Value Class column
+        df_master (DataFrame): Master data
+    
+    Returns:
+        ndarray: 'MATCH', 'HIGHER' (value class more urgent than the master's),
+            'LOWER', 'UNCLASSIFIED' (no A/B/C class in the master) or '' for
+            items without a shortfall
+    """
+    value_class = comparison['Value Class'].to_numpy(dtype=object)
+    if 'Classification Calculated' not in df_master.columns:
+        return np.where(value_class != '', 'UNCLASSIFIED', '').astype(object)
+    
+    master_class = df_master.drop_duplicates('Item Code').set_index('Item Code')['Classification Calculated']
+    master_class = pd.Series(_normalize_labels(master_class), index=master_class.index).str[:1]
+    master_class = master_class.reindex(comparison['Item Code']).fillna('').to_numpy(dtype=object)
+    
+    valid = np.isin(master_class, list('ABC'))
+    return np.select(
+        [value_class == '', ~valid, value_class == master_class, value_class < master_class],
+        ['', 'UNCLASSIFIED', 'MATCH', 'HIGHER'],
+        default='LOWER'
+    ).astype(object)
+
+
+def _normalize_labels(values):
+    """Stripped, upper-case labels; string work is done once per distinct value.
+    
+    Returns:
+        ndarray: Normalized labels, '' for missing values
+    """
+    codes, uniques = pd.factorize(values)
+    normalized = pd.Series(uniques, dtype=object).astype(str).str.strip().str.upper().to_numpy(dtype=object)
+    return np.where(codes >= 0, normalized[codes] if len(normalized) else '', '')
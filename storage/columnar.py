@@ -0,0 +1,162 @@
+import datetime
+import json
+import os
+import shutil
+import numpy as np
+import pandas as pd
+
+SCHEMA_FILE = 'schema.json'
+
+# Per-value type codes kept alongside text columns written with exact=True
+VALUE_TYPES = {'str': 0, 'missing': 1, 'int': 2, 'float': 3, 'bool': 4, 'datetime': 5}
+
+
+def write_columns(df, directory, metadata=None, exact=False):
+    """Write a frame as one .npy file per column plus a JSON schema.
+    
+    Numeric and boolean columns keep their dtype, datetimes are stored as
+    int64 nanoseconds and everything else as fixed-width unicode, so every
+    column can be memory-mapped on read. The directory is written next to the
+    target and renamed into place, so readers never see a partial write.
+    
+    With exact=True each text column also stores the type of every value, so
+    missing values and mixed-type columns (numbers and text in one Excel
+    column) read back as they were written instead of as plain strings.
+    
+    Args:
+        df (DataFrame): Data to write
+        directory (str): Target directory (replaced if it exists)
+        metadata (dict, optional): JSON-serialisable extras stored with the schema
+        exact (bool): Keep the per-value types of text columns
+    """
+    tmp_directory = f"{directory}.tmp"
+    shutil.rmtree(tmp_directory, ignore_errors=True)
+    os.makedirs(tmp_directory)
+    
+    schema = {'rows': len(df), 'columns': [], 'metadata': metadata or {}}
+    for position, col in enumerate(df.columns):
+        series = df[col]
+        if pd.api.types.is_bool_dtype(series) or pd.api.types.is_numeric_dtype(series):
+            kind = 'numeric'
+            values = series.to_numpy()
+        elif pd.api.types.is_datetime64_any_dtype(series):
+            kind = 'datetime'
+            values = series.to_numpy(dtype='datetime64[ns]').astype(np.int64)
+        else:
+            kind = 'string'
+            values = np.asarray(series.fillna('').astype(str).to_numpy(), dtype=str)
+        
+        file_name = f"{position:04d}.npy"
+        entry = {'name': str(col), 'file': file_name, 'kind': kind}
+        if exact:
+            entry['dtype'] = str(series.dtype)
+        if exact and kind == 'string':
+            values, types = _encode_values(series)
+            entry['types'] = f"{position:04d}.types.npy"
+            np.save(os.path.join(tmp_directory, entry['types']), types, allow_pickle=False)
+        
+        np.save(os.path.join(tmp_directory, file_name), values, allow_pickle=False)
+        schema['columns'].append(entry)
+    
+    with open(os.path.join(tmp_directory, SCHEMA_FILE), 'w') as f:
+        json.dump(schema, f)
+    
+    shutil.rmtree(directory, ignore_errors=True)
+    os.replace(tmp_directory, directory)
+
+
+def read_schema(directory):
+    """Read the schema of a columnar directory."""
+    with open(os.path.join(directory, SCHEMA_FILE)) as f:
+        return json.load(f)
+
+
+def load_column(directory, name, mmap=True, schema=None):
+    """Load a single column as a NumPy array, memory-mapped by default.
+    
+    Args:
+        directory (str): Columnar directory written by write_columns
+        name (str): Column name
+        mmap (bool): Memory-map the file instead of reading it into memory
+        schema (dict, optional): Already loaded schema
+        
+    Returns:
+        ndarray: Column values (datetimes as int64 nanoseconds)
+    """
+    schema = schema or read_schema(directory)
+    for entry in schema['columns']:
+        if entry['name'] == name:
+            return np.load(os.path.join(directory, entry['file']), mmap_mode='r' if mmap else None)
+    
+    raise KeyError(f"Column '{name}' not found in {directory}")
+
+
+def read_columns(directory, columns=None):
+    """Read a columnar directory back into a DataFrame.
+    
+    Args:
+        directory (str): Columnar directory written by write_columns
+        columns (list, optional): Subset of columns to read
+        
+    Returns:
+        DataFrame: The stored data
+    """
+    schema = read_schema(directory)
+    entries = [entry for entry in schema['columns'] if columns is None or entry['name'] in columns]
+    
+    data = {}
+    for entry in entries:
+        values = np.load(os.path.join(directory, entry['file']))
+        if entry['kind'] == 'datetime':
+            values = values.astype('datetime64[ns]').astype(entry.get('dtype', 'datetime64[ns]'))
+        elif 'types' in entry:
+            types = np.load(os.path.join(directory, entry['types']))
+            values = pd.Series(_decode_values(values, types), dtype=object)
+            if entry['dtype'] != 'object':
+                values = values.astype(entry['dtype'])
+        data[entry['name']] = values
+    
+    return pd.DataFrame(data)
+
+
+def _encode_values(series):
+    """Split a text column into unicode values and per-value type codes."""
+    values = series.to_numpy(dtype=object)
+    types = np.zeros(len(values), dtype=np.int8)
+    text = np.empty(len(values), dtype=object)
+    for i, value in enumerate(values):
+        if isinstance(value, str):
+            text[i] = value
+            continue
+        if pd.isna(value):
+            types[i], text[i] = VALUE_TYPES['missing'], ''
+        elif isinstance(value, (bool, np.bool_)):
+            types[i], text[i] = VALUE_TYPES['bool'], str(bool(value))
+        elif isinstance(value, (int, np.integer)):
+            types[i], text[i] = VALUE_TYPES['int'], str(int(value))
+        elif isinstance(value, (float, np.floating)):
+            types[i], text[i] = VALUE_TYPES['float'], repr(float(value))
+        elif isinstance(value, datetime.datetime):
+            types[i], text[i] = VALUE_TYPES['datetime'], value.isoformat()
+        else:
+            text[i] = str(value)
+    
+    return np.asarray(text, dtype=str), types
+
+
+def _decode_values(text, types):
+    """Rebuild the object values of a column written with exact=True."""
+    values = text.astype(object)
+    values[types == VALUE_TYPES['missing']] = np.nan
+    for i in np.flatnonzero(types > VALUE_TYPES['missing']):
+        value = str(text[i])
+        if types[i] == VALUE_TYPES['int']:
+            values[i] = int(value)
+        elif types[i] == VALUE_TYPES['float']:
+            values[i] = float(value)
+        elif types[i] == VALUE_TYPES['bool']:
+            values[i] = value == 'True'
+        else:
+            values[i] = pd.Timestamp(value).to_pydatetime()
+    
+    return values
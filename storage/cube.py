@@ -0,0 +1,53 @@
+import logging
+import os
+import numpy as np
+import pandas as pd
+from storage.columnar import write_columns, read_columns, read_schema
+
+logger = logging.getLogger(__name__)
+
+
+def save_cube(cube, cube_dir, cycle):
+    """Persist a cycle's aggregate cube in columnar form.
+    
+    Dimension columns are stored as their smallest integer codes with the
+    category labels in the schema metadata, measures as numeric columns.
+    
+    Args:
+        cube (DataFrame): Output of build_cube (categorical dimension columns)
+        cube_dir (str): Cube root directory
+        cycle (str): Planning cycle identifier
+    
+    Returns:
+        str: Path of the cube written
+    """
+    stored = pd.DataFrame(index=cube.index)
+    categories = {}
+    for col in cube.columns:
+        if isinstance(cube[col].dtype, pd.CategoricalDtype):
+            categories[col] = [str(label) for label in cube[col].cat.categories]
+            stored[col] = cube[col].cat.codes.to_numpy().astype(np.min_scalar_type(max(len(categories[col]), 1)))
+        else:
+            stored[col] = cube[col].to_numpy()
+    
+    os.makedirs(cube_dir, exist_ok=True)
+    path = os.path.join(cube_dir, f"cycle={cycle}")
+    write_columns(stored, path, metadata={'cycle': cycle, 'categories': categories})
+    logger.info(f"Saved aggregate cube for cycle {cycle} ({len(cube)} cells)")
+    return path
+
+
+def load_cube(path):
+    """Read a cube written by save_cube back with categorical dimensions.
+    
+    Args:
+        path (str): Cube directory of one cycle
+    
+    Returns:
+        DataFrame: The cube, ready for query_cube
+    """
+    categories = read_schema(path)['metadata']['categories']
+    cube = read_columns(path)
+    for col, labels in categories.items():
+        cube[col] = pd.Categorical.from_codes(cube[col].to_numpy().astype(np.int64), categories=labels)
+    return cube
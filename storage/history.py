@@ -0,0 +1,153 @@
+import logging
+import os
+import numpy as np
+import pandas as pd
+from storage.columnar import write_columns, read_schema, load_column
+
+logger = logging.getLogger(__name__)
+
+PARTITION_PREFIX = 'cycle='
+
+
+def append_history(comparison, history_dir, cycle):
+    """Append this cycle's item status and Net Difference to the history.
+    
+    Each cycle is written once as its own partition, sorted by item code so
+    lookups can binary-search the memory-mapped columns. Earlier partitions
+    are never modified; re-running a cycle replaces only that cycle.
+    
+    Args:
+        comparison (DataFrame): Processed comparison data
+        history_dir (str): History root directory
+        cycle (str): Planning cycle identifier (sortable, e.g. run date)
+        
+    Returns:
+        str: Path of the partition written
+    """
+    status_categories, status_codes = np.unique(comparison['Status'].astype(str).to_numpy(), return_inverse=True)
+    
+    partition = pd.DataFrame({
+        'Item Code': comparison['Item Code'].astype(str).to_numpy(),
+        'Status Code': status_codes.astype(np.int8),
+        'Net Difference': comparison['Net Difference'].to_numpy(dtype=np.int64),
+    }).sort_values('Item Code', kind='stable')
+    
+    os.makedirs(history_dir, exist_ok=True)
+    path = os.path.join(history_dir, f"{PARTITION_PREFIX}{cycle}")
+    write_columns(partition, path, metadata={'cycle': cycle, 'status_categories': status_categories.tolist()})
+    logger.info(f"Appended {len(partition)} items to history for cycle {cycle}")
+    
+    return path
+
+
+def list_cycles(history_dir):
+    """Return the cycles in the history, oldest first."""
+    if not os.path.isdir(history_dir):
+        return []
+    
+    return sorted(
+        name[len(PARTITION_PREFIX):] for name in os.listdir(history_dir)
+        if name.startswith(PARTITION_PREFIX) and not name.endswith('.tmp')
+    )
+
+
+def get_item_series(history_dir, item_code, cycles=None):
+    """Status and Net Difference of one item in each cycle.
+    
+    Args:
+        history_dir (str): History root directory
+        item_code: Item code
+        cycles (list, optional): Cycles to include, defaults to all
+        
+    Returns:
+        DataFrame: Cycle, Status and Net Difference for the cycles containing the item
+    """
+    key = str(item_code)
+    rows = []
+    for cycle in cycles or list_cycles(history_dir):
+        partition = _open_partition(history_dir, cycle)
+        position = np.searchsorted(partition['codes'], key)
+        if position < len(partition['codes']) and partition['codes'][position] == key:
+            rows.append({
+                'Cycle': cycle,
+                'Status': partition['categories'][partition['status'][position]],
+                'Net Difference': int(partition['net_difference'][position]),
+            })
+    
+    return pd.DataFrame(rows, columns=['Cycle', 'Status', 'Net Difference'])
+
+
+def find_status_streaks(history_dir, status, min_cycles):
+    """Find items that held a status in every one of the latest cycles.
+    
+    Walks backwards from the latest cycle, keeping only items still on the
+    streak, so older partitions are only probed for the surviving items.
+    
+    Args:
+        history_dir (str): History root directory
+        status (str): Status to track, e.g. 'HIGH_DEVIATION'
+        min_cycles (int): Minimum streak length to report
+        
+    Returns:
+        DataFrame: Item Code, Cycles in a Row and latest Net Difference, longest streak first
+    """
+    columns = ['Item Code', 'Cycles in a Row', 'Net Difference']
+    cycles = list_cycles(history_dir)
+    if len(cycles) < min_cycles:
+        return pd.DataFrame(columns=columns)
+    
+    latest = _open_partition(history_dir, cycles[-1])
+    mask = _status_mask(latest, status)
+    active_codes = np.asarray(latest['codes'][mask])
+    net_difference = np.asarray(latest['net_difference'][mask])
+    streak = np.ones(len(active_codes), dtype=np.int64)
+    active = np.ones(len(active_codes), dtype=bool)
+    
+    for cycle in reversed(cycles[:-1]):
+        if not active.any():
+            break
+        partition = _open_partition(history_dir, cycle)
+        codes = partition['codes']
+        
+        # Binary-search the surviving items in this cycle's sorted codes
+        candidates = np.flatnonzero(active)
+        positions = np.searchsorted(codes, active_codes[candidates])
+        in_range = positions < len(codes)
+        found = np.zeros(len(candidates), dtype=bool)
+        found[in_range] = codes[positions[in_range]] == active_codes[candidates][in_range]
+        
+        still_on = np.zeros(len(candidates), dtype=bool)
+        if status in partition['categories']:
+            status_code = partition['categories'].index(status)
+            still_on[found] = partition['status'][positions[found]] == status_code
+        
+        streak[candidates[still_on]] += 1
+        active[candidates[~still_on]] = False
+    
+    result = pd.DataFrame({
+        'Item Code': active_codes,
+        'Cycles in a Row': streak,
+        'Net Difference': net_difference,
+    })
+    result = result[result['Cycles in a Row'] >= min_cycles]
+    
+    return result.sort_values(['Cycles in a Row', 'Net Difference'], ascending=False).reset_index(drop=True)
+
+
+def _open_partition(history_dir, cycle):
+    """Memory-map one cycle's columns."""
+    path = os.path.join(history_dir, f"{PARTITION_PREFIX}{cycle}")
+    schema = read_schema(path)
+    return {
+        'codes': load_column(path, 'Item Code', schema=schema),
+        'status': load_column(path, 'Status Code', schema=schema),
+        'net_difference': load_column(path, 'Net Difference', schema=schema),
+        'categories': schema['metadata']['status_categories'],
+    }
+
+
+def _status_mask(partition, status):
+    """Boolean mask of the partition's items holding the given status."""
+    if status not in partition['categories']:
+        return np.zeros(len(partition['codes']), dtype=bool)
+    return partition['status'] == partition['categories'].index(status)
@@ -0,0 +1,253 @@
+import logging
+import sqlite3
+import pandas as pd
+from config import STORE_BATCH_SIZE
+from processing.consolidation import get_submission_column, submission_key
+
+logger = logging.getLogger(__name__)
+
+# Source column -> store column for each table. Item codes are declared
+# without a type so SQLite keeps them as given (numeric codes stay numeric
+# and still join against the master frame).
+MASTER_COLUMNS = {
+    'Item Code': 'item_code',
+    'Description': 'description',
+    'Annual Forecast': 'annual_forecast',
+    'Accumulated (12m)': 'accumulated_12m',
+    'Accumulated (24m)': 'accumulated_24m',
+    'Accumulated (36m)': 'accumulated_36m',
+    'Stock Qty': 'stock_qty',
+    'Open PRs Total 24 Months': 'open_prs',
+    'Open POs Total 24 Months': 'open_pos',
+    'Pr Not Confirmed 24 Months': 'pr_not_confirmed',
+    'Classification Calculated': 'classification',
+    'Projects': 'projects',
+}
+
+RESULT_COLUMNS = {
+    'Item Code': 'item_code',
+    'Annual Forecast': 'annual_forecast',
+    'Adjusted Annual Forecast': 'adjusted_forecast',
+    'Total Plant Requests': 'total_plant_requests',
+    'Difference': 'difference',
+    'Available Stock': 'available_stock',
+    'Pending Orders': 'pending_orders',
+    'Net Difference': 'net_difference',
+    'Status': 'status',
+    'Recommendation': 'recommendation',
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS master (
+    cycle TEXT NOT NULL, item_code NOT NULL, description TEXT, annual_forecast REAL,
+    accumulated_12m REAL, accumulated_24m REAL, accumulated_36m REAL,
+    stock_qty REAL, open_prs REAL, open_pos REAL, pr_not_confirmed REAL,
+    classification TEXT, projects TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_master_cycle_item ON master (cycle, item_code);
+
+CREATE TABLE IF NOT EXISTS responses (
+    cycle TEXT NOT NULL, plant TEXT, item_code, qty_needed REAL, submission
+);
+CREATE INDEX IF NOT EXISTS idx_responses_cycle_item_plant ON responses (cycle, item_code, plant);
+CREATE INDEX IF NOT EXISTS idx_responses_plant_item_cycle ON responses (plant, item_code, cycle);
+
+CREATE TABLE IF NOT EXISTS results (
+    cycle TEXT NOT NULL, item_code NOT NULL, annual_forecast INTEGER, adjusted_forecast INTEGER,
+    total_plant_requests INTEGER, difference INTEGER, available_stock INTEGER,
+    pending_orders INTEGER, net_difference INTEGER, status TEXT, recommendation TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_results_cycle_item ON results (cycle, item_code);
+CREATE INDEX IF NOT EXISTS idx_results_item_cycle ON results (item_code, cycle);
+"""
+
+# Latest-submission-wins, mirroring processing.consolidation: lines without a
+# submission key lose to keyed lines, groups without any key keep every line.
+# Lines without a plant or item code are never superseded (pandas does not
+# group them), so they are matched with IS and always kept.
+LATEST_RESPONSES = """
+WITH latest AS (
+    SELECT plant, item_code, MAX(submission) AS submission
+    FROM responses WHERE cycle = :cycle GROUP BY plant, item_code
+)
+SELECT r.plant, r.item_code, r.qty_needed
+FROM responses r
+JOIN latest l ON l.plant IS r.plant AND l.item_code IS r.item_code
+WHERE r.cycle = :cycle
+  AND (l.submission IS NULL OR r.submission = l.submission OR r.plant IS NULL OR r.item_code IS NULL)
+"""
+
+
+def open_store(path):
+    """Open (and create if needed) the SQLite store.
+    
+    Args:
+        path (str): Database file path
+        
+    Returns:
+        sqlite3.Connection: Open connection with the schema in place
+    """
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def load_cycle(conn, cycle, df_master, df_responses):
+    """Bulk-load a cycle's master and response data, replacing any earlier load of the cycle.
+    
+    Args:
+        conn (sqlite3.Connection): Open store
+        cycle (str): Planning cycle identifier (run date)
+        df_master (DataFrame): Master data
+        df_responses (DataFrame): Plant response data as submitted
+    """
+    logger.info(f"Loading cycle {cycle} into store...")
+    
+    master = _to_store_frame(df_master, MASTER_COLUMNS)
+    
+    responses = pd.DataFrame({
+        'plant': df_responses['Plant'],
+        'item_code': df_responses['Item Code'],
+        'qty_needed': pd.to_numeric(df_responses['Qty Needed'], errors='coerce'),
+    })
+    # Store the key keep_latest_submissions compares (numbers, or timestamps as
+    # epoch nanoseconds) so MAX() orders submissions the same way, never as text
+    submission_col = get_submission_column(df_responses)
+    if submission_col is None:
+        responses['submission'] = None
+    else:
+        key = submission_key(df_responses, submission_col)
+        if pd.api.types.is_datetime64_any_dtype(key):
+            epoch_ns = pd.Series(key.to_numpy(dtype='datetime64[ns]').view('int64'), index=key.index)
+            key = epoch_ns.astype('Int64').mask(key.isna())
+        responses['submission'] = key
+    
+    # Inserting in index order keeps B-tree updates local, which is far faster
+    # than random inserts on large loads (mixed-type codes are left unsorted)
+    try:
+        master = master.sort_values('item_code', kind='stable')
+        responses = responses.sort_values(['item_code', 'plant'], kind='stable')
+    except TypeError:
+        pass
+    
+    with conn:
+        for table in ('master', 'responses'):
+            conn.execute(f"DELETE FROM {table} WHERE cycle = ?", (cycle,))
+        _insert_frame(conn, 'master', master, cycle)
+        _insert_frame(conn, 'responses', responses, cycle)
+    
+    logger.info(f"Stored {len(master)} master items and {len(responses)} response lines for cycle {cycle}")
+
+
+def aggregate_requests_from_store(conn, cycle):
+    """Aggregate a cycle's requested quantities per item and plant in SQL.
+    
+    Args:
+        conn (sqlite3.Connection): Open store
+        cycle (str): Planning cycle identifier
+        
+    Returns:
+        DataFrame: Item Code, Plant and Qty Needed summed over each plant's
+            latest submission
+    """
+    query = f"""
+        SELECT item_code AS "Item Code", plant AS "Plant", SUM(qty_needed) AS "Qty Needed"
+        FROM ({LATEST_RESPONSES})
+        GROUP BY item_code, plant
+    """
+    return pd.read_sql_query(query, conn, params={'cycle': cycle})
+
+
+def save_results(conn, cycle, comparison):
+    """Write a cycle's comparison results back to the store.
+    
+    Args:
+        conn (sqlite3.Connection): Open store
+        cycle (str): Planning cycle identifier
+        comparison (DataFrame): Processed comparison data
+    """
+    results = _to_store_frame(comparison, RESULT_COLUMNS)
+    with conn:
+        conn.execute("DELETE FROM results WHERE cycle = ?", (cycle,))
+        _insert_frame(conn, 'results', results, cycle)
+    
+    logger.info(f"Stored {len(results)} results for cycle {cycle}")
+
+
+def get_plant_item_history(conn, plant, item_code, start_cycle=None, end_cycle=None):
+    """Quantities a plant requested for an item in each cycle.
+    
+    Args:
+        conn (sqlite3.Connection): Open store
+        plant (str): Plant name
+        item_code: Item code
+        start_cycle (str, optional): First cycle to include
+        end_cycle (str, optional): Last cycle to include
+        
+    Returns:
+        DataFrame: Cycle and Qty Needed per cycle
+    """
+    query = """
+        WITH latest AS (
+            SELECT cycle, MAX(submission) AS submission FROM responses
+            WHERE plant = :plant AND item_code = :item_code GROUP BY cycle
+        )
+        SELECT r.cycle AS "Cycle", SUM(r.qty_needed) AS "Qty Needed"
+        FROM responses r JOIN latest l ON l.cycle = r.cycle
+        WHERE r.plant = :plant AND r.item_code = :item_code
+          AND (l.submission IS NULL OR r.submission = l.submission)
+          AND (:start_cycle IS NULL OR r.cycle >= :start_cycle)
+          AND (:end_cycle IS NULL OR r.cycle <= :end_cycle)
+        GROUP BY r.cycle ORDER BY r.cycle
+    """
+    params = {'plant': plant, 'item_code': item_code, 'start_cycle': start_cycle, 'end_cycle': end_cycle}
+    return pd.read_sql_query(query, conn, params=params)
+
+
+def get_item_results(conn, item_code, start_cycle=None, end_cycle=None):
+    """Status and quantities of an item in each stored cycle.
+    
+    Args:
+        conn (sqlite3.Connection): Open store
+        item_code: Item code
+        start_cycle (str, optional): First cycle to include
+        end_cycle (str, optional): Last cycle to include
+        
+    Returns:
+        DataFrame: One row per cycle with the stored result columns
+    """
+    query = """
+        SELECT * FROM results
+        WHERE item_code = :item_code
+          AND (:start_cycle IS NULL OR cycle >= :start_cycle)
+          AND (:end_cycle IS NULL OR cycle <= :end_cycle)
+        ORDER BY cycle
+    """
+    params = {'item_code': item_code, 'start_cycle': start_cycle, 'end_cycle': end_cycle}
+    return pd.read_sql_query(query, conn, params=params)
+
+
+def _to_store_frame(df, column_map):
+    """Select and rename the columns a store table keeps, adding missing ones as NULL."""
+    frame = pd.DataFrame(index=df.index)
+    for source, target in column_map.items():
+        frame[target] = df[source] if source in df.columns else None
+    return frame
+
+
+def _insert_frame(conn, table, frame, cycle):
+    """Insert a frame in batches of STORE_BATCH_SIZE rows."""
+    columns = ['cycle'] + list(frame.columns)
+    statement = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})"
+    
+    # tolist() yields Python scalars sqlite3 can bind; NaN becomes None (NULL)
+    values = [[cycle] * len(frame)]
+    for col in frame.columns:
+        series = frame[col]
+        values.append(series.astype(object).where(series.notna(), None).tolist())
+    rows = list(zip(*values))
+    
+    for start in range(0, len(rows), STORE_BATCH_SIZE):
+        conn.executemany(statement, rows[start:start + STORE_BATCH_SIZE])
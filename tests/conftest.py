@@ -0,0 +1,48 @@
+import os
+import sys
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def make_master(n_items=40, seed=0):
+    """Small master frame with every column the analysis reads."""
+    rng = np.random.default_rng(seed)
+    accumulated_12m = rng.integers(0, 20, n_items)
+    accumulated_24m = accumulated_12m + rng.integers(0, 20, n_items)
+    return pd.DataFrame({
+        'Item Code': [f"GK-{i:04d}" for i in range(n_items)],
+        'Description': [f"Gasket {i}" for i in range(n_items)],
+        'Annual Forecast': rng.integers(0, 15, n_items).astype(float),
+        'Accumulated (36m)': accumulated_24m + rng.integers(0, 20, n_items),
+        'Accumulated (24m)': accumulated_24m,
+        'Accumulated (12m)': accumulated_12m,
+        'Stock Qty': rng.integers(0, 5, n_items),
+        'Open PRs Total 24 Months': rng.integers(0, 3, n_items),
+        'Open POs Total 24 Months': rng.integers(0, 3, n_items),
+        'Pr Not Confirmed 24 Months': rng.integers(0, 2, n_items),
+        'Classification Calculated': rng.choice(list("ABC"), n_items),
+        'Projects': rng.choice(["P1", "P2", "None"], n_items),
+    })
+
+
+def make_responses(master, n_lines=300, plants=("Alpha", "Beta", "Gamma"), seed=1):
+    """Response lines over the master's item codes, several per plant and item."""
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'Plant': rng.choice(list(plants), n_lines),
+        'Item Code': rng.choice(master['Item Code'].to_numpy(), n_lines),
+        'Qty Needed': rng.integers(1, 12, n_lines),
+    })
+
+
+@pytest.fixture
+def master():
+    return make_master()
+
+
+@pytest.fixture
+def responses(master):
+    return make_responses(master)
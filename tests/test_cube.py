@@ -0,0 +1,25 @@
+import numpy as np
+from processing.cube import ALL_PLANTS, query_cube
+from processing.data_processor import process_data
+
+
+def test_cube_totals_match_the_comparison(master, responses):
+    result = process_data(master, responses)
+    comparison, cube = result['comparison'], result['cube']
+    
+    total = query_cube(cube)
+    assert total['Items'][0] == len(comparison)
+    assert np.isclose(total['Net Shortfall'][0], comparison['Net Difference'].clip(lower=0).sum(), atol=0.05)
+    assert np.isclose(query_cube(cube, by=['Plant'])['Net Shortfall'].sum(), total['Net Shortfall'][0], atol=0.5)
+
+
+def test_negative_requests_never_give_undefined_or_negative_shares(master, responses):
+    responses = responses.copy()
+    responses.loc[responses.index[::3], 'Qty Needed'] *= -1
+    result = process_data(master, responses)
+    cube = result['cube']
+    
+    plant_rows = cube[cube['Plant'] != ALL_PLANTS]
+    assert np.isfinite(plant_rows['Net Shortfall']).all()
+    assert (plant_rows['Net Shortfall'] >= 0).all()
+    assert np.isclose(plant_rows['Net Shortfall'].sum(), query_cube(cube)['Net Shortfall'][0], atol=0.5)
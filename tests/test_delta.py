@@ -0,0 +1,18 @@
+import pandas as pd
+from processing.data_processor import process_data
+from processing.delta import SNAPSHOT_COLUMNS, save_snapshot, load_previous_comparison, build_delta
+from storage.columnar import read_schema, load_column
+
+
+def test_snapshot_round_trip_stores_status_as_codes(master, responses, tmp_path):
+    comparison = process_data(master, responses)['comparison']
+    path = save_snapshot(comparison, str(tmp_path), '2025-04-01')
+    
+    assert 'Description' not in [entry['name'] for entry in read_schema(path)['columns']]
+    assert load_column(path, 'Status').dtype == 'int8'
+    assert load_column(path, 'Recommendation').dtype == 'int8'
+    
+    previous = load_previous_comparison(path)
+    expected = comparison[SNAPSHOT_COLUMNS].astype({'Item Code': str})
+    pd.testing.assert_frame_equal(previous, expected, check_dtype=False)
+    assert build_delta(previous, comparison).empty
@@ -0,0 +1,53 @@
+import numpy as np
+import pandas as pd
+import pytest
+from processing.data_processor import process_data
+
+pytest.importorskip('polars')
+
+
+def duplicates(master, responses):
+    # Repeated response lines and a master code listed twice
+    master = pd.concat([master, master.iloc[[3]]], ignore_index=True)
+    responses = pd.concat([responses, responses.iloc[:25]], ignore_index=True)
+    return master, responses
+
+
+def nan_codes(master, responses):
+    master = master.copy()
+    responses = responses.copy()
+    master.loc[[5, 6], 'Item Code'] = np.nan
+    responses.loc[responses.index[:10], 'Item Code'] = np.nan
+    return master, responses
+
+
+def negative_quantities(master, responses):
+    responses = responses.copy()
+    responses.loc[responses.index[::7], 'Qty Needed'] *= -1
+    return master, responses
+
+
+def mixed_type_codes(master, responses):
+    # Numeric codes next to text codes, as Excel returns them for a mixed column
+    numeric = {code: 1000 + i for i, code in enumerate(master['Item Code'][::2])}
+    master = master.assign(Item_Code=master['Item Code'].astype(object).replace(numeric))
+    responses = responses.assign(Item_Code=responses['Item Code'].astype(object).replace(numeric))
+    rename = {'Item_Code': 'Item Code'}
+    return (
+        master.drop(columns='Item Code').rename(columns=rename),
+        responses.drop(columns='Item Code').rename(columns=rename)
+    )
+
+
+CASES = [duplicates, nan_codes, negative_quantities, mixed_type_codes]
+
+
+@pytest.mark.parametrize('make_case', CASES, ids=[case.__name__ for case in CASES])
+def test_engines_give_identical_results(master, responses, make_case):
+    master, responses = make_case(master, responses)
+    
+    reference = process_data(master, responses, engine='pandas')
+    result = process_data(master, responses, engine='polars')
+    
+    for key in ('comparison', 'summary_stats', 'plant_summary'):
+        pd.testing.assert_frame_equal(result[key], reference[key])
@@ -0,0 +1,24 @@
+import datetime
+import os
+import pandas as pd
+from processing.ingest import read_input_file
+
+
+def test_workbook_cache_round_trips_without_pickle(tmp_path):
+    workbook = tmp_path / 'master.xlsx'
+    pd.DataFrame({
+        'Item Code': ['A1', 1001, 2.5, None, datetime.datetime(2025, 1, 2)],
+        'Description': ['a', None, 'c', 'd', 'e'],
+        'Forecast': [1, 2, 3, 4, 5],
+        'Stock': [1.5, None, 3, 4, 5],
+        'Date': pd.to_datetime(['2025-01-01', None, '2025-01-03', '2025-01-04', '2025-01-05']),
+        'Active': [True, False, True, True, False],
+    }).to_excel(workbook, index=False)
+    cache_dir = tmp_path / 'cache'
+    
+    parsed = read_input_file(str(workbook), str(cache_dir))
+    cached = read_input_file(str(workbook), str(cache_dir))
+    
+    pd.testing.assert_frame_equal(cached, pd.read_excel(workbook))
+    assert parsed['Item Code'].map(type).tolist() == cached['Item Code'].map(type).tolist()
+    assert not any(name.endswith('.pkl') for _, _, names in os.walk(cache_dir) for name in names)
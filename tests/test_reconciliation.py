@@ -0,0 +1,30 @@
+import numpy as np
+import pandas as pd
+from processing.reconciliation import normalize_codes, reconcile_responses
+
+
+def test_whole_number_float_codes_normalize_like_text():
+    keys = normalize_codes(pd.Series([1001.0, '1001', 'gk-1001', 12.5, np.nan]))
+    assert keys.tolist() == ['1001', '1001', 'GK1001', '125', '']
+
+
+def test_numeric_master_codes_reconcile_text_responses():
+    master = pd.DataFrame({'Item Code': [1001.0, 2002.0], 'Description': ['Gasket A', 'Gasket B']})
+    responses = pd.DataFrame({'Plant': ['Alpha', 'Beta'], 'Item Code': ['1001', '20-02'], 'Qty Needed': [1, 2]})
+    
+    reconciled, matches = reconcile_responses(master, responses, auto_apply=True)
+    
+    assert matches['Match'].tolist() == ['normalized', 'normalized']
+    assert reconciled['Item Code'].tolist() == [1001.0, 2002.0]
+    assert reconciled['Reconciled From'].tolist() == ['1001', '20-02']
+
+
+def test_numeric_response_codes_reconcile_text_master():
+    master = pd.DataFrame({'Item Code': ['1001', '2002'], 'Description': ['Gasket A', 'Gasket B']})
+    responses = pd.DataFrame({'Plant': ['Alpha', 'Beta'], 'Item Code': [1001.0, 2002.0], 'Qty Needed': [1, 2]})
+    
+    reconciled, matches = reconcile_responses(master, responses, auto_apply=True)
+    
+    assert matches['Match'].tolist() == ['normalized', 'normalized']
+    assert matches['Applied'].all()
+    assert reconciled['Item Code'].tolist() == ['1001', '2002']
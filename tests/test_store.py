@@ -0,0 +1,69 @@
+import numpy as np
+import pandas as pd
+import pytest
+from processing.consolidation import keep_latest_submissions
+from processing.data_processor import process_data
+from storage.sqlite_store import open_store, load_cycle, aggregate_requests_from_store
+
+CYCLE = '2025-04-01'
+
+SUBMISSION_KEYS = {
+    'numeric text': ['9', '10'],
+    'numbers': [9, 10],
+    'timestamps': [pd.Timestamp('2025-04-01 08:00'), pd.Timestamp('2025-04-02 17:30')],
+    'date text': ['2025-04-01', '2025-04-10'],
+    'text versions': ['v1', 'v2'],
+}
+
+
+def with_submissions(responses, keys, seed=2):
+    rng = np.random.default_rng(seed)
+    responses = responses.copy()
+    responses['Version'] = pd.Series(keys, dtype=object).iloc[rng.integers(0, len(keys), len(responses))].to_numpy()
+    return responses
+
+
+def in_memory_requests(responses):
+    consolidated, _ = keep_latest_submissions(responses)
+    return consolidated.groupby(['Item Code', 'Plant'], dropna=False)['Qty Needed'].sum()
+
+
+def store_requests(responses, master):
+    conn = open_store(':memory:')
+    try:
+        load_cycle(conn, CYCLE, master, responses)
+        lines = aggregate_requests_from_store(conn, CYCLE)
+    finally:
+        conn.close()
+    return lines.groupby(['Item Code', 'Plant'], dropna=False)['Qty Needed'].sum()
+
+
+def assert_same_requests(responses, master):
+    expected = in_memory_requests(responses).sort_index()
+    actual = store_requests(responses, master).sort_index()
+    pd.testing.assert_series_equal(actual, expected, check_dtype=False, check_names=False)
+
+
+@pytest.mark.parametrize('keys', SUBMISSION_KEYS.values(), ids=SUBMISSION_KEYS.keys())
+def test_store_keeps_the_same_submissions_as_pandas(master, responses, keys):
+    assert_same_requests(with_submissions(responses, keys), master)
+
+
+def test_store_keeps_lines_without_plant(master, responses):
+    responses = with_submissions(responses, ['9', '10'])
+    responses.loc[responses.index[:5], 'Plant'] = None
+    assert_same_requests(responses, master)
+
+
+def test_store_and_in_memory_runs_agree(master, responses):
+    responses = with_submissions(responses, ['9', '10'])
+    conn = open_store(':memory:')
+    try:
+        load_cycle(conn, CYCLE, master, responses)
+        from_store = process_data(master, responses, store=conn, cycle=CYCLE)
+    finally:
+        conn.close()
+    in_memory = process_data(master, responses, cycle=CYCLE)
+    
+    pd.testing.assert_frame_equal(from_store['comparison'], in_memory['comparison'])
+    pd.testing.assert_frame_equal(from_store['plant_summary'], in_memory['plant_summary'])
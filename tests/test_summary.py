@@ -0,0 +1,61 @@
+import pytest
+import processing.inventory_policy
+from processing.data_processor import process_data
+from processing.status import display_statuses, status_summary_label
+from visualization.formatters.dashboard import build_chart_data
+
+BASELINE_METRICS = [
+    'Total Items Analyzed',
+    'Items with High Deviation (>3 after stock & orders)',
+    'Items with Moderate Deviation (1-3 after stock & orders)',
+    'Items with Acceptable Match (=0)',
+    'Items with Low Request (<0)',
+    'Items Covered by Available Stock',
+    'Items Covered by Pending Orders',
+    'Items Needing Significant Increase',
+    'Items Needing Moderate Increase',
+    'Items Needing Forecast Reduction',
+    'Items with Adequate Forecast',
+    'Items with Forecast < 1 (Adjusted to 0)',
+    'Items with Stock Available',
+    'Items with Pending Orders'
+]
+BASELINE_PLANT_COLUMNS = [
+    'Plant', 'Items Requested', 'High Deviation Items', 'Moderate Deviation Items', 'Acceptable Items',
+    'Low Request Items', 'Covered by Stock', 'Covered by Orders'
+]
+
+
+@pytest.mark.parametrize('policy_enabled', [False, True])
+def test_plant_status_columns_add_up_to_items_requested(master, responses, monkeypatch, policy_enabled):
+    monkeypatch.setattr(processing.inventory_policy, 'INVENTORY_POLICY_ENABLED', policy_enabled)
+    plant_summary = process_data(master, responses)['plant_summary']
+    
+    assert (plant_summary.iloc[:, 2:].sum(axis=1) == plant_summary['Items Requested']).all()
+
+
+def test_reorder_policy_is_off_by_default(master, responses):
+    result = process_data(master, responses)
+    comparison = result['comparison']
+    
+    assert 'Below Reorder Point' not in comparison.columns
+    assert not (comparison['Status'] == 'BELOW_REORDER_POINT').any()
+    assert not result['summary_stats']['Metric'].str.contains('Reorder Point').any()
+    assert 'Below Reorder Point' not in result['plant_summary'].columns
+    assert 'BELOW_REORDER_POINT' not in build_chart_data(comparison, ['Alpha'])['status']['Status'].tolist()
+
+
+def test_summary_keeps_the_baseline_layout(master, responses):
+    result = process_data(master, responses)
+    
+    assert result['summary_stats']['Metric'].tolist()[:len(BASELINE_METRICS)] == BASELINE_METRICS
+    assert result['plant_summary'].columns.tolist()[:len(BASELINE_PLANT_COLUMNS)] == BASELINE_PLANT_COLUMNS
+
+
+@pytest.mark.parametrize('policy_enabled', [False, True])
+def test_every_status_is_counted(master, responses, monkeypatch, policy_enabled):
+    monkeypatch.setattr(processing.inventory_policy, 'INVENTORY_POLICY_ENABLED', policy_enabled)
+    summary_stats = process_data(master, responses)['summary_stats'].set_index('Metric')['Count']
+    labels = [status_summary_label(name) for name in display_statuses(policy_enabled)]
+    
+    assert summary_stats[labels].sum() == summary_stats['Total Items Analyzed']
@@ -0,0 +1,39 @@
+import numpy as np
+import pandas as pd
+import pytest
+from processing.data_processor import process_data
+from processing.validation import validate_inputs, drop_unusable_responses
+
+
+def failed_checks(report):
+    return dict(zip(report['Check'], report['Count']))
+
+
+def test_validation_handles_empty_and_all_missing_columns(master):
+    for responses in (
+        pd.DataFrame({'Plant': [np.nan] * 3, 'Item Code': [np.nan] * 3, 'Qty Needed': [np.nan] * 3}),
+        pd.DataFrame({'Plant': [], 'Item Code': [], 'Qty Needed': []}),
+    ):
+        report = validate_inputs(master, responses)
+        assert failed_checks(report)['Blank plant names (dropped from analysis)'] == len(responses)
+
+
+def test_unusable_lines_are_reported_then_dropped(master, responses):
+    responses = responses.astype({'Qty Needed': object})
+    responses.loc[0, 'Plant'] = None
+    responses.loc[1, 'Qty Needed'] = 'five'
+    
+    checks = failed_checks(validate_inputs(master, responses))
+    assert checks['Blank plant names (dropped from analysis)'] == 1
+    assert checks['Non-numeric Qty Needed (dropped from analysis)'] == 1
+    
+    usable = drop_unusable_responses(responses)
+    assert len(usable) == len(responses) - 2
+    result = process_data(master, usable)
+    assert result['comparison']['Total Plant Requests'].sum() == usable['Qty Needed'].sum()
+
+
+def test_no_usable_lines_stops_the_run(responses):
+    responses = responses.assign(Plant=None)
+    with pytest.raises(ValueError, match="No usable response lines"):
+        drop_unusable_responses(responses)
@@ -2,16 +2,21 @@ import logging
 import openpyxl
 from openpyxl.utils.dataframe import dataframe_to_rows
 import pandas as pd
-from config import OUTPUT_PATH
-from processing.status import get_enhanced_status_for_plant, get_enhanced_recommendation_for_plant
+from config import OUTPUT_PATH, EXCEL_MAX_ROWS, EXCEL_MAX_SHEET_NAME, PRIORITY_SORT
+from processing.status import STATUS_NAMES, RECOMMENDATION_NAMES, classify_codes
 from visualization.formatters.comparison import format_comparison_sheet
 from visualization.formatters.plant import format_plant_sheet
 from visualization.formatters.instructions import create_instructions_sheet
 from visualization.formatters.dashboard import create_dashboard
+from visualization.formatters.changes import format_changes_sheet
+from visualization.formatters.data_quality import create_data_quality_sheet
+from visualization.formatters.rollups import create_rollups_sheet
 
 logger = logging.getLogger(__name__)
 
-def create_output_file(comparison, plant_summary, summary_stats, unique_plants, df_master, df_responses):
+def create_output_file(comparison, plant_summary, summary_stats, unique_plants, df_master, df_responses,
+                       changes=None, chronic_items=None, output_path=None, data_quality=None, sort_by=None,
+                       cube=None, plant_responses=None):
     """Create and format the output Excel file.
     
     Args:
@@ -20,58 +25,144 @@ def create_output_file(comparison, plant_summary, summary_stats, unique_plants,
         summary_stats (DataFrame): Overall summary statistics
         unique_plants (list): List of unique plant names
         df_master (DataFrame): Original master data
-        df_responses (DataFrame): Original response data
+        df_responses (DataFrame): Original response data, written to the Responses sheet as submitted
+        changes (DataFrame, optional): Changes since the previous run
+        chronic_items (DataFrame, optional): Items holding a deviation status for several cycles in a row
+        output_path (str, optional): Workbook to write, defaults to config OUTPUT_PATH
+        data_quality (DataFrame, optional): Input data quality checks
+        sort_by (str, optional): 'units' or 'value' ordering of top lists and plant sheets,
+            defaults to config PRIORITY_SORT
+        cube (DataFrame, optional): Aggregate cube for the Roll-ups sheet and dashboard status counts
+        plant_responses (DataFrame, optional): Consolidated responses the analysis used, for the
+            plant sheets; defaults to df_responses
     """
     logger.info("\nCreating output file...")
+    output_path = output_path or OUTPUT_PATH
+    sort_by = sort_by or PRIORITY_SORT
+    plant_responses = df_responses if plant_responses is None else plant_responses
+    
+    # Split oversized frames up front rather than failing after minutes of work
+    # (the comparison sheet reserves 2 rows for the title inserted when formatting)
+    frame_parts = {
+        'Master': split_frame(df_master),
+        'Responses': split_frame(df_responses),
+        'Comparison Analysis': split_frame(comparison, reserved_rows=2),
+    }
+    if changes is not None:
+        frame_parts['Changes'] = split_frame(changes, reserved_rows=2)
+    for sheet_name, parts in frame_parts.items():
+        if len(parts) > 1:
+            logger.info(f"'{sheet_name}' exceeds Excel's row limit - splitting across {len(parts)} sheets")
     
     # Create Excel writer
-    writer = pd.ExcelWriter(OUTPUT_PATH, engine='openpyxl')
+    writer = pd.ExcelWriter(output_path, engine='openpyxl')
     
-    # Write source data
-    df_master.to_excel(writer, sheet_name='Master', index=False)
-    df_responses.to_excel(writer, sheet_name='Responses', index=False)
+    # Write source data and analysis results
+    sheet_parts = {}
+    for sheet_name, parts in frame_parts.items():
+        sheet_parts[sheet_name] = write_sheet_parts(writer, parts, sheet_name)
     
-    # Write analysis results
-    comparison.to_excel(writer, sheet_name='Comparison Analysis', index=False)
     summary_stats.to_excel(writer, sheet_name='Summary Statistics', index=False)
     plant_summary.to_excel(writer, sheet_name='Plant Summary', index=False)
     
     # Create plant-specific sheets
+    plant_sheets = {}
     for plant in unique_plants:
         logger.info(f"Creating plant sheet for {plant}...")
-        create_plant_sheet(writer, plant, df_master, df_responses, comparison)
+        plant_sheets[plant] = create_plant_sheet(writer, plant, df_master, plant_responses, comparison, sort_by)
+        sheet_parts[plant_sheets[plant][0]] = plant_sheets[plant]
     
     # Save the workbook to access it with openpyxl
     writer.close()
     
     # Open the file with openpyxl to add formatting and charts
-    wb = openpyxl.load_workbook(OUTPUT_PATH)
+    wb = openpyxl.load_workbook(output_path)
+    
+    # Only sheets that had to be split are linked from the Instructions and Dashboard
+    split_sheets = {name: parts for name, parts in sheet_parts.items() if len(parts) > 1}
     
     # Add instructions sheet
-    create_instructions_sheet(wb)
+    reorder_policy = 'Below Reorder Point' in comparison.columns
+    create_instructions_sheet(wb, split_sheets, reorder_policy)
+    
+    # Add data quality sheet
+    if data_quality is not None:
+        create_data_quality_sheet(wb, data_quality)
+    
+    # Add roll-ups sheet
+    if cube is not None:
+        create_rollups_sheet(wb, cube, reorder_policy)
     
     # Create dashboard
-    create_dashboard(wb, comparison, summary_stats, plant_summary, unique_plants)
+    create_dashboard(
+        wb, comparison, summary_stats, plant_summary, unique_plants, split_sheets, chronic_items, sort_by, cube
+    )
+    
+    # Format the comparison sheet(s)
+    for sheet_name, part in zip(sheet_parts['Comparison Analysis'], frame_parts['Comparison Analysis']):
+        format_comparison_sheet(wb, part, sheet_name)
     
-    # Format the comparison sheet
-    format_comparison_sheet(wb, comparison)
+    # Format the changes sheet(s)
+    if changes is not None:
+        for sheet_name, part in zip(sheet_parts['Changes'], frame_parts['Changes']):
+            format_changes_sheet(wb, part, sheet_name)
     
     # Format plant sheets
     for plant in unique_plants:
-        # Get shortened sheet name
-        short_plant_name = plant[:25] if len(plant) > 25 else plant
-        sheet_name = f'Plant_{short_plant_name}'
-        
-        if sheet_name in wb.sheetnames:
-            format_plant_sheet(wb, plant, sheet_name)
-        else:
-            logger.warning(f"Sheet '{sheet_name}' not found")
+        for sheet_name in plant_sheets[plant]:
+            if sheet_name in wb.sheetnames:
+                format_plant_sheet(wb, plant, sheet_name)
+            else:
+                logger.warning(f"Sheet '{sheet_name}' not found")
     
     # Save the workbook
-    wb.save(OUTPUT_PATH)
+    wb.save(output_path)
+
+
+def split_frame(df, reserved_rows=0):
+    """Split a frame into chunks that each fit on one Excel sheet.
+    
+    Args:
+        df (DataFrame): Data to be written
+        reserved_rows (int): Rows kept free above the header for titles
+        
+    Returns:
+        list: DataFrame slices, at least one (possibly empty)
+    """
+    rows_per_sheet = EXCEL_MAX_ROWS - 1 - reserved_rows
+    return [df.iloc[start:start + rows_per_sheet] for start in range(0, max(len(df), 1), rows_per_sheet)]
+
+
+def get_part_sheet_name(sheet_name, part_number):
+    """Name of a continuation sheet, e.g. 'Comparison Analysis (2)'."""
+    if part_number == 1:
+        return sheet_name
+    
+    suffix = f" ({part_number})"
+    return sheet_name[:EXCEL_MAX_SHEET_NAME - len(suffix)] + suffix
+
 
+def write_sheet_parts(writer, parts, sheet_name):
+    """Write frame slices to a sheet and its numbered continuation sheets.
+    
+    Args:
+        writer: Excel writer object
+        parts (list): DataFrame slices from split_frame
+        sheet_name (str): Name of the first sheet
+        
+    Returns:
+        list: Names of the sheets written
+    """
+    sheet_names = []
+    for part_number, part in enumerate(parts, start=1):
+        part_name = get_part_sheet_name(sheet_name, part_number)
+        part.to_excel(writer, sheet_name=part_name, index=False)
+        sheet_names.append(part_name)
+    
+    return sheet_names
 
-def create_plant_sheet(writer, plant, df_master, df_responses, comparison):
+
+def create_plant_sheet(writer, plant, df_master, df_responses, comparison, sort_by='units'):
     """Create a sheet for plant-specific data and communication.
     
     Args:
@@ -80,6 +171,10 @@ def create_plant_sheet(writer, plant, df_master, df_responses, comparison):
         df_master (DataFrame): Master data
         df_responses (DataFrame): Response data
         comparison (DataFrame): Comparison analysis data
+        sort_by (str): 'value' puts the highest shortfall value first; 'units' keeps response order
+    
+    Returns:
+        list: Names of the sheets written (continuation sheets when the plant exceeds Excel's row limit)
     """
     # Truncate plant name to fit Excel's 31-character limit for sheet names
     short_plant_name = plant[:25] if len(plant) > 25 else plant
@@ -116,23 +211,22 @@ def create_plant_sheet(writer, plant, df_master, df_responses, comparison):
                                                plant_comparison['Available Stock'] - \
                                                plant_comparison['Pending Orders']
     
-    # Apply status classification
-    plant_comparison['Plant Status'] = plant_comparison.apply(
-        lambda row: get_enhanced_status_for_plant(row, plant), 
-        axis=1
-    )
-    
-    plant_comparison['Plant Recommendation'] = plant_comparison.apply(
-        lambda row: get_enhanced_recommendation_for_plant(row, plant),
-        axis=1
-    )
+    # Apply the status rules to the plant's own request (the reorder override is item-wide and does not apply)
+    status, recommendation = classify_codes({
+        'difference': plant_comparison['Plant Difference'].to_numpy(dtype=float),
+        'net_difference': plant_comparison['Plant Net Difference'].to_numpy(dtype=float),
+        'available_stock': plant_comparison['Available Stock'].to_numpy(dtype=float),
+        'pending_orders': plant_comparison['Pending Orders'].to_numpy(dtype=float),
+    })
+    plant_comparison['Plant Status'] = STATUS_NAMES[status]
+    plant_comparison['Plant Recommendation'] = RECOMMENDATION_NAMES[recommendation]
     
     # Extract relevant columns for the plant sheet
     plant_data_columns = [
         'Item Code', f'{plant} Requests', 'Plant Difference', 
         'Available Stock', 'Pending Orders', 'Plant Net Difference',
         'Plant Status', 'Plant Recommendation'
-    ]
+    ] + [col for col in ['Shortfall Value', 'Value Class'] if col in plant_comparison.columns]
     plant_specific_data = plant_comparison[plant_data_columns].copy()
     
     # Combine the data
@@ -157,5 +251,13 @@ def create_plant_sheet(writer, plant, df_master, df_responses, comparison):
     duplicate_cols = [col for col in plant_responses_with_comparison.columns if col.endswith('_master')]
     plant_responses_with_comparison = plant_responses_with_comparison.drop(columns=duplicate_cols)
     
-    # Write to Excel with the shortened sheet name
-    plant_responses_with_comparison.to_excel(writer, sheet_name=sheet_name, index=False)
\ No newline at end of file
+    if sort_by == 'value' and 'Shortfall Value' in plant_responses_with_comparison.columns:
+        plant_responses_with_comparison = plant_responses_with_comparison.sort_values(
+            'Shortfall Value', ascending=False, kind='stable'
+        )
+    
+    # Write to Excel with the shortened sheet name (the formatter inserts a 3-row title)
+    parts = split_frame(plant_responses_with_comparison, reserved_rows=3)
+    if len(parts) > 1:
+        logger.info(f"'{sheet_name}' exceeds Excel's row limit - splitting across {len(parts)} sheets")
+    return write_sheet_parts(writer, parts, sheet_name)
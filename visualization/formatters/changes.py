@@ -0,0 +1,49 @@
+from openpyxl.styles import PatternFill, Font
+from config import STATUS, CURRENT_DATETIME, CURRENT_USER
+
+
+def format_changes_sheet(wb, changes_df, sheet_name='Changes'):
+    """Format the run-over-run changes sheet.
+    
+    Args:
+        wb: Excel workbook object
+        changes_df (DataFrame): Changes written to this sheet
+        sheet_name (str, optional): Sheet name, for continuation sheets of a split changes list
+    """
+    sheet = wb[sheet_name]
+    
+    # Define column widths
+    sheet.column_dimensions['A'].width = 15  # Item Code
+    sheet.column_dimensions['B'].width = 24  # Change Type
+    
+    # Find column indices
+    current_status_col_idx = None
+    change_type_col_idx = None
+    
+    for idx, cell in enumerate(sheet[1]):
+        cell.font = Font(bold=True)
+        if cell.value == 'Status (Current)':
+            current_status_col_idx = idx + 1
+        elif cell.value == 'Change Type':
+            change_type_col_idx = idx + 1
+    
+    # Colour the current status and highlight new and removed items
+    for row in range(2, len(changes_df) + 2):
+        if current_status_col_idx:
+            cell = sheet.cell(row=row, column=current_status_col_idx)
+            if cell.value in STATUS:
+                cell.fill = PatternFill(start_color=STATUS[cell.value]['color'], 
+                                      end_color=STATUS[cell.value]['color'], 
+                                      fill_type="solid")
+        
+        if change_type_col_idx:
+            cell = sheet.cell(row=row, column=change_type_col_idx)
+            if cell.value in ('NEW', 'REMOVED'):
+                cell.font = Font(bold=True)
+    
+    # Add a header with explanation
+    sheet.insert_rows(1, 2)
+    sheet.cell(row=1, column=1).value = f"{sheet_name.upper()} SINCE PREVIOUS ANALYSIS"
+    sheet.cell(row=1, column=1).font = Font(size=14, bold=True)
+    sheet.cell(row=2, column=1).value = f"Generated: {CURRENT_DATETIME} | User: {CURRENT_USER} | New, removed and changed items compared with the previous run"
+    sheet.cell(row=2, column=1).font = Font(italic=True)
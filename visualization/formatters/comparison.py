@@ -1,17 +1,19 @@
 import logging
-from openpyxl.styles import PatternFill, Font, Alignment
-from config import STATUS, CURRENT_DATETIME, CURRENT_USER
+from openpyxl.styles import Font, Alignment
+from config import CURRENT_DATETIME, CURRENT_USER
+from visualization.formatters.status_fills import fill_status_column, fill_deviation_column, highlight_coverage
 
 logger = logging.getLogger(__name__)
 
-def format_comparison_sheet(wb, comparison_df):
+def format_comparison_sheet(wb, comparison_df, sheet_name='Comparison Analysis'):
     """Format the comparison analysis sheet.
     
     Args:
         wb: Excel workbook object
-        comparison_df (DataFrame): Comparison analysis data
+        comparison_df (DataFrame): Comparison analysis data written to this sheet
+        sheet_name (str, optional): Sheet name, for continuation sheets of a split comparison
     """
-    sheet = wb['Comparison Analysis']
+    sheet = wb[sheet_name]
     
     # Define column widths
     sheet.column_dimensions['A'].width = 15  # Item Code
@@ -48,108 +50,20 @@ def format_comparison_sheet(wb, comparison_df):
         if idx:
             sheet.cell(row=1, column=idx).font = Font(bold=True)
     
+    data_rows = range(2, len(comparison_df) + 2)
+    
     # Format status cells
     if status_col_idx:
-        for row in range(2, len(comparison_df) + 2):
-            cell = sheet.cell(row=row, column=status_col_idx)
-            
-            if cell.value == "HIGH_DEVIATION":
-                cell.fill = PatternFill(start_color=STATUS['HIGH_DEVIATION']['color'], 
-                                      end_color=STATUS['HIGH_DEVIATION']['color'], 
-                                      fill_type="solid")
-            elif cell.value == "MODERATE_DEVIATION":
-                cell.fill = PatternFill(start_color=STATUS['MODERATE_DEVIATION']['color'], 
-                                      end_color=STATUS['MODERATE_DEVIATION']['color'], 
-                                      fill_type="solid")
-            elif cell.value == "ACCEPTABLE":
-                cell.fill = PatternFill(start_color=STATUS['ACCEPTABLE']['color'], 
-                                      end_color=STATUS['ACCEPTABLE']['color'], 
-                                      fill_type="solid")
-            elif cell.value == "LOW_REQUEST":
-                cell.fill = PatternFill(start_color=STATUS['LOW_REQUEST']['color'], 
-                                      end_color=STATUS['LOW_REQUEST']['color'], 
-                                      fill_type="solid")
-            elif cell.value == "COVERED_BY_STOCK":
-                cell.fill = PatternFill(start_color=STATUS['COVERED_BY_STOCK']['color'], 
-                                      end_color=STATUS['COVERED_BY_STOCK']['color'], 
-                                      fill_type="solid")
-            elif cell.value == "COVERED_BY_ORDERS":
-                cell.fill = PatternFill(start_color=STATUS['COVERED_BY_ORDERS']['color'], 
-                                      end_color=STATUS['COVERED_BY_ORDERS']['color'], 
-                                      fill_type="solid")
+        fill_status_column(sheet, status_col_idx, data_rows)
     
-    # Format difference cells
-    if diff_col_idx:
-        for row in range(2, len(comparison_df) + 2):
-            cell = sheet.cell(row=row, column=diff_col_idx)
-            value = cell.value
-            
-            if value is not None:
-                if value > 3:
-                    cell.fill = PatternFill(start_color=STATUS['HIGH_DEVIATION']['color'], 
-                                          end_color=STATUS['HIGH_DEVIATION']['color'], 
-                                          fill_type="solid")
-                elif 1 <= value <= 3:
-                    cell.fill = PatternFill(start_color=STATUS['MODERATE_DEVIATION']['color'], 
-                                          end_color=STATUS['MODERATE_DEVIATION']['color'], 
-                                          fill_type="solid")
-                elif value == 0:
-                    cell.fill = PatternFill(start_color=STATUS['ACCEPTABLE']['color'], 
-                                          end_color=STATUS['ACCEPTABLE']['color'], 
-                                          fill_type="solid")
-                else:  # value < 0
-                    cell.fill = PatternFill(start_color=STATUS['LOW_REQUEST']['color'], 
-                                          end_color=STATUS['LOW_REQUEST']['color'], 
-                                          fill_type="solid")
-    
-    # Format net difference cells
-    if net_diff_col_idx:
-        for row in range(2, len(comparison_df) + 2):
-            cell = sheet.cell(row=row, column=net_diff_col_idx)
-            value = cell.value
-            
-            if value is not None:
-                if value > 3:
-                    cell.fill = PatternFill(start_color=STATUS['HIGH_DEVIATION']['color'], 
-                                          end_color=STATUS['HIGH_DEVIATION']['color'], 
-                                          fill_type="solid")
-                elif 1 <= value <= 3:
-                    cell.fill = PatternFill(start_color=STATUS['MODERATE_DEVIATION']['color'], 
-                                          end_color=STATUS['MODERATE_DEVIATION']['color'], 
-                                          fill_type="solid")
-                elif value == 0:
-                    cell.fill = PatternFill(start_color=STATUS['ACCEPTABLE']['color'], 
-                                          end_color=STATUS['ACCEPTABLE']['color'], 
-                                          fill_type="solid")
-                else:  # value < 0
-                    cell.fill = PatternFill(start_color=STATUS['LOW_REQUEST']['color'], 
-                                          end_color=STATUS['LOW_REQUEST']['color'], 
-                                          fill_type="solid")
+    # Format difference and net difference cells
+    for idx in [diff_col_idx, net_diff_col_idx]:
+        if idx:
+            fill_deviation_column(sheet, idx, data_rows)
     
     # Highlight stock and pending orders if they can help fulfill requirements
     if diff_col_idx and available_stock_col_idx and pending_orders_col_idx:
-        for row in range(2, len(comparison_df) + 2):
-            diff_cell = sheet.cell(row=row, column=diff_col_idx)
-            stock_cell = sheet.cell(row=row, column=available_stock_col_idx)
-            orders_cell = sheet.cell(row=row, column=pending_orders_col_idx)
-            
-            diff_value = diff_cell.value if diff_cell.value is not None else 0
-            stock_value = stock_cell.value if stock_cell.value is not None else 0
-            orders_value = orders_cell.value if orders_cell.value is not None else 0
-            
-            # If stock alone can cover the difference
-            if diff_value > 0 and stock_value >= diff_value:
-                stock_cell.fill = PatternFill(start_color=STATUS['COVERED_BY_STOCK']['color'], 
-                                            end_color=STATUS['COVERED_BY_STOCK']['color'], 
-                                            fill_type="solid")
-                stock_cell.font = Font(bold=True)
-            
-            # If stock + orders can cover the difference
-            elif diff_value > 0 and (stock_value + orders_value) >= diff_value:
-                orders_cell.fill = PatternFill(start_color=STATUS['COVERED_BY_ORDERS']['color'], 
-                                             end_color=STATUS['COVERED_BY_ORDERS']['color'], 
-                                             fill_type="solid")
-                orders_cell.font = Font(bold=True)
+        highlight_coverage(sheet, diff_col_idx, available_stock_col_idx, pending_orders_col_idx, data_rows)
     
     # Highlight adjusted forecasts
     if annual_forecast_col_idx and adjusted_forecast_col_idx:
@@ -163,7 +77,7 @@ def format_comparison_sheet(wb, comparison_df):
     
     # Add a header with explanation
     sheet.insert_rows(1, 2)
-    sheet.cell(row=1, column=1).value = "COMPARISON ANALYSIS - Including Stock & Order Consideration"
+    sheet.cell(row=1, column=1).value = f"{sheet_name.upper()} - Including Stock & Order Consideration"
     sheet.cell(row=1, column=1).font = Font(size=14, bold=True)
     sheet.cell(row=2, column=1).value = f"Generated: {CURRENT_DATETIME} | User: {CURRENT_USER} | Note: Analysis considers both available stock and pending orders"
     sheet.cell(row=2, column=1).font = Font(italic=True)
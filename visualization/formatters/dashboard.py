@@ -1,8 +1,15 @@
 import pandas as pd
+from openpyxl.chart import BarChart, PieChart, Reference
+from openpyxl.chart.label import DataLabelList
+from openpyxl.chart.series import DataPoint
 from openpyxl.styles import PatternFill, Font, Alignment
-from config import STATUS, CURRENT_DATETIME, CURRENT_USER
+from config import STATUS, CURRENT_DATETIME, CURRENT_USER, CHRONIC_STATUS, CHRONIC_MIN_CYCLES, RULE_THRESHOLDS
+from visualization.formatters.instructions import add_sheet_links
+from processing.cube import query_cube
+from processing.status import display_statuses
 
-def create_dashboard(wb, comparison_df, summary_df, plant_df, unique_plants):
+def create_dashboard(wb, comparison_df, summary_df, plant_df, unique_plants, split_sheets=None,
+                     chronic_items=None, sort_by='units', cube=None):
     """Create and format the dashboard sheet.
     
     Args:
@@ -11,8 +18,16 @@ def create_dashboard(wb, comparison_df, summary_df, plant_df, unique_plants):
         summary_df (DataFrame): Summary statistics
         plant_df (DataFrame): Plant summary data
         unique_plants (list): List of unique plant names
+        split_sheets (dict, optional): Sheets split across continuation sheets, mapped to their part names
+        chronic_items (DataFrame, optional): Items holding a deviation status for several cycles in a row
+        sort_by (str): Rank top lists by 'units' (Net Difference) or 'value' (Shortfall Value)
+        cube (DataFrame, optional): Aggregate cube; status counts are read from it instead of the comparison
     """
     
+    # Shortfall value is only there when prices or criticality were supplied
+    has_value = 'Shortfall Value' in comparison_df.columns
+    rank_col = 'Shortfall Value' if sort_by == 'value' and has_value else 'Net Difference'
+    
     # Create dashboard sheet if it doesn't exist
     if 'Dashboard' in wb.sheetnames:
         dashboard = wb['Dashboard']
@@ -37,15 +52,19 @@ def create_dashboard(wb, comparison_df, summary_df, plant_df, unique_plants):
     dashboard['A4'].font = Font(italic=True, color="0000FF")
     
     # ----- HIGH DEVIATION SECTION -----
-    dashboard['A5'] = "⚠️ HIGH DEVIATION ITEMS (Net Difference > 3 after stock & orders)"
+    dashboard['A5'] = f"⚠️ HIGH DEVIATION ITEMS (Net Difference > {RULE_THRESHOLDS['HIGH_ABOVE']} after stock & orders)"
     dashboard['A5'].font = Font(bold=True, size=12, color="FF0000")
     
     # Get high deviation items that cannot be covered by stock or orders
-    high_deviation_items = comparison_df[comparison_df['Status'] == 'HIGH_DEVIATION'].sort_values('Net Difference', ascending=False)
+    high_deviation_items = comparison_df[comparison_df['Status'] == 'HIGH_DEVIATION'].sort_values(rank_col, ascending=False)
     
     # Headers
     headers = ['Item Code', 'Description', 'Annual Forecast', 'Total Plant Requests', 
                'Available Stock', 'Pending Orders', 'Net Difference', 'Status', 'Recommendation']
+    value_headers = ['Shortfall Value', 'Value Class'] if has_value else []
+    for col, header in enumerate(value_headers):
+        dashboard.cell(row=6, column=len(headers)+col+1).value = header
+        dashboard.cell(row=6, column=len(headers)+col+1).font = Font(bold=True)
     for col, header in enumerate(headers):
         dashboard.cell(row=6, column=col+1).value = header
         dashboard.cell(row=6, column=col+1).font = Font(bold=True)
@@ -64,6 +83,8 @@ def create_dashboard(wb, comparison_df, summary_df, plant_df, unique_plants):
             dashboard.cell(row=7+i, column=7).value = row_data['Net Difference']
             dashboard.cell(row=7+i, column=8).value = row_data['Status']
             dashboard.cell(row=7+i, column=9).value = row_data['Recommendation']
+            for col, header in enumerate(value_headers):
+                dashboard.cell(row=7+i, column=len(headers)+col+1).value = row_data[header]
             
             # Highlight the difference
             dashboard.cell(row=7+i, column=7).fill = PatternFill(start_color=STATUS['HIGH_DEVIATION']['color'], 
@@ -93,5 +114,245 @@ def create_dashboard(wb, comparison_df, summary_df, plant_df, unique_plants):
         dashboard.cell(row=covered_row+1, column=col+1).value = header
         dashboard.cell(row=covered_row+1, column=col+1).font = Font(bold=True)
     
-    # Create rest of the dashboard with status breakdowns, summaries, etc.
-    # (Implementation abbreviated for brevity - see full function in original code)
\ No newline at end of file
+    # Data rows
+    if not covered_items.empty:
+        display_rows = min(10, len(covered_items))  # Show up to 10 items
+        for i in range(display_rows):
+            row_data = covered_items.iloc[i]
+            for col, header in enumerate(headers):
+                dashboard.cell(row=covered_row+2+i, column=col+1).value = row_data[header]
+            
+            # Highlight the status
+            status_color = STATUS[row_data['Status']]['color']
+            dashboard.cell(row=covered_row+2+i, column=8).fill = PatternFill(start_color=status_color, 
+                                                                        end_color=status_color, 
+                                                                        fill_type="solid")
+        
+        if len(covered_items) > 10:
+            dashboard.cell(row=covered_row+12, column=1).value = f"... and {len(covered_items) - 10} more covered items"
+    else:
+        dashboard.cell(row=covered_row+2, column=1).value = "No items covered by stock or pending orders"
+    
+    next_row = covered_row + 13
+    
+    # ----- CHARTS SECTION -----
+    next_row = add_dashboard_charts(dashboard, comparison_df, unique_plants, next_row, rank_col, cube)
+    
+    # ----- CHRONIC DEVIATION SECTION -----
+    if chronic_items is not None:
+        dashboard.cell(row=next_row, column=1).value = f"🔁 CHRONIC DEVIATION ({CHRONIC_STATUS} for {CHRONIC_MIN_CYCLES}+ cycles in a row)"
+        dashboard.cell(row=next_row, column=1).font = Font(bold=True, size=12, color="FF0000")
+        
+        headers = ['Item Code', 'Description', 'Cycles in a Row', 'Net Difference']
+        for col, header in enumerate(headers):
+            dashboard.cell(row=next_row+1, column=col+1).value = header
+            dashboard.cell(row=next_row+1, column=col+1).font = Font(bold=True)
+        
+        if not chronic_items.empty:
+            # Item codes in the history are text, so look descriptions up by text
+            descriptions = dict(zip(comparison_df['Item Code'].astype(str), comparison_df['Description'])) \
+                if 'Description' in comparison_df.columns else {}
+            display_rows = min(10, len(chronic_items))  # Show up to 10 items
+            for i in range(display_rows):
+                row_data = chronic_items.iloc[i]
+                dashboard.cell(row=next_row+2+i, column=1).value = row_data['Item Code']
+                dashboard.cell(row=next_row+2+i, column=2).value = descriptions.get(row_data['Item Code'])
+                dashboard.cell(row=next_row+2+i, column=3).value = int(row_data['Cycles in a Row'])
+                dashboard.cell(row=next_row+2+i, column=4).value = int(row_data['Net Difference'])
+                dashboard.cell(row=next_row+2+i, column=3).fill = PatternFill(start_color=STATUS[CHRONIC_STATUS]['color'], 
+                                                                          end_color=STATUS[CHRONIC_STATUS]['color'], 
+                                                                          fill_type="solid")
+            next_row += 2 + display_rows
+            
+            if len(chronic_items) > 10:
+                dashboard.cell(row=next_row, column=1).value = f"... and {len(chronic_items) - 10} more chronic items"
+                next_row += 1
+        else:
+            dashboard.cell(row=next_row+2, column=1).value = "No chronic deviations found"
+            next_row += 3
+        
+        next_row += 1
+    
+    # ----- MULTI-PART SHEETS SECTION -----
+    if split_sheets:
+        dashboard.cell(row=next_row, column=1).value = "📄 SHEETS SPLIT ACROSS PARTS (Excel row limit exceeded)"
+        dashboard.cell(row=next_row, column=1).font = Font(bold=True, size=12)
+        next_row = add_sheet_links(dashboard, split_sheets, start_row=next_row + 1) + 1
+
+
+def build_chart_data(comparison_df, unique_plants, top_n=10, rank_col='Net Difference', cube=None):
+    """Aggregate the comparison into the small tables the dashboard charts plot.
+    
+    Args:
+        comparison_df (DataFrame): Comparison analysis data
+        unique_plants (list): List of unique plant names
+        top_n (int): Number of items in the top shortfalls table
+        rank_col (str): Column the top shortfalls are ranked by ('Net Difference' or 'Shortfall Value')
+        cube (DataFrame, optional): Aggregate cube to read the status counts from
+    
+    Returns:
+        dict: DataFrames keyed 'status', 'status_by_plant', 'top_shortfalls' and 'coverage'
+    """
+    statuses = display_statuses('Below Reorder Point' in comparison_df.columns)
+    if cube is not None:
+        status_counts = query_cube(cube, by=['Status']).set_index('Status')['Items']
+    else:
+        status_counts = comparison_df['Status'].value_counts()
+    status_table = pd.DataFrame({
+        'Status': statuses,
+        'Items': [int(status_counts.get(status, 0)) for status in statuses]
+    })
+    
+    # Items each plant requested, split by status
+    by_plant = {}
+    if cube is not None:
+        plant_counts = query_cube(cube, by=['Plant', 'Status']).set_index(['Plant', 'Status'])['Items']
+    for plant in unique_plants:
+        plant_col = f"{plant} Requests"
+        if cube is not None:
+            by_plant[plant] = [int(plant_counts.get((plant, status), 0)) for status in statuses]
+        elif plant_col in comparison_df.columns:
+            counts = comparison_df.loc[comparison_df[plant_col] > 0, 'Status'].value_counts()
+            by_plant[plant] = [int(counts.get(status, 0)) for status in statuses]
+    status_by_plant = pd.DataFrame.from_dict(by_plant, orient='index', columns=statuses)
+    status_by_plant.index.name = 'Plant'
+    status_by_plant = status_by_plant.reset_index()
+    
+    shortfalls = comparison_df[comparison_df[rank_col] > 0].nlargest(top_n, rank_col)
+    top_shortfalls = pd.DataFrame({
+        'Item Code': shortfalls['Item Code'].astype(str).to_numpy(),
+        rank_col: shortfalls[rank_col].to_numpy()
+    })
+    
+    # Units requested above forecast, split into what stock, then pending orders, cover
+    excess = comparison_df['Difference'].clip(lower=0)
+    from_stock = excess.clip(upper=comparison_df['Available Stock'].clip(lower=0))
+    from_orders = (excess - from_stock).clip(upper=comparison_df['Pending Orders'].clip(lower=0))
+    coverage = pd.DataFrame({
+        'Coverage': ['Covered by Stock', 'Covered by Orders', 'Not Covered'],
+        'Units': [int(from_stock.sum()), int(from_orders.sum()), int((excess - from_stock - from_orders).sum())]
+    })
+    
+    return {
+        'status': status_table,
+        'status_by_plant': status_by_plant,
+        'top_shortfalls': top_shortfalls,
+        'coverage': coverage,
+    }
+
+
+def add_dashboard_charts(dashboard, comparison_df, unique_plants, start_row, rank_col='Net Difference', cube=None):
+    """Add native Excel charts to the dashboard, each over a small aggregate block.
+    
+    The blocks are written once to the right of the charts, so the charts never
+    reference the (possibly million-row) Comparison Analysis sheet.
+    
+    Args:
+        dashboard: Dashboard worksheet
+        comparison_df (DataFrame): Comparison analysis data
+        unique_plants (list): List of unique plant names
+        start_row (int): First free row on the dashboard
+        rank_col (str): Column the top shortfalls are ranked by
+        cube (DataFrame, optional): Aggregate cube to read the status counts from
+    
+    Returns:
+        int: Next free row below the charts
+    """
+    dashboard.cell(row=start_row, column=1).value = "📊 CHARTS"
+    dashboard.cell(row=start_row, column=1).font = Font(bold=True, size=12)
+    
+    chart_data = build_chart_data(comparison_df, unique_plants, rank_col=rank_col, cube=cube)
+    chart_row = start_row + 1
+    data_col = 20  # Column T, clear of the charts
+    data_row = start_row
+    
+    dashboard.cell(row=data_row, column=data_col).value = "Chart Data"
+    dashboard.cell(row=data_row, column=data_col).font = Font(bold=True)
+    data_row += 1
+    
+    # Status distribution
+    block = chart_data['status']
+    first, last = _write_block(dashboard, block, data_row, data_col)
+    chart = PieChart()
+    chart.title = "Status Distribution"
+    chart.add_data(Reference(dashboard, min_col=data_col+1, min_row=first-1, max_row=last), titles_from_data=True)
+    chart.set_categories(Reference(dashboard, min_col=data_col, min_row=first, max_row=last))
+    for i, status in enumerate(block['Status']):
+        point = DataPoint(idx=i)
+        point.graphicalProperties.solidFill = STATUS[status]['color']
+        chart.series[0].dPt.append(point)
+    chart.dataLabels = DataLabelList()
+    chart.dataLabels.showPercent = True
+    _place_chart(dashboard, chart, chart_row, 1)
+    data_row = last + 2
+    
+    # Status by plant
+    block = chart_data['status_by_plant']
+    if not block.empty:
+        first, last = _write_block(dashboard, block, data_row, data_col)
+        chart = BarChart()
+        chart.type = 'col'
+        chart.grouping = 'stacked'
+        chart.overlap = 100
+        chart.title = "Requested Items by Plant and Status"
+        chart.y_axis.title = "Items"
+        chart.add_data(Reference(dashboard, min_col=data_col+1, max_col=data_col+len(block.columns)-1,
+                                 min_row=first-1, max_row=last), titles_from_data=True)
+        chart.set_categories(Reference(dashboard, min_col=data_col, min_row=first, max_row=last))
+        for series, status in zip(chart.series, block.columns[1:]):
+            series.graphicalProperties.solidFill = STATUS[status]['color']
+        _place_chart(dashboard, chart, chart_row, 10)
+        data_row = last + 2
+    
+    # Top shortfalls
+    chart_row += 16
+    block = chart_data['top_shortfalls']
+    if not block.empty:
+        first, last = _write_block(dashboard, block, data_row, data_col)
+        chart = BarChart()
+        chart.type = 'bar'
+        chart.title = f"Top {len(block)} Shortfalls ({rank_col})"
+        chart.legend = None
+        chart.add_data(Reference(dashboard, min_col=data_col+1, min_row=first-1, max_row=last), titles_from_data=True)
+        chart.set_categories(Reference(dashboard, min_col=data_col, min_row=first, max_row=last))
+        chart.series[0].graphicalProperties.solidFill = STATUS['HIGH_DEVIATION']['color']
+        chart.x_axis.scaling.orientation = 'maxMin'  # Largest shortfall on top
+        _place_chart(dashboard, chart, chart_row, 1)
+        data_row = last + 2
+    
+    # Stock vs pending order coverage
+    block = chart_data['coverage']
+    first, last = _write_block(dashboard, block, data_row, data_col)
+    chart = BarChart()
+    chart.type = 'col'
+    chart.title = "Requests Above Forecast: Stock vs Pending Order Coverage"
+    chart.y_axis.title = "Units"
+    chart.legend = None
+    chart.add_data(Reference(dashboard, min_col=data_col+1, min_row=first-1, max_row=last), titles_from_data=True)
+    chart.set_categories(Reference(dashboard, min_col=data_col, min_row=first, max_row=last))
+    for i, color in enumerate([STATUS['COVERED_BY_STOCK']['color'], STATUS['COVERED_BY_ORDERS']['color'],
+                               STATUS['HIGH_DEVIATION']['color']]):
+        point = DataPoint(idx=i)
+        point.graphicalProperties.solidFill = color
+        chart.series[0].dPt.append(point)
+    _place_chart(dashboard, chart, chart_row, 10)
+    
+    return chart_row + 17
+
+
+def _write_block(sheet, block, start_row, start_col):
+    """Write a small table with a bold header row; returns its first and last data rows."""
+    for col, header in enumerate(block.columns):
+        sheet.cell(row=start_row, column=start_col+col).value = header
+        sheet.cell(row=start_row, column=start_col+col).font = Font(bold=True)
+    for i, values in enumerate(block.itertuples(index=False)):
+        for col, value in enumerate(values):
+            sheet.cell(row=start_row+1+i, column=start_col+col).value = value.item() if hasattr(value, 'item') else value
+    return start_row + 1, start_row + len(block)
+
+
+def _place_chart(sheet, chart, row, column):
+    """Anchor a chart of the dashboard's standard size at a cell."""
+    chart.width = 16
+    chart.height = 7.5
+    sheet.add_chart(chart, sheet.cell(row=row, column=column).coordinate)
@@ -0,0 +1,50 @@
+from openpyxl.styles import PatternFill, Font
+from config import STATUS, CURRENT_DATETIME, CURRENT_USER
+
+# Fill for failed checks by severity
+SEVERITY_COLORS = {
+    'ERROR': STATUS['HIGH_DEVIATION']['color'],
+    'WARNING': STATUS['MODERATE_DEVIATION']['color'],
+    'INFO': STATUS['LOW_REQUEST']['color'],
+}
+
+
+def create_data_quality_sheet(wb, report):
+    """Create and format the data quality sheet.
+    
+    Args:
+        wb: Excel workbook object
+        report (DataFrame): Data quality checks from validate_inputs
+    """
+    sheet = wb.create_sheet('Data Quality')
+    
+    sheet['A1'] = "DATA QUALITY REPORT"
+    sheet['A1'].font = Font(size=14, bold=True)
+    sheet['A2'] = f"Generated: {CURRENT_DATETIME} | User: {CURRENT_USER} | Counts are input rows affected by each check"
+    sheet['A2'].font = Font(italic=True)
+    
+    headers = list(report.columns) + ['Result']
+    for col, header in enumerate(headers):
+        sheet.cell(row=4, column=col+1).value = header
+        sheet.cell(row=4, column=col+1).font = Font(bold=True)
+    
+    for i, row_data in enumerate(report.itertuples(index=False)):
+        row = 5 + i
+        for col, value in enumerate(row_data):
+            sheet.cell(row=row, column=col+1).value = value
+        
+        result_cell = sheet.cell(row=row, column=len(headers))
+        if row_data.Count > 0:
+            color = SEVERITY_COLORS.get(row_data.Severity, STATUS['MODERATE_DEVIATION']['color'])
+            result_cell.value = "CHECK" if row_data.Severity == 'INFO' else "FAIL"
+        else:
+            color = STATUS['ACCEPTABLE']['color']
+            result_cell.value = "PASS"
+        result_cell.fill = PatternFill(start_color=color, end_color=color, fill_type="solid")
+    
+    # Set column widths
+    sheet.column_dimensions['A'].width = 12
+    sheet.column_dimensions['B'].width = 55
+    sheet.column_dimensions['C'].width = 10
+    sheet.column_dimensions['D'].width = 10
+    sheet.column_dimensions['E'].width = 50
@@ -1,11 +1,14 @@
 from openpyxl.styles import Font
-from config import CURRENT_DATETIME, CURRENT_USER
+from openpyxl.worksheet.hyperlink import Hyperlink
+from config import CURRENT_DATETIME, CURRENT_USER, RULE_THRESHOLDS
 
-def create_instructions_sheet(wb):
+def create_instructions_sheet(wb, split_sheets=None, reorder_policy=False):
     """Create and format the instructions sheet.
     
     Args:
         wb: Excel workbook object
+        split_sheets (dict, optional): Sheets split across continuation sheets, mapped to their part names
+        reorder_policy (bool): Describe the BELOW REORDER POINT status and its recommendation
     """
     
     instructions = wb.create_sheet('Instructions')
@@ -26,6 +29,7 @@ def create_instructions_sheet(wb):
     instructions['A12'] = "6. Dashboard: Visual representation of key insights"
     instructions['A13'] = "7. Plant_[Name]: Individual plant sheets for communication with each plant"
     instructions['A14'] = "8. Instructions: This guide"
+    instructions['A15'] = "9. Changes / Data Quality: Changed items since the previous analysis (when one exists) and input data checks"
     
     instructions['A16'] = "INVENTORY CONSIDERATION:"
     instructions['A17'] = "The analysis now considers:"
@@ -37,11 +41,14 @@ def create_instructions_sheet(wb):
     
     instructions['A24'] = "ENHANCED DEVIATION CLASSIFICATIONS:"
     instructions['A25'] = "- ACCEPTABLE (Green): Total Plant Requests exactly match Annual Forecast (difference = 0)"
-    instructions['A26'] = "- MODERATE DEVIATION (Yellow): Total Plant Requests are 1 to 3 units higher than Annual Forecast (difference = 1 to 3)"
-    instructions['A27'] = "- HIGH DEVIATION (Red): Total Plant Requests are more than 3 units higher than Annual Forecast (difference > 3)"
+    moderate, high = RULE_THRESHOLDS['MODERATE_MIN'], RULE_THRESHOLDS['HIGH_ABOVE']
+    instructions['A26'] = f"- MODERATE DEVIATION (Yellow): Total Plant Requests are {moderate} to {high} units higher than Annual Forecast (difference = {moderate} to {high})"
+    instructions['A27'] = f"- HIGH DEVIATION (Red): Total Plant Requests are more than {high} units higher than Annual Forecast (difference > {high})"
     instructions['A28'] = "- LOW REQUEST (Blue): Total Plant Requests are lower than Annual Forecast (difference < 0)"
     instructions['A29'] = "- COVERED BY STOCK (Purple): Deviation can be covered by existing stock"
     instructions['A30'] = "- COVERED BY ORDERS (Pink): Deviation can be covered by stock and pending orders combined"
+    if reorder_policy:
+        instructions['A31'] = "- BELOW REORDER POINT (Orange): No deviation, but stock plus pending orders are below lead-time demand plus safety stock"
     
     # Add note about forecast adjustment
     instructions['A32'] = "IMPORTANT NOTE: Annual Forecast values less than 1 are adjusted to 0 for analysis purposes."
@@ -50,10 +57,12 @@ def create_instructions_sheet(wb):
     instructions['A34'] = "ENHANCED RECOMMENDATIONS:"
     instructions['A35'] = "- Use available stock to fulfill requests: When deviation can be covered by current stock"
     instructions['A36'] = "- Use stock and pending orders to fulfill requests: When deviation can be covered by stock and pending orders"
-    instructions['A37'] = "- Significant increase needed after using stock & orders: When net difference after stock and orders is > 3"
-    instructions['A38'] = "- Moderate increase needed after using stock & orders: When net difference after stock and orders is 1-3"
+    instructions['A37'] = f"- Significant increase needed after using stock & orders: When net difference after stock and orders is > {high}"
+    instructions['A38'] = f"- Moderate increase needed after using stock & orders: When net difference after stock and orders is {moderate}-{high}"
     instructions['A39'] = "- Consider reducing forecast: When Total Plant Requests are lower than Annual Forecast"
     instructions['A40'] = "- Current forecast appears adequate: When difference is exactly 0 (perfect match)"
+    if reorder_policy:
+        instructions['A41'] = "- Replenish - stock and pending orders are below the reorder point: When the item is BELOW REORDER POINT"
     
     instructions['A42'] = "PLANT COMMUNICATION SHEETS:"
     instructions['A43'] = "Each plant has its own dedicated sheet (Plant_[Name]) containing:"
@@ -77,5 +86,38 @@ def create_instructions_sheet(wb):
     for row in [3, 6, 16, 24, 34, 42, 49]:
         instructions.cell(row=row, column=1).font = Font(bold=True)
     
+    # List the parts of any sheet that exceeded Excel's row limit
+    if split_sheets:
+        instructions['A60'] = "MULTI-PART SHEETS:"
+        instructions['A60'].font = Font(bold=True)
+        instructions['A61'] = "These sheets exceeded Excel's row limit and continue on numbered sheets (click to open):"
+        add_sheet_links(instructions, split_sheets, start_row=62)
+    
     # Set column width
-    instructions.column_dimensions['A'].width = 100
\ No newline at end of file
+    instructions.column_dimensions['A'].width = 100
+
+
+def add_sheet_links(sheet, split_sheets, start_row, column=1):
+    """Write one hyperlink per sheet part, grouped by the original sheet.
+    
+    Args:
+        sheet: Worksheet to write the links to
+        split_sheets (dict): Original sheet names mapped to their part names
+        start_row (int): First row to write
+        column (int): Column to write the links in
+        
+    Returns:
+        int: Next free row
+    """
+    row = start_row
+    for sheet_name, parts in split_sheets.items():
+        sheet.cell(row=row, column=column).value = f"{sheet_name} ({len(parts)} parts):"
+        row += 1
+        for part in parts:
+            cell = sheet.cell(row=row, column=column)
+            cell.value = f"- {part}"
+            cell.hyperlink = Hyperlink(ref=cell.coordinate, location=f"'{part}'!A1")
+            cell.font = Font(color="0563C1", underline="single")
+            row += 1
+    
+    return row
@@ -1,6 +1,7 @@
 import logging
-from openpyxl.styles import PatternFill, Font, Alignment
-from config import STATUS, CURRENT_DATETIME, CURRENT_USER
+from openpyxl.styles import Font, Alignment
+from config import CURRENT_DATETIME, CURRENT_USER
+from visualization.formatters.status_fills import fill_status_column, fill_deviation_column, highlight_coverage
 
 logger = logging.getLogger(__name__)
 
@@ -49,84 +50,19 @@ def format_plant_sheet(wb, plant, sheet_name=None):
     for i, cell in enumerate(sheet[1]):
         sheet.cell(row=1, column=i+1).font = Font(bold=True)
     
+    data_rows = range(2, sheet.max_row + 1)
+    
     # Format status cells
     if plant_status_col_idx:
-        for row in range(2, sheet.max_row + 1):
-            cell = sheet.cell(row=row, column=plant_status_col_idx)
-            
-            if cell.value == "HIGH_DEVIATION":
-                cell.fill = PatternFill(start_color=STATUS['HIGH_DEVIATION']['color'], 
-                                      end_color=STATUS['HIGH_DEVIATION']['color'], 
-                                      fill_type="solid")
-            elif cell.value == "MODERATE_DEVIATION":
-                cell.fill = PatternFill(start_color=STATUS['MODERATE_DEVIATION']['color'], 
-                                      end_color=STATUS['MODERATE_DEVIATION']['color'], 
-                                      fill_type="solid")
-            elif cell.value == "ACCEPTABLE":
-                cell.fill = PatternFill(start_color=STATUS['ACCEPTABLE']['color'], 
-                                      end_color=STATUS['ACCEPTABLE']['color'], 
-                                      fill_type="solid")
-            elif cell.value == "LOW_REQUEST":
-                cell.fill = PatternFill(start_color=STATUS['LOW_REQUEST']['color'], 
-                                      end_color=STATUS['LOW_REQUEST']['color'], 
-                                      fill_type="solid")
-            elif cell.value == "COVERED_BY_STOCK":
-                cell.fill = PatternFill(start_color=STATUS['COVERED_BY_STOCK']['color'], 
-                                      end_color=STATUS['COVERED_BY_STOCK']['color'], 
-                                      fill_type="solid")
-            elif cell.value == "COVERED_BY_ORDERS":
-                cell.fill = PatternFill(start_color=STATUS['COVERED_BY_ORDERS']['color'], 
-                                      end_color=STATUS['COVERED_BY_ORDERS']['color'], 
-                                      fill_type="solid")
+        fill_status_column(sheet, plant_status_col_idx, data_rows)
     
     # Format difference cells
     if plant_diff_col_idx:
-        for row in range(2, sheet.max_row + 1):
-            cell = sheet.cell(row=row, column=plant_diff_col_idx)
-            value = cell.value
-            
-            if value is not None:
-                if value > 3:
-                    cell.fill = PatternFill(start_color=STATUS['HIGH_DEVIATION']['color'], 
-                                          end_color=STATUS['HIGH_DEVIATION']['color'], 
-                                          fill_type="solid")
-                elif 1 <= value <= 3:
-                    cell.fill = PatternFill(start_color=STATUS['MODERATE_DEVIATION']['color'], 
-                                          end_color=STATUS['MODERATE_DEVIATION']['color'], 
-                                          fill_type="solid")
-                elif value == 0:
-                    cell.fill = PatternFill(start_color=STATUS['ACCEPTABLE']['color'], 
-                                          end_color=STATUS['ACCEPTABLE']['color'], 
-                                          fill_type="solid")
-                else:  # value < 0
-                    cell.fill = PatternFill(start_color=STATUS['LOW_REQUEST']['color'], 
-                                          end_color=STATUS['LOW_REQUEST']['color'], 
-                                          fill_type="solid")
+        fill_deviation_column(sheet, plant_diff_col_idx, data_rows)
     
     # Highlight stock and pending orders if they can help fulfill requirements
     if plant_diff_col_idx and available_stock_col_idx and pending_orders_col_idx:
-        for row in range(2, sheet.max_row + 1):
-            diff_cell = sheet.cell(row=row, column=plant_diff_col_idx)
-            stock_cell = sheet.cell(row=row, column=available_stock_col_idx)
-            orders_cell = sheet.cell(row=row, column=pending_orders_col_idx)
-            
-            diff_value = diff_cell.value if diff_cell.value is not None else 0
-            stock_value = stock_cell.value if stock_cell.value is not None else 0
-            orders_value = orders_cell.value if orders_cell.value is not None else 0
-            
-            # If stock alone can cover the difference
-            if diff_value > 0 and stock_value >= diff_value:
-                stock_cell.fill = PatternFill(start_color=STATUS['COVERED_BY_STOCK']['color'], 
-                                            end_color=STATUS['COVERED_BY_STOCK']['color'], 
-                                            fill_type="solid")
-                stock_cell.font = Font(bold=True)
-            
-            # If stock + orders can cover the difference
-            elif diff_value > 0 and (stock_value + orders_value) >= diff_value:
-                orders_cell.fill = PatternFill(start_color=STATUS['COVERED_BY_ORDERS']['color'], 
-                                             end_color=STATUS['COVERED_BY_ORDERS']['color'], 
-                                             fill_type="solid")
-                orders_cell.font = Font(bold=True)
+        highlight_coverage(sheet, plant_diff_col_idx, available_stock_col_idx, pending_orders_col_idx, data_rows)
     
     # Add a title at the top
     sheet.insert_rows(1, 3)
@@ -0,0 +1,68 @@
+from openpyxl.styles import PatternFill, Font
+from config import STATUS, CURRENT_DATETIME, CURRENT_USER, CUBE_MASTER_DIMENSIONS
+from processing.cube import query_cube, get_dimensions, MEASURES
+from processing.status import display_statuses
+
+
+def create_rollups_sheet(wb, cube, reorder_policy=False):
+    """Create the Roll-ups sheet from the aggregate cube.
+    
+    One Items-by-Status table per dimension (with its requested quantity and
+    net shortfall), followed by the full cube for ad-hoc pivoting.
+    
+    Args:
+        wb: Excel workbook object
+        cube (DataFrame): Output of build_cube
+        reorder_policy (bool): Include the BELOW_REORDER_POINT column
+    """
+    sheet = wb.create_sheet('Roll-ups')
+    
+    sheet['A1'] = "ROLL-UPS BY CLASSIFICATION, PROJECT AND PLANT"
+    sheet['A1'].font = Font(size=14, bold=True)
+    sheet['A2'] = f"Generated: {CURRENT_DATETIME} | User: {CURRENT_USER} | Items by status; Net Shortfall is split across plants by requested quantity"
+    sheet['A2'].font = Font(italic=True)
+    
+    statuses = display_statuses(reorder_policy)
+    next_row = 4
+    for dimension in list(CUBE_MASTER_DIMENSIONS) + ['Plant']:
+        items = query_cube(cube, by=[dimension, 'Status'])
+        totals = query_cube(cube, by=[dimension])
+        pivot = items.pivot_table(index=dimension, columns='Status', values='Items', aggfunc='sum', observed=True)
+        
+        sheet.cell(row=next_row, column=1).value = f"BY {dimension.upper()}"
+        sheet.cell(row=next_row, column=1).font = Font(size=12, bold=True)
+        
+        headers = [dimension] + statuses + MEASURES
+        for col, header in enumerate(headers):
+            cell = sheet.cell(row=next_row + 1, column=col + 1)
+            cell.value = header
+            cell.font = Font(bold=True)
+            if header in STATUS:
+                color = STATUS[header]['color']
+                cell.fill = PatternFill(start_color=color, end_color=color, fill_type="solid")
+        
+        pivot = pivot.reindex(index=totals[dimension], columns=statuses).fillna(0)
+        for i, label in enumerate(totals[dimension]):
+            row = next_row + 2 + i
+            values = [str(label)] + [int(count) for count in pivot.loc[label]] + totals[MEASURES].astype(object).iloc[i].tolist()
+            for col, value in enumerate(values):
+                sheet.cell(row=row, column=col + 1).value = value
+        
+        next_row += len(totals) + 4
+    
+    # Full cube for pivoting
+    sheet.cell(row=next_row, column=1).value = "CUBE (plant rows and '(All Plants)' rows - filter Plant before summing)"
+    sheet.cell(row=next_row, column=1).font = Font(size=12, bold=True)
+    columns = get_dimensions() + MEASURES
+    for col, header in enumerate(columns):
+        sheet.cell(row=next_row + 1, column=col + 1).value = header
+        sheet.cell(row=next_row + 1, column=col + 1).font = Font(bold=True)
+    cells = cube[columns].astype({dimension: str for dimension in get_dimensions()})
+    for i, row_data in enumerate(cells.itertuples(index=False)):
+        for col, value in enumerate(row_data):
+            sheet.cell(row=next_row + 2 + i, column=col + 1).value = value
+    
+    # Set column widths
+    sheet.column_dimensions['A'].width = 28
+    for col in 'BCDEFGHIJK':
+        sheet.column_dimensions[col].width = 20
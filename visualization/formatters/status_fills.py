@@ -0,0 +1,82 @@
+import numpy as np
+from openpyxl.styles import PatternFill, Font
+from config import STATUS
+from processing.status import STATUS_NAMES, classify_codes, classify_deviation
+
+
+def status_fill(status):
+    """Solid fill in the configured color of a status."""
+    color = STATUS[status]['color']
+    return PatternFill(start_color=color, end_color=color, fill_type="solid")
+
+
+def _column_values(sheet, column, rows):
+    """Numeric values of a column over the given rows (NaN for empty cells)."""
+    return np.array([
+        np.nan if sheet.cell(row=row, column=column).value is None else sheet.cell(row=row, column=column).value
+        for row in rows
+    ], dtype=float)
+
+
+def fill_status_column(sheet, column, rows):
+    """Color status cells with their status color.
+    
+    Args:
+        sheet: Worksheet
+        column (int): Status column index
+        rows (range): Data rows
+    """
+    fills = {status: status_fill(status) for status in STATUS}
+    for row in rows:
+        cell = sheet.cell(row=row, column=column)
+        if cell.value in fills:
+            cell.fill = fills[cell.value]
+
+
+def fill_deviation_column(sheet, column, rows):
+    """Color difference cells by the status rules that depend on Net Difference alone.
+    
+    Args:
+        sheet: Worksheet
+        column (int): Difference or Net Difference column index
+        rows (range): Data rows
+    """
+    values = _column_values(sheet, column, rows)
+    fills = {status: status_fill(status) for status in STATUS}
+    for row, value, status in zip(rows, values, classify_deviation(values)):
+        if not np.isnan(value):
+            sheet.cell(row=row, column=column).fill = fills[status]
+
+
+def highlight_coverage(sheet, diff_column, stock_column, orders_column, rows):
+    """Highlight stock or pending orders where the status rules find the deviation covered.
+    
+    Args:
+        sheet: Worksheet
+        diff_column (int): Difference column index
+        stock_column (int): Available Stock column index
+        orders_column (int): Pending Orders column index
+        rows (range): Data rows
+    """
+    difference = np.nan_to_num(_column_values(sheet, diff_column, rows))
+    stock = np.nan_to_num(_column_values(sheet, stock_column, rows))
+    orders = np.nan_to_num(_column_values(sheet, orders_column, rows))
+    status, _ = classify_codes({
+        'difference': difference, 'net_difference': difference - stock - orders,
+        'available_stock': stock, 'pending_orders': orders
+    })
+    
+    stock_fill = status_fill('COVERED_BY_STOCK')
+    orders_fill = status_fill('COVERED_BY_ORDERS')
+    for row, name in zip(rows, STATUS_NAMES[status]):
+        # If stock alone can cover the difference
+        if name == 'COVERED_BY_STOCK':
+            cell = sheet.cell(row=row, column=stock_column)
+            cell.fill = stock_fill
+            cell.font = Font(bold=True)
+        
+        # If stock + orders can cover the difference
+        elif name == 'COVERED_BY_ORDERS':
+            cell = sheet.cell(row=row, column=orders_column)
+            cell.fill = orders_fill
+            cell.font = Font(bold=True)